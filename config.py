@@ -5,6 +5,16 @@ GAME_TITLE = "AutoWords - 新概念英语打字游戏"
 SCREEN_WIDTH = 1000
 SCREEN_HEIGHT = 700
 FPS = 60
+USER_DATA_DIR = "data/user"  # 用户数据（进度、成就、排行榜）保存目录
+SESSION_RECORDING_ENABLED = True  # 录制每局按键（保存到 用户数据目录/recordings，可用 tools.replay 回放）
+SESSION_RECORDING_KEEP = 50  # 最多保留的录制文件数，超出时删除最早的录制（0 为不限）
+SIMULATION_STEP = 1 / 60  # 固定模拟步长（秒），动画速度与渲染帧率无关
+IDLE_FPS = 10  # 静态界面空闲时的帧率
+IDLE_TIMEOUT = 2.0  # 无输入、无动画多少秒后降为空闲帧率
+DIRTY_RECT_RENDERING = False  # 脏矩形渲染：只刷新变化区域（适合无GPU的软件渲染，星空背景会静止）
+LATENCY_TRACKING = True  # 统计按键到画面/音效的延迟（滚动直方图）
+LATENCY_WINDOW = 1000  # 延迟直方图保留的最近按键数
+LATENCY_LOG_FILE = None  # 每次按键的延迟明细写入该 JSONL 文件（如 "data/user/latency.jsonl"），None 为不写入
 
 # 颜色定义
 COLORS = {
@@ -31,10 +41,12 @@ COLORS = {
 
 # 游戏参数
 TIME_LIMIT_PER_SENTENCE = 30  # 每个句子的时间限制（秒）
+TIMER_CRITICAL_SECONDS = 10   # 剩余时间少于该值时倒计时变红，保持满帧率
 MIN_ACCURACY_FOR_PASS = 80    # 通过关卡所需的最低准确率
 MAX_ERRORS_PER_LEVEL = 5      # 每个关卡允许的最大错误数
 SCORE_PER_CORRECT_CHAR = 10   # 每个正确字符的基础分数
 SPEED_BONUS_THRESHOLD = 30    # 达到速度奖励的阈值（字符/分钟
+STATS_WINDOW = 10.0           # 界面显示的滚动速度统计窗口（秒）
 
 # 字体设置
 FONTS = {
@@ -42,15 +54,33 @@ FONTS = {
     'MEDIUM': 36,
     'SMALL': 24
 }
+STAR_DENSITY = 1.0  # 星空密度倍数（1.0 = 每 1000x700 像素 100 颗星）
+PARTICLE_CAPACITY = 2000  # 粒子数量上限（超出的新粒子会被丢弃）
+TEXT_CACHE_SIZE = 512  # 文字渲染缓存容量（已渲染文字表面的数量上限）
+VOLATILE_TEXT_CACHE_SIZE = 32  # 频繁变化的文字（输入、计时、分数、速度）的独立小缓存容量
+
+# 动画计时（秒）
+CURSOR_BLINK_INTERVAL = 0.5  # 光标闪烁间隔
+NOTIFICATION_DURATION = 3.0  # 成就通知显示时长
+NOTIFICATION_SLIDE_TIME = 0.5  # 成就通知滑入/滑出时长
+COMBO_SPARKLE_INTERVAL = 0.25  # 高连击闪光粒子的生成间隔
 
 # 关卡设置
 LEVEL_COMPLETION_BONUS = 100  # 完成关卡的奖励分数
 LEVEL_NUMBER_MULTIPLIER = 50  # 关卡数乘数（影响分数）
 
 # 音乐和音效设置
+SILENT_MODE = False  # 静音模式：不初始化混音器、音效和TTS（也可设置环境变量 AUTOWORDS_SILENT=1）
 MUSIC_ENABLED = True
 MUSIC_VOLUME = 0.5  # 音乐音量 (0.0 - 1.0)
 SFX_VOLUME = 0.7  # 音效音量 (0.0 - 1.0)
+AUDIO_FREQUENCY = 44100  # 混音器采样率（Hz）
+AUDIO_CHANNELS = 2  # 混音器声道数（1 单声道，2 立体声）
+AUDIO_BUFFER = 256  # 混音器缓冲区大小（采样数，2 的幂）；越小按键音效越及时，过小可能出现爆音
+SOUND_TYPE_VARIANTS = 16  # 程序生成的打字音效变体数量（不同音高和力度）
+SOUND_CACHE_DIR = "data/cache/sounds"  # 程序音效库的缓存目录（None 表示每次启动重新生成）
+SOUND_CHANNELS = {'type': 4, 'feedback': 4, 'event': 2}  # 每类音效保留的混音声道数，用满时抢占最早开始的声道
+SOUND_MIN_INTERVAL = 0.04  # 同一音效两次播放的最小间隔（秒），更快的重复播放被丢弃
 
 # TTS语音朗读设置
 TTS_ENABLED = True  # 是否启用TTS语音朗读
@@ -58,6 +88,12 @@ TTS_RATE = 150  # 语速（每分钟单词数）
 TTS_VOLUME = 0.8  # TTS音量 (0.0 - 1.0)
 TTS_WORD_ENABLED = True  # 是否启用单词朗读
 TTS_CLICK_TO_SPEAK = True  # 是否启用点击朗读
+TTS_VOICE = None  # 语音ID（None 使用系统默认语音）
+TTS_CACHE_ENABLED = True  # 缓存合成的朗读音频（再次朗读时直接播放，无需重新合成）
+TTS_CACHE_DIR = "data/cache/tts"  # 朗读音频缓存目录
+TTS_CACHE_MAX_MB = 200  # 朗读音频缓存大小上限（MB），超出时删除最久未用的音频
+TTS_QUEUE_SIZE = 4  # 等待朗读的请求上限（句子 > 单词 > 夸奖 > 鼓励，满时丢弃优先级最低的）
+TTS_FEEDBACK_MAX_AGE = 2.0  # 夸奖/鼓励语等待超过该秒数后不再朗读
 
 # 夸奖语列表
 PRAISE_PHRASES = [
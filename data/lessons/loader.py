@@ -1,45 +1,140 @@
 """
 课程数据加载器
-支持从JSON文件加载课程数据
+支持从JSON文件加载课程数据；标准化后的全部课程编译为单个快照文件，
+源文件没有变化时启动直接读取快照，不再逐个解析和标准化每个 JSON
 """
 import json
 import os
-from typing import List, Dict, Optional
+import struct
+from typing import List, Dict, Optional, Tuple
+
+SNAPSHOT_VERSION = 3  # 快照格式或标准化逻辑变化时加一，使旧快照失效
+SNAPSHOT_MAGIC = b'AWLS'
+SNAPSHOT_HEADER = struct.Struct('<4sQ')  # 魔数 + 头部长度
+
+
+class LessonSnapshot:
+    """课程编译快照的读写
+
+    文件布局：魔数 + 头部长度 + JSON 头部（版本、源文件清单、数据长度）+ JSON 课程列表。
+    只用 JSON 存储，快照位于可写的缓存目录，读取时不能执行任意代码（不使用 pickle）；
+    读取时一次性载入全部课程，数据不完整或损坏时视为无效快照。
+    """
+
+    @staticmethod
+    def read(path, manifest) -> Optional[List[Dict]]:
+        """读取快照中的课程；版本不符、源文件清单不一致或数据不完整时返回 None"""
+        with open(path, 'rb') as f:
+            magic, header_size = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+            if magic != SNAPSHOT_MAGIC:
+                return None
+            header = json.loads(f.read(header_size).decode('utf-8'))
+            if (header.get('version') != SNAPSHOT_VERSION
+                    or header.get('manifest') != [list(entry) for entry in manifest]):
+                return None
+            data = f.read()
+        if len(data) != header['size']:
+            return None
+        lessons = json.loads(data.decode('utf-8'))
+        return lessons if isinstance(lessons, list) else None
+
+    @staticmethod
+    def write(path, manifest, lessons: List[Dict]):
+        """写入快照（先写临时文件再原子替换）"""
+        data = json.dumps(lessons, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        header = json.dumps({'version': SNAPSHOT_VERSION, 'manifest': manifest, 'size': len(data)},
+                            ensure_ascii=False).encode('utf-8')
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(header)))
+                f.write(header)
+                f.write(data)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
 
 
 class LessonLoader:
     """课程数据加载器"""
 
-    def __init__(self, base_path='data/lessons'):
+    SOURCE_DIRS = ('new_concept', 'custom')  # 按此顺序加载：新概念英语、自定义课程
+
+    def __init__(self, base_path='data/lessons', snapshot_path='data/cache/lessons.snapshot'):
+        """
+        Args:
+            base_path: 课程 JSON 根目录
+            snapshot_path: 编译快照路径（None 表示每次都从 JSON 加载）
+        """
         self.base_path = base_path
+        self.snapshot_path = snapshot_path
         self.cache = {}  # 缓存已加载的数据
 
     def load_all(self) -> List[Dict]:
-        """加载所有课程数据"""
-        all_lessons = []
+        """加载所有课程数据
 
-        # 加载新概念英语
-        new_concept_path = os.path.join(self.base_path, 'new_concept')
-        if os.path.exists(new_concept_path):
-            for filename in sorted(os.listdir(new_concept_path)):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(new_concept_path, filename)
-                    lessons = self._load_json_file(filepath)
-                    if lessons:
-                        all_lessons.extend(lessons)
-
-        # 加载自定义课程
-        custom_path = os.path.join(self.base_path, 'custom')
-        if os.path.exists(custom_path):
-            for filename in sorted(os.listdir(custom_path)):
-                if filename.endswith('.json'):
-                    filepath = os.path.join(custom_path, filename)
-                    lessons = self._load_json_file(filepath)
-                    if lessons:
-                        all_lessons.extend(lessons)
+        快照与源文件一致时直接返回快照中的课程，否则重新解析 JSON 并更新快照。
+        """
+        sources = self._source_files()
+        manifest = self._manifest(sources)
+        if self.snapshot_path:
+            lessons = self._load_snapshot(manifest)
+            if lessons is not None:
+                return lessons
 
+        all_lessons = []
+        for filepath in sources:
+            lessons = self._load_json_file(filepath)
+            if lessons:
+                all_lessons.extend(lessons)
+
+        if self.snapshot_path:
+            self._write_snapshot(manifest, all_lessons)
         return all_lessons
 
+    def _source_files(self) -> List[str]:
+        """按加载顺序列出所有课程 JSON 文件"""
+        sources = []
+        for dirname in self.SOURCE_DIRS:
+            path = os.path.join(self.base_path, dirname)
+            if os.path.exists(path):
+                for filename in sorted(os.listdir(path)):
+                    if filename.endswith('.json'):
+                        sources.append(os.path.join(path, filename))
+        return sources
+
+    def _manifest(self, sources: List[str]) -> List[Tuple[str, int, int]]:
+        """源文件清单：(路径, 修改时间纳秒, 大小)"""
+        manifest = []
+        for filepath in sources:
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                continue
+            manifest.append((os.path.abspath(filepath), stat.st_mtime_ns, stat.st_size))
+        return manifest
+
+    def _load_snapshot(self, manifest) -> Optional[List[Dict]]:
+        """读取快照；不存在、版本不符、源文件有变化或数据损坏时返回 None"""
+        try:
+            return LessonSnapshot.read(self.snapshot_path, manifest)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"课程快照无法读取，重新生成: {e}")
+            return None
+
+    def _write_snapshot(self, manifest, lessons: List[Dict]):
+        """写入快照"""
+        try:
+            directory = os.path.dirname(self.snapshot_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            LessonSnapshot.write(self.snapshot_path, manifest, lessons)
+        except Exception as e:
+            print(f"无法写入课程快照: {e}")
+
     def load_book(self, book_name: str) -> List[Dict]:
         """加载指定书籍的课程"""
         filepath = os.path.join(self.base_path, 'new_concept', f'{book_name}.json')
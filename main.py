@@ -4,16 +4,17 @@ import random
 import time
 import json
 import os
-import pyttsx3
 import threading
-import queue
+from collections import deque
 import numpy as np
 from pygame.locals import *
 from config import *
 
 # 尝试从新的模块结构导入，否则回退到旧的导入方式
 try:
-    from src import SoundGenerator, AchievementSystem, LevelSystem, Leaderboard, DailyChallenge
+    from src import AchievementSystem, LevelSystem, Leaderboard, DailyChallenge, TextCache, SentenceLayout, ParticleSystem, Starfield, FrameScheduler, GameClock, SessionRecorder, LatencyTracker, TypingSession, TTSCache, VoiceQueue, ChannelManager
+    from src.recording import EVENT_KEYDOWN, EVENT_TIMEOUT
+    from src.tts_cache import WORD_PUNCTUATION, speech_texts
     from data.lessons.loader import LessonLoader
     # 使用新的JSON数据加载器
     lesson_loader = LessonLoader()
@@ -29,21 +30,68 @@ except ImportError:
     Leaderboard = None
     DailyChallenge = None
 
-# 初始化Pygame
-pygame.init()
+# 静音模式（评分服务器、静音机房）：不初始化混音器，不加载音效合成和TTS
+SILENT = SILENT_MODE or os.environ.get('AUTOWORDS_SILENT', '0') not in ('', '0')
+
+# 音效/朗读随机数的种子由本局种子派生，与游戏逻辑的随机序列互不相关
+AUDIO_SEED_MASK = 0x5EED_A0D1
+
+# 初始化Pygame（混音器参数必须在 pygame.init 之前设置；缓冲区越小，按键到音效的延迟越低）
+if SILENT:
+    pygame.display.init()
+    pygame.font.init()
+else:
+    pygame.mixer.pre_init(AUDIO_FREQUENCY, -16, AUDIO_CHANNELS, AUDIO_BUFFER)
+    pygame.init()
+
+
+def session_attribute(name, doc):
+    """把 Game 上的属性转发到打字会话（绘制代码沿用原来的属性名）"""
+    return property(lambda self: getattr(self.session, name),
+                    lambda self, value: setattr(self.session, name, value), doc=doc)
 
 
 class Game:
-    def __init__(self):
+    # 游戏逻辑状态由 TypingSession 持有
+    current_sentence = session_attribute('sentence', "当前句子")
+    current_sentence_index = session_attribute('sentence_index', "当前句子索引")
+    typing_state = session_attribute('typing_state', "增量输入状态（逐字符正确性、首个错误位置、单词状态）")
+    stats = session_attribute('stats', "流式打字统计（速度、准确率、按键间隔），HUD、排行榜和成就都从这里读取")
+    start_time = session_attribute('start_time', "当前句子开始时间")
+    time_limit = session_attribute('time_limit', "每个句子的时间限制（秒）")
+    score = session_attribute('score', "当前分数")
+    level_scores = session_attribute('level_scores', "各关卡分数")
+    errors = session_attribute('errors', "错误数")
+    combo = session_attribute('combo', "当前连击")
+    max_combo = session_attribute('max_combo', "最高连击")
+    combo_timer = session_attribute('combo_time', "最近一次连击的时间")
+
+    def __init__(self, headless=False, screen_size=None, user_data_dir=USER_DATA_DIR):
+        """
+        Args:
+            headless: 无头模式（配合 SDL dummy 驱动使用），不初始化 TTS 引擎和语音线程
+            screen_size: 初始窗口尺寸 (宽, 高)，默认使用配置中的尺寸
+            user_data_dir: 用户数据（进度、成就、排行榜）保存目录
+        """
+        self.headless = headless
+        self.silent = SILENT
+        self.tts_enabled = TTS_ENABLED and not headless and not self.silent
+
         # 默认窗口模式，支持调整大小 (Default window mode, resizable)
         self.fullscreen = False
-        self.screen_width = SCREEN_WIDTH
-        self.screen_height = SCREEN_HEIGHT
+        self.screen_width, self.screen_height = screen_size or (SCREEN_WIDTH, SCREEN_HEIGHT)
         self._create_display()
             
         pygame.display.set_caption(GAME_TITLE)
         self.clock = pygame.time.Clock()
+        # 空闲感知帧调度：静态界面降帧，窗口隐藏/失焦时暂停绘制
+        self.scheduler = FrameScheduler(self.clock, FPS, IDLE_FPS, IDLE_TIMEOUT)
         
+        # 文字渲染缓存（字体更换时清空）
+        self.text_cache = TextCache(TEXT_CACHE_SIZE)
+        # 每次变化都产生新文字的内容（输入、计时、分数等）使用独立的小缓存，不挤掉稳定的标签
+        self.volatile_text_cache = TextCache(VOLATILE_TEXT_CACHE_SIZE)
+
         # 根据屏幕高度动态调整字体大小
         scale_factor = self.screen_height / 700  # 基于标准高度700px
         font_sizes = {
@@ -72,76 +120,117 @@ class Game:
         self.state = "menu"  # menu, course_select, playing, level_complete, game_over, leaderboard, achievements
         self.menu_index = 0  # 主菜单选择索引 (Main menu selection index)
         self.current_level = 0
-        self.current_sentence_index = 0
-        self.current_sentence = ""
-        self.user_input = ""
-        self.start_time = 0
-        self.time_limit = TIME_LIMIT_PER_SENTENCE  # Time limit per sentence (seconds)
-        self.correct_chars = 0
-        self.total_chars = 0
-        self.errors = 0
-        self.score = 0
-        self.level_scores = [0] * len(NEW_CONCEPT_LESSONS)
+        # 打字会话：关卡进度、输入比对、计分、连击和错误（与渲染无关，事件回调到本对象）
+        self.session = TypingSession(NEW_CONCEPT_LESSONS, self,
+                                     time_limit=TIME_LIMIT_PER_SENTENCE,
+                                     score_per_char=SCORE_PER_CORRECT_CHAR,
+                                     level_multiplier=LEVEL_NUMBER_MULTIPLIER,
+                                     completion_bonus=LEVEL_COMPLETION_BONUS,
+                                     stats_window=STATS_WINDOW)
+        # 游戏逻辑使用的随机数和时钟；每局重新设定种子，回放时冻结时钟，保证可复现
+        self.rng = random.Random()
+        # 音效变体和朗读语句的随机选择使用独立的随机数（每局用派生种子设定，可复现），
+        # 静音或无头回放时跳过这些调用也不会改变 self.rng 的序列
+        self.audio_rng = random.Random()
+        self.frozen_time = None
+        self.last_key_dispatch = float('-inf')  # 上一次分发 playing 按键的时间
+        # 按键录制
+        self.recorder = SessionRecorder(SESSION_RECORDING_KEEP)
+        self.recording_enabled = SESSION_RECORDING_ENABLED and not headless
+        self.recordings_dir = os.path.join(user_data_dir, 'recordings')
         self.max_errors = MAX_ERRORS_PER_LEVEL  # Maximum number of errors
         
+        # 脏矩形渲染：只把本帧和上一帧变化的区域推送到显示器
+        self.dirty_rendering = DIRTY_RECT_RENDERING
+        self.dirty_rects = []
+        self.previous_dirty_rects = []
+        self.full_redraw = True
+        self.presented_state = None
+
+        # 按键延迟统计（按键 -> 画面 flip / 打字音效）
+        self.latency = LatencyTracker(LATENCY_TRACKING, LATENCY_WINDOW, LATENCY_LOG_FILE)
+
+        # 渐变背景缓存（按尺寸和颜色键控，只在尺寸变化时重建）
+        self.background_surface = None
+        self.background_key = None
+        self.build_background()
+
         # Initialize particle system
-        self.particles = []
-        self.stars = []
+        self.particles = ParticleSystem(PARTICLE_CAPACITY)
+        self.starfield = None
         self.init_stars()
-        self.frame_count = 0
+        # 固定步长模拟时钟：动画和计时器按秒推进，与渲染帧率无关
+        self.game_clock = GameClock(SIMULATION_STEP)
+        self.sparkle_timer = 0.0
 
         # 单词位置记录（用于点击朗读）
         self.word_rects = []
-
-        # 连击系统 (Combo)
-        self.combo = 0
-        self.max_combo = 0
-        self.combo_timer = 0
+        # 当前句子的预计算排版
+        self.sentence_layout = None
 
         # 屏幕抖动效果
         self.screen_shake = 0
         self.screen_shake_intensity = 0
 
         # 成就系统
-        self.achievement_system = AchievementSystem()
+        self.achievement_system = AchievementSystem(os.path.join(user_data_dir, 'achievements.json'))
         self.current_achievement_notification = None
         self.notification_timer = 0
 
         # 等级系统
         if LevelSystem:
-            self.level_system = LevelSystem()
+            self.level_system = LevelSystem(os.path.join(user_data_dir, 'progress.json'))
         else:
             self.level_system = None
 
         # 排行榜系统
         if Leaderboard:
-            self.leaderboard = Leaderboard()
+            self.leaderboard = Leaderboard(os.path.join(user_data_dir, 'leaderboard.json'))
         else:
             self.leaderboard = None
 
         # 每日挑战系统
         if DailyChallenge:
-            self.daily_challenge = DailyChallenge()
+            self.daily_challenge = DailyChallenge(os.path.join(user_data_dir, 'daily_challenge.json'))
         else:
             self.daily_challenge = None
 
-        # Initialize audio system
-        pygame.mixer.init()
+        self.voice_channel = None
+        self.sound_channels = None
         self.background_music = None
         self.type_sound = None
         self.correct_sound = None
         self.error_sound = None
         self.complete_sound = None
+
+        if self.silent:
+            self.disable_audio()
+        else:
+            # Initialize audio system
+            pygame.mixer.init()
+            # 声道 0 专门播放缓存的朗读音频，之后每类音效各用一组保留声道，高速打字时互不挤占
+            self.voice_channel = pygame.mixer.Channel(0)
+            self.sound_channels = ChannelManager(SOUND_CHANNELS, first_channel=1,
+                                                 min_interval=SOUND_MIN_INTERVAL)
+            # Load audio files if enabled
+            if MUSIC_ENABLED:
+                self.load_audio()
         
-        # Load audio files if enabled
-        if MUSIC_ENABLED:
-            self.load_audio()
-        
-        # Initialize TTS engine
-        self.init_tts()
-        
+        # TTS 引擎在语音线程中延迟导入和初始化，不拖慢第一帧；就绪前的朗读请求在队列中等待
+        self.tts_engine = None
+        self.tts_voice = TTS_VOICE
+        self.tts_speaking = False  # 语音线程正在用 pyttsx3 直接朗读（而非合成到缓存）
+
+        # 合成音频的磁盘缓存（命中时直接用混音器播放，无需重新合成）
+        self.tts_cache = None
+        if self.tts_enabled and TTS_CACHE_ENABLED:
+            self.tts_cache = TTSCache(TTS_CACHE_DIR, TTS_CACHE_MAX_MB * 1024 * 1024)
+
         # Initialize voice queue and thread
-        self.voice_queue = queue.Queue()
+        # 有界优先级队列：过时的朗读请求被合并或丢弃，语音不会越来越落后于游戏
+        self.voice_queue = VoiceQueue(TTS_QUEUE_SIZE, TTS_FEEDBACK_MAX_AGE)
+        # 等待预合成的文本（语音线程空闲时处理）
+        self.prewarm_queue = deque()
         self.voice_thread = None
         self.start_voice_thread()
 
@@ -173,6 +262,9 @@ class Game:
             )
         # 重新计算字体大小
         self._update_fonts()
+        # 重建渐变背景
+        self.build_background()
+        self.request_full_redraw()
         # 重新初始化星空背景
         self.init_stars()
 
@@ -196,48 +288,145 @@ class Game:
             self.font_small = pygame.font.Font('Arial Unicode.ttf', font_sizes['SMALL'])
         except:
             self.font_small = pygame.font.SysFont('arialunicode', font_sizes['SMALL'])
+        # 旧字体渲染的文字全部失效
+        self.text_cache.clear()
+        self.volatile_text_cache.clear()
+        self.sentence_layout = None
+
+    def render_text(self, font, text, color):
+        """渲染文字（经过 LRU 缓存，只有变化的文字才会重新光栅化）"""
+        return self.text_cache.render(font, text, color)
+
+    def render_volatile_text(self, font, text, color):
+        """渲染频繁变化的文字（经过独立的小缓存，只复用最近几帧的结果）"""
+        return self.volatile_text_cache.render(font, text, color)
 
     def handle_resize(self, width, height):
         """处理窗口大小变化 (Handle window resize)"""
         self.screen_width = width
         self.screen_height = height
         self._update_fonts()
+        self.build_background()
         self.init_stars()
+        self.request_full_redraw()
 
     def start_voice_thread(self):
         """启动语音播放线程"""
-        if TTS_ENABLED:
+        if self.tts_enabled:
             self.voice_thread = threading.Thread(target=self.voice_worker, daemon=True)
             self.voice_thread.start()
     
     def voice_worker(self):
-        """语音播放工作线程"""
+        """语音播放工作线程：先初始化TTS引擎，再按优先级处理朗读请求，空闲时预合成课程音频"""
+        if self.tts_engine is None and not self.init_tts():
+            # 初始化失败：关闭朗读并丢弃已排队的请求，游戏照常进行
+            self.tts_enabled = False
+            self.prewarm_queue.clear()
+            self.voice_queue.close()
+            return
         while True:
             try:
-                text = self.voice_queue.get(timeout=0.1)
-                if text is None:
-                    break
-                # 检查 tts_engine 是否存在
-                if hasattr(self, 'tts_engine') and self.tts_engine:
-                    try:
-                        self.tts_engine.say(text)
-                        self.tts_engine.runAndWait()
-                    except Exception as e:
-                        print(f"语音播放失败: {e}")
-            except queue.Empty:
-                continue
+                request = self.voice_queue.get(timeout=0 if self.prewarm_queue else 0.1)
+                if request is None:
+                    if self.voice_queue.closed:
+                        break
+                    self.prewarm_next()
+                    continue
+                try:
+                    self.speak_on_voice_thread(request.text)
+                except Exception as e:
+                    print(f"语音播放失败: {e}")
+                finally:
+                    self.voice_queue.done(request)
             except Exception as e:
                 print(f"语音线程错误: {e}")
                 continue
+
+    def speak_on_voice_thread(self, text):
+        """在语音线程中朗读：优先播放缓存的音频；未缓存时直接朗读（不等合成），空闲时再补进缓存"""
+        if self.tts_cache:
+            path = self.tts_cache.get(text, TTS_RATE, self.tts_voice)
+            if path and self.play_voice_clip(path):
+                return
+            if path is None:
+                self.prewarm_queue.appendleft(text)
+        self.tts_speaking = True
+        try:
+            self.tts_engine.say(text)
+            self.tts_engine.runAndWait()
+        finally:
+            self.tts_speaking = False
+
+    def play_voice_clip(self, path):
+        """在朗读声道上播放音频文件并等待播放结束（被更高优先级的请求打断时立即停止），失败返回 False"""
+        try:
+            sound = pygame.mixer.Sound(path)
+        except Exception as e:
+            print(f"无法加载朗读音频: {e}")
+            return False
+        sound.set_volume(TTS_VOLUME)
+        self.voice_channel.play(sound)
+        while self.voice_channel.get_busy():
+            if self.voice_queue.should_stop():
+                self.voice_channel.stop()
+                break
+            time.sleep(0.01)
+        return True
+
+    def on_tts_word(self, name, location, length):
+        """pyttsx3 朗读每个单词前的回调（在语音线程中）：请求被打断时停止朗读
+
+        合成到缓存文件时也会触发，此时不能停止，否则会写出不完整的音频
+        """
+        if self.tts_speaking and self.voice_queue.should_stop():
+            self.tts_engine.stop()
+
+    def prewarm_lesson(self, level):
+        """在后台预合成课程的句子和单词（新课程开始时替换之前未完成的预合成）"""
+        if not self.tts_cache or not self.voice_thread or not self.tts_enabled:
+            return
+        self.prewarm_queue.clear()
+        self.prewarm_queue.extend(speech_texts(NEW_CONCEPT_LESSONS[level]['sentences']))
+
+    def prewarm_sentence(self, index):
+        """把当前课程第 index 句的句子和单词排到预合成队列最前面（在它需要朗读之前合成好）"""
+        if not self.tts_cache or not self.voice_thread or not self.tts_enabled:
+            return
+        sentences = NEW_CONCEPT_LESSONS[self.current_level]['sentences']
+        if 0 <= index < len(sentences):
+            self.prewarm_queue.extendleft(reversed(speech_texts([sentences[index]])))
+
+    def prewarm_next(self):
+        """预合成一个尚未缓存的文本（在语音线程中调用）"""
+        while self.prewarm_queue:
+            try:
+                text = self.prewarm_queue.popleft()
+            except IndexError:
+                return
+            if not self.tts_cache.contains(text, TTS_RATE, self.tts_voice):
+                self.tts_cache.synthesize(self.tts_engine, text, TTS_RATE, self.tts_voice)
+                return
     
     def stop_voice_thread(self):
         """停止语音播放线程"""
         if self.voice_thread:
-            self.voice_queue.put(None)
+            self.voice_queue.close()
             self.voice_thread.join(timeout=1)
     
+    def disable_audio(self):
+        """静音模式：所有播放、朗读和背景音乐方法替换为空操作，游戏逻辑不受影响"""
+        def noop(*args, **kwargs):
+            return None
+
+        for name in dir(type(self)):
+            if name.startswith(('play_', 'speak_')) or name in ('speak', 'start_background_music',
+                                                                 'stop_background_music'):
+                setattr(self, name, noop)
+
     def load_audio(self):
         """加载音频文件，如果文件不存在则使用程序生成的音效"""
+        from src.sound import SoundGenerator
+        from src.sound_bank import SoundBank
         # 初始化打字音效变体列表（用于节奏感）
         self.type_sounds = []
 
@@ -249,11 +438,30 @@ class Game:
         except:
             print("无法加载背景音乐")
 
+        # 程序生成的音效全部来自同一个音效库（有缓存时直接内存映射，无需重新合成）
+        bank = None
+        try:
+            bank = SoundBank.for_mixer(SOUND_TYPE_VARIANTS)
+            if bank:
+                bank.load(SOUND_CACHE_DIR)
+        except Exception as e:
+            print(f"无法生成音效库: {e}")
+            bank = None
+
+        def generated(name, generator):
+            return bank.sound(name) if bank else generator()
+
         # 打字音效 - 多个变体用于节奏感
         try:
             if os.path.exists(TYPE_SOUND):
                 self.type_sound = pygame.mixer.Sound(TYPE_SOUND)
                 self.type_sound.set_volume(SFX_VOLUME)
+            elif bank:
+                # 使用音效库中不同音高和力度的变体，增加节奏变化
+                self.type_sounds = bank.type_sounds()
+                for sound in self.type_sounds:
+                    sound.set_volume(SFX_VOLUME)
+                self.type_sound = self.type_sounds[0]
             else:
                 # 使用程序生成音效
                 self.type_sound = SoundGenerator.generate_type_sound()
@@ -271,7 +479,7 @@ class Game:
             if os.path.exists(CORRECT_SOUND):
                 self.correct_sound = pygame.mixer.Sound(CORRECT_SOUND)
             else:
-                self.correct_sound = SoundGenerator.generate_correct_sound()
+                self.correct_sound = generated('correct', SoundGenerator.generate_correct_sound)
             self.correct_sound.set_volume(SFX_VOLUME)
         except Exception as e:
             print(f"无法加载正确音效: {e}")
@@ -281,7 +489,7 @@ class Game:
             if os.path.exists(ERROR_SOUND):
                 self.error_sound = pygame.mixer.Sound(ERROR_SOUND)
             else:
-                self.error_sound = SoundGenerator.generate_error_sound()
+                self.error_sound = generated('error', SoundGenerator.generate_error_sound)
             self.error_sound.set_volume(SFX_VOLUME)
         except Exception as e:
             print(f"无法加载错误音效: {e}")
@@ -291,7 +499,7 @@ class Game:
             if os.path.exists(COMPLETE_SOUND):
                 self.complete_sound = pygame.mixer.Sound(COMPLETE_SOUND)
             else:
-                self.complete_sound = SoundGenerator.generate_complete_sound()
+                self.complete_sound = generated('complete', SoundGenerator.generate_complete_sound)
             self.complete_sound.set_volume(SFX_VOLUME)
         except Exception as e:
             print(f"无法加载完成音效: {e}")
@@ -300,25 +508,28 @@ class Game:
         """播放打字音效 - 带有随机变化的节奏感"""
         if self.type_sounds:
             # 随机选择一个音效变体
-            sound = random.choice(self.type_sounds)
-            sound.play()
+            sound = self.audio_rng.choice(self.type_sounds)
         elif self.type_sound:
-            self.type_sound.play()
+            sound = self.type_sound
+        else:
+            return
+        if self.sound_channels.play('type', sound):
+            self.latency.sound_started()
     
     def play_correct_sound(self):
         """播放正确音效"""
         if self.correct_sound:
-            self.correct_sound.play()
+            self.sound_channels.play('feedback', self.correct_sound)
     
     def play_error_sound(self):
         """播放错误音效"""
         if self.error_sound:
-            self.error_sound.play()
+            self.sound_channels.play('feedback', self.error_sound)
     
     def play_complete_sound(self):
         """播放完成音效"""
         if self.complete_sound:
-            self.complete_sound.play()
+            self.sound_channels.play('event', self.complete_sound)
     
     def start_background_music(self):
         """开始播放背景音乐"""
@@ -332,12 +543,20 @@ class Game:
     
     # TTS语音朗读功能
     def init_tts(self):
-        """初始化TTS引擎"""
-        if TTS_ENABLED:
+        """导入并初始化TTS引擎（在语音线程中调用，引擎只在该线程中使用）"""
+        if self.tts_enabled:
             try:
-                self.tts_engine = pyttsx3.init()
-                self.tts_engine.setProperty('rate', TTS_RATE)
-                self.tts_engine.setProperty('volume', TTS_VOLUME)
+                import pyttsx3
+                engine = pyttsx3.init()
+                engine.setProperty('rate', TTS_RATE)
+                engine.setProperty('volume', TTS_VOLUME)
+                if TTS_VOICE:
+                    engine.setProperty('voice', TTS_VOICE)
+                self.tts_voice = engine.getProperty('voice')
+                # 朗读过程中可以被更高优先级的请求打断（pyttsx3 只允许在回调中调用 stop）
+                engine.connect('started-word', self.on_tts_word)
+                # 配置完成后才发布，其他线程看到的引擎总是可用的
+                self.tts_engine = engine
                 return True
             except Exception as e:
                 print(f"无法初始化TTS引擎: {e}")
@@ -346,28 +565,28 @@ class Game:
     
     def speak(self, text):
         """朗读文本（同步）"""
-        if TTS_ENABLED and hasattr(self, 'tts_engine'):
+        if self.tts_enabled and self.tts_engine:
             try:
                 self.tts_engine.say(text)
                 self.tts_engine.runAndWait()
             except Exception as e:
                 print(f"朗读失败: {e}")
     
-    def speak_async(self, text):
-        """异步朗读文本"""
-        if TTS_ENABLED and hasattr(self, 'tts_engine') and self.voice_thread:
-            self.voice_queue.put(text)
+    def speak_async(self, text, category=VoiceQueue.WORD):
+        """异步朗读文本（category 决定优先级和过时请求的合并方式）；引擎就绪前的请求在队列中等待"""
+        if self.tts_enabled and self.voice_thread:
+            self.voice_queue.put(text, category)
     
     def speak_sentence(self):
         """朗读当前句子（异步）"""
         if self.current_sentence:
-            self.speak_async(self.current_sentence)
+            self.speak_async(self.current_sentence, VoiceQueue.SENTENCE)
 
     def speak_word(self, word):
         """朗读单个单词（异步）"""
-        if TTS_ENABLED and word:
+        if self.tts_enabled and word:
             # 清理单词中的标点符号
-            clean_word = word.strip('.,!?;:"\'-')
+            clean_word = word.strip(WORD_PUNCTUATION)
             if clean_word:
                 self.speak_async(clean_word)
 
@@ -377,9 +596,8 @@ class Game:
             return
         words = self.current_sentence.split()
         # 根据用户输入进度确定当前单词
-        input_words = self.user_input.split() if self.user_input else []
-        current_word_index = len(input_words)
-        if current_word_index < len(words):
+        current_word_index = self.typing_state.current_word_index()
+        if 0 <= current_word_index < len(words):
             self.speak_word(words[current_word_index])
 
     def speak_word_by_index(self, index):
@@ -395,308 +613,390 @@ class Game:
         if self.combo >= 10:
             # 高连击使用更激动的夸奖
             super_praise = ["Incredible!", "Amazing!", "You're on fire!", "Unstoppable!", "Legendary!"]
-            praise = random.choice(super_praise)
+            praise = self.audio_rng.choice(super_praise)
         elif self.combo >= 5:
-            praise = random.choice(["Great job!", "Excellent!", "Wonderful!", "Fantastic!"])
+            praise = self.audio_rng.choice(["Great job!", "Excellent!", "Wonderful!", "Fantastic!"])
         elif PRAISE_PHRASES:
-            praise = random.choice(PRAISE_PHRASES)
+            praise = self.audio_rng.choice(PRAISE_PHRASES)
         else:
             praise = "Good!"
-        self.speak_async(praise)
+        self.speak_async(praise, VoiceQueue.PRAISE)
 
     def speak_encouragement(self):
         """朗读鼓励语（异步）- 使用较短的鼓励语"""
         # 选择较短的鼓励语，不打断游戏节奏
         short_encouragements = ["Try again!", "Keep going!", "You can do it!", "Almost!", "Don't give up!"]
-        encouragement = random.choice(short_encouragements)
-        self.speak_async(encouragement)
+        encouragement = self.audio_rng.choice(short_encouragements)
+        self.speak_async(encouragement, VoiceQueue.ENCOURAGEMENT)
     
+    def now(self):
+        """游戏逻辑时钟（单调时钟；处理录制/回放的按键时为冻结的事件时间）"""
+        if self.frozen_time is not None:
+            return self.frozen_time
+        return time.perf_counter()
+
+    def start_playing(self):
+        """开始（或重新开始）当前关卡，并开始录制本局输入"""
+        seed = random.randrange(2 ** 32)
+        clock_base = time.perf_counter()
+        if self.recording_enabled:
+            self.recorder.start(self.get_session_header(seed), clock_base)
+        self._enter_level(seed, clock_base)
+        self.speak_sentence()
+        self.prewarm_lesson(self.current_level)
+
+    def begin_replay(self, header):
+        """按录制头信息恢复初始状态，准备回放（回放本身不再录制）"""
+        self.recording_enabled = False
+        self.current_level = header['level']
+        self.level_scores = list(header['level_scores'])
+        self.errors = header['errors']
+        self.combo = header['combo']
+        self.max_combo = header['max_combo']
+        self._enter_level(header['seed'], header['clock_base'])
+
+    def _enter_level(self, seed, clock_base):
+        """设定本局随机种子，在冻结的时钟下重置关卡并进入 playing"""
+        self.rng.seed(seed)
+        self.audio_rng.seed(seed ^ AUDIO_SEED_MASK)
+        self.particles.seed(seed)
+        # 本局第一批按键的时间不早于本局开始
+        self.last_key_dispatch = clock_base
+        self.frozen_time = clock_base
+        try:
+            self.reset_level()
+        finally:
+            self.frozen_time = None
+        self.state = "playing"
+
+    def get_session_header(self, seed):
+        """本局回放所需的初始状态"""
+        return {
+            'level': self.current_level,
+            'title': NEW_CONCEPT_LESSONS[self.current_level]['title'],
+            'seed': seed,
+            'screen_size': [self.screen_width, self.screen_height],
+            'level_scores': list(self.level_scores),
+            'errors': self.errors,
+            'combo': self.combo,
+            'max_combo': self.max_combo
+        }
+
+    def get_session_result(self):
+        """本局结束时的结果（用于校验回放是否一致）"""
+        result = self.session.get_result()
+        result['state'] = self.state
+        return result
+
+    def finish_recording(self):
+        """结束并保存本局录制"""
+        if self.recorder.active:
+            return self.recorder.finish(self.get_session_result(), self.recordings_dir)
+        return None
+
+    def dispatch_playing_keys(self, keys):
+        """录制并分发 playing 界面一帧内收集的按键 [(key, unicode)]，处理期间冻结逻辑时钟
+
+        事件队列不带按键时间，同一帧取出的按键均匀分布在上一次分发之后的一帧时间内
+        （最后一个为本次分发时间），打字统计不会把它们记为零间隔。
+        同一批按键以相同的批次时间偏移录制（另记各自的按键时间），回放时据此还原批次。
+        只录制作为游戏输入处理的按键；离开 playing 时结束本局录制，并返回剩余的按键，
+        由调用者交给新界面处理。
+        """
+        timestamp = time.perf_counter()
+        start = max(self.last_key_dispatch, timestamp - 1.0 / FPS)
+        self.last_key_dispatch = timestamp
+        count = len(keys)
+        key_times = [start + (timestamp - start) * (i + 1) / count for i in range(count)]
+        key_offsets = None
+        if self.recorder.active:
+            # 录制时间精确到微秒，处理时使用与回放相同的取整后时间
+            key_offsets = [self.recorder.offset_us(t) for t in key_times]
+            key_times = [self.recorder.clock_base + offset / 1_000_000 for offset in key_offsets]
+        timestamp = key_times[-1]
+        self.frozen_time = timestamp
+        try:
+            remaining = self.handle_playing_keys(keys, key_times)
+        finally:
+            self.frozen_time = None
+        if key_offsets is not None:
+            offset = key_offsets[-1]
+            for (key, unicode), key_offset in zip(keys[:len(keys) - len(remaining)], key_offsets):
+                self.recorder.record(offset, EVENT_KEYDOWN, key, unicode, key_offset)
+        if self.state != "playing":
+            # 剩余按键可能开始新的一局，先保存本局录制
+            self.finish_recording()
+        return remaining
+
+    def handle_playing_key(self, key, unicode):
+        """处理 playing 界面的单个按键 (Handle game input)"""
+        self.handle_playing_keys([(key, unicode)])
+
+    def handle_playing_keys(self, keys, key_times=None):
+        """按顺序处理 playing 界面的一批按键；连续的输入字符合并为一批交给 handle_input_batch
+
+        key_times 为每个按键各自的时间（默认都为当前逻辑时间）。
+        按 ESC、完成本关或游戏结束后，之后的按键不再作为游戏输入，返回这些剩余的按键
+        （仍在 playing 时返回空列表）。
+        """
+        if self.state != "playing":
+            return list(keys)
+        chars = []
+        positions = []  # 每个输入字符对应的按键下标
+        for index, (key, unicode) in enumerate(keys):
+            if key == K_BACKSPACE:
+                chars.append('\b')
+            elif key == K_RETURN:
+                chars.append('\r')
+            elif key in (K_ESCAPE, K_F1, K_F2):
+                # 功能键之前的输入先生效
+                if chars:
+                    handled = self.handle_input_batch(chars, self._key_times(key_times, positions))
+                    if self.state != "playing":
+                        return keys[positions[handled - 1] + 1:]
+                    chars = []
+                    positions = []
+                if key == K_ESCAPE:
+                    self.state = "menu"
+                    return keys[index + 1:]
+                elif key == K_F1:
+                    # F1键朗读当前句子 (F1 to read sentence)
+                    self.speak_sentence()
+                else:
+                    # F2键朗读当前单词 (F2 to read current word)
+                    self.speak_current_word()
+                continue
+            elif unicode:
+                # 获取按键字符（包括空格）
+                # Get key character (including space)
+                chars.append(unicode)
+            else:
+                continue
+            positions.append(index)
+        if chars:
+            handled = self.handle_input_batch(chars, self._key_times(key_times, positions))
+            if self.state != "playing":
+                return keys[positions[handled - 1] + 1:]
+        return []
+
+    @staticmethod
+    def _key_times(key_times, positions):
+        """按输入字符对应的按键下标取出各自的按键时间"""
+        if key_times is None:
+            return None
+        return [key_times[index] for index in positions]
+
+    def check_time_limit(self, now):
+        """当前句子超时则挑战失败（进入 game_over），返回是否刚刚超时"""
+        if self.session.check_time_limit(now):
+            self.state = self.session.state
+            return True
+        return False
+
     def reset_level(self):
         """重置当前关卡"""
         if self.current_level < len(NEW_CONCEPT_LESSONS):
-            self.current_sentence_index = 0
-            self.next_sentence()
-            self.correct_chars = 0
-            self.total_chars = 0
-            self.user_input = ""
-            self.score = self.level_scores[self.current_level]
-    
-    def next_sentence(self):
-        """加载下一个句子"""
-        if self.current_level < len(NEW_CONCEPT_LESSONS):
-            lesson = NEW_CONCEPT_LESSONS[self.current_level]
-            if self.current_sentence_index < len(lesson["sentences"]):
-                self.current_sentence = lesson["sentences"][self.current_sentence_index]
-                self.user_input = ""
-                self.start_time = time.time()
-            else:
-                # 本关完成
-                self.state = "level_complete"
-                self.level_scores[self.current_level] = self.score
-    
+            self.session.start_level(self.current_level, self.now())
+            self.build_sentence_layout()
+
+    def build_sentence_layout(self):
+        """为当前句子构建排版（分词、定位、预渲染各状态文字）"""
+        # 根据屏幕高度动态调整位置
+        sentence_y = self.screen_height // 4
+        self.sentence_layout = SentenceLayout(self.current_sentence, self.font_large, COLORS,
+                                              self.screen_width, sentence_y)
+        self.word_rects = self.sentence_layout.word_rects
+        self.sentence_layout.apply_states(self.typing_state)
+        # 换句后整个句子区域都变了
+        self.request_full_redraw()
+        return self.sentence_layout
+
+    def get_sentence_layout(self):
+        """获取当前句子的排版，句子或字体变化后重新构建"""
+        layout = self.sentence_layout
+        if layout is None or layout.sentence != self.current_sentence:
+            layout = self.build_sentence_layout()
+        return layout
+
+    @property
+    def user_input(self):
+        """当前输入文本（由增量输入状态维护）"""
+        return self.typing_state.text
+
     def check_input(self):
         """检查用户输入"""
-        if not self.current_sentence:
-            return True
-            
-        for i, char in enumerate(self.user_input):
-            if i >= len(self.current_sentence) or char != self.current_sentence[i]:
-                return False
-        return True
+        return self.typing_state.is_correct_so_far()
     
+    @property
+    def correct_chars(self):
+        """本局正确字符数（由打字统计维护）"""
+        return self.stats.correct_chars
+
+    @property
+    def total_chars(self):
+        """本局输入字符数（退格删除的不计）"""
+        return self.stats.total_chars
+
     def calculate_accuracy(self):
         """计算准确率"""
-        if self.total_chars == 0:
-            return 100
-        return max(0, int((self.correct_chars / self.total_chars) * 100))
-    
+        return self.session.accuracy()
+
     def calculate_speed(self):
-        """计算打字速度（字符/分钟）"""
-        elapsed_time = time.time() - self.start_time
-        if elapsed_time <= 0:
-            return 0
-        return int((len(self.user_input) / elapsed_time) * 60)
+        """计算当前句子的打字速度（字符/分钟）"""
+        return self.session.speed(self.now())
     
     def handle_input(self, char):
-        """处理用户输入"""
+        """处理用户输入（单个字符）"""
+        self.handle_input_batch(char)
+
+    def handle_input_batch(self, chars, key_times=None):
+        """一次处理一帧内收集到的所有输入字符（'\b' 为退格，'\r' 为回车）
+
+        逐字符更新输入状态、分数和连击；打字音效、粒子、经验和连击成就检查等反馈每批只产生一次，
+        快速输入或输入法/粘贴一次送入多个字符时开销不会成倍增加。
+        key_times 为每个字符各自的按键时间，打字统计按各自的时间记录（默认都为当前逻辑时间）。
+        返回处理的字符数（本关结束后剩余的字符不处理）。
+        """
         if self.state != "playing":
+            return 0
+        handled = self.session.handle_input(chars, self.now(), key_times)
+        if self.session.state != TypingSession.PLAYING:
+            self.state = self.session.state
+        return handled
+
+    # 打字会话事件回调 (TypingSession listener)
+    def on_input(self, typed, correct, incorrect, peak_combo):
+        """为一批输入产生一次反馈：音效、粒子、经验、连击成就和屏幕抖动"""
+        self.play_type_sound()
+        if not (correct or incorrect):
             return
-            
-        if char == '\b':  # 退格键
-            if len(self.user_input) > 0:
-                # 退格时，如果最后一个字符是错误的，减少错误计数
-                last_idx = len(self.user_input) -1
-                if last_idx < len(self.current_sentence) and self.user_input[last_idx] != self.current_sentence[last_idx]:
-                    self.errors = max(0, self.errors - 1)
-                self.user_input = self.user_input[:-1]
-                self.total_chars = max(0, self.total_chars - 1)
-                if last_idx < len(self.current_sentence) and self.user_input[last_idx:last_idx+1] == self.current_sentence[last_idx:last_idx+1]:
-                    self.correct_chars = min(self.correct_chars, len(self.user_input))
-                self.play_type_sound()
-        elif char == '\r':  # 回车键
-            # 检查句子是否完成且正确
-            if self.user_input == self.current_sentence:
-                accuracy = self.calculate_accuracy()
-                speed = self.calculate_speed()
-
-                # 检查准确率和速度成就
-                self.achievement_system.check_accuracy(accuracy)
-                self.achievement_system.check_speed(speed)
-
-                # 计算得分：基于准确率和速度
-                base_score = len(self.current_sentence) * SCORE_PER_CORRECT_CHAR
-                accuracy_bonus = base_score * (accuracy / 100)
-                speed_bonus = min(speed / 10, 50)  # 速度奖励上限
-                level_bonus = (self.current_level + 1) * LEVEL_NUMBER_MULTIPLIER
-                # 连击奖励
-                combo_multiplier = 1 + min(self.max_combo, 20) * 0.05  # 最高2倍
-
-                self.score += int((base_score + accuracy_bonus + speed_bonus + level_bonus) * combo_multiplier)
-                self.play_complete_sound()
-                # 触发庆祝动画
-                self.trigger_celebration()
-                # 正确完成一句，表扬一下（根据连击选择夸奖语）
-                self.speak_praise()
-
-                # 添加句子完成经验 (Add EXP for sentence completion)
-                if self.level_system:
-                    is_perfect = (accuracy == 100)
-                    self.level_system.add_exp_for_sentence(perfect=is_perfect)
-                    # 连击奖励经验
-                    if self.combo > 0:
-                        self.level_system.add_exp_for_combo(self.combo)
-
-                # 进入下一句
-                self.current_sentence_index += 1
-                if self.current_sentence_index >= len(NEW_CONCEPT_LESSONS[self.current_level]["sentences"]):
-                    # 本关完成，添加关卡完成奖励
-                    self.score += LEVEL_COMPLETION_BONUS
-                    self.level_scores[self.current_level] = self.score
-
-                    # 检查关卡完成成就
-                    self.achievement_system.check_level_complete(
-                        self.current_level, self.errors, len(NEW_CONCEPT_LESSONS)
-                    )
-
-                    # 添加经验值 (Add experience points)
-                    if self.level_system:
-                        # 关卡完成经验
-                        level_up = self.level_system.add_exp_for_level()
-                        if level_up:
-                            # 升级了！可以添加通知
-                            pass
-                        # 保存进度
-                        self.level_system.save_progress()
-
-                    # 提交排行榜 (Submit to leaderboard)
-                    if self.leaderboard:
-                        final_accuracy = self.calculate_accuracy()
-                        final_speed = self.calculate_speed()
-                        self.leaderboard.add_score(
-                            player_name="Player",
-                            score=self.score,
-                            accuracy=final_accuracy,
-                            speed=final_speed,
-                            combo=self.max_combo,
-                            level=self.current_level + 1
-                        )
-
-                    self.state = "level_complete"
-                else:
-                    self.next_sentence()
-                    # 翻页下一句，开始朗读
-                    self.speak_sentence()
-            else:
-                # 句子未完成或不正确，增加错误计数
-                self.errors += 1
-                # 重置连击
-                self.combo = 0
-                self.play_error_sound()
-                # 屏幕抖动
-                self.trigger_screen_shake(5, 2)
-                # 朗读鼓励语
-                self.speak_encouragement()
-        else:
-            # 添加字符到输入
-            self.user_input += char
-            self.total_chars += 1
-            self.play_type_sound()
-            
-            # 检查当前字符是否正确
-            idx = len(self.user_input) - 1
-            if idx < len(self.current_sentence) and self.user_input[idx] == self.current_sentence[idx]:
-                self.correct_chars += 1
-                # 添加经验值 (Add EXP for correct char)
-                if self.level_system:
-                    self.level_system.add_exp_for_char()
-                # 连击系统
-                self.combo += 1
-                self.combo_timer = time.time()
-                self.max_combo = max(self.max_combo, self.combo)
-                # 检查连击成就
-                self.achievement_system.check_combo(self.combo)
-                # 连击奖励分数
-                combo_bonus = min(self.combo, 20)  # 最高20倍
-                self.score += combo_bonus
-                # 创建绿色粒子效果，连击越高效果越强
-                if self.state == "playing":
-                    input_y = self.screen_height // 2
-                    input_font_height = self.font_large.get_height()
-                    input_box_padding = int(input_font_height * 0.3)
-                    input_box_height = input_font_height + input_box_padding * 2
-                    input_box_horizontal_padding = int(input_font_height * 0.5)
-                    input_box_width = max(400, len(self.user_input) * 20 + input_box_horizontal_padding * 2)
-                    input_box_x = (self.screen_width - input_box_width) // 2
-                    input_box_y = input_y - input_box_padding
-                    input_text_x = input_box_x + (input_box_width - len(self.user_input) * 20) // 2
-                    input_text_y = input_box_y + (input_box_height - input_font_height) // 2
-                    cursor_x = input_text_x + len(self.user_input) * 20
-                    cursor_y = input_text_y + (input_font_height - int(input_font_height * 0.7)) // 2
-                    # 连击越高粒子越多
-                    particle_count = 5 + min(self.combo // 2, 10)
-                    self.create_particles(cursor_x, cursor_y, COLORS['CORRECT'], particle_count)
-                    self.play_correct_sound()
-            else:
-                # 输入错误，增加错误计数
-                self.errors += 1
-                # 重置连击
-                self.combo = 0
-                # 创建红色粒子效果
-                if self.state == "playing":
-                    input_y = self.screen_height // 2
-                    input_font_height = self.font_large.get_height()
-                    input_box_padding = int(input_font_height * 0.3)
-                    input_box_height = input_font_height + input_box_padding * 2
-                    input_box_horizontal_padding = int(input_font_height * 0.5)
-                    input_box_width = max(400, len(self.user_input) * 20 + input_box_horizontal_padding * 2)
-                    input_box_x = (self.screen_width - input_box_width) // 2
-                    input_box_y = input_y - input_box_padding
-                    input_text_x = input_box_x + (input_box_width - len(self.user_input) * 20) // 2
-                    input_text_y = input_box_y + (input_box_height - input_font_height) // 2
-                    cursor_x = input_text_x + len(self.user_input) * 20
-                    cursor_y = input_text_y + (input_font_height - int(input_font_height * 0.7)) // 2
-                    self.create_particles(cursor_x, cursor_y, COLORS['INCORRECT'], 8)
-                    self.play_error_sound()
-                    # 屏幕抖动效果
-                    self.trigger_screen_shake(8, 3)
-    
+
+        cursor_x, cursor_y = self.get_input_cursor_position()
+        if correct:
+            # 添加经验值 (Add EXP for correct chars)
+            if self.level_system:
+                self.level_system.add_exp(correct)
+            # 检查连击成就
+            self.achievement_system.check_combo(peak_combo)
+            # 创建绿色粒子效果，连击越高、本批字符越多效果越强
+            particle_count = 5 + min(peak_combo // 2, 10) + min(correct - 1, 10) * 2
+            self.create_particles(cursor_x, cursor_y, COLORS['CORRECT'], particle_count)
+            self.play_correct_sound()
+        if incorrect:
+            # 创建红色粒子效果
+            particle_count = 8 + min(incorrect - 1, 10) * 2
+            self.create_particles(cursor_x, cursor_y, COLORS['INCORRECT'], particle_count)
+            self.play_error_sound()
+            # 屏幕抖动效果
+            self.trigger_screen_shake(0.13, 3)
+
+    def on_sentence_complete(self, accuracy, speed):
+        """句子正确完成：成就、音效、庆祝动画、夸奖和经验"""
+        # 检查准确率和速度成就
+        self.achievement_system.check_accuracy(accuracy)
+        self.achievement_system.check_speed(speed)
+
+        self.play_complete_sound()
+        # 触发庆祝动画
+        self.trigger_celebration()
+        # 正确完成一句，表扬一下（根据连击选择夸奖语）
+        self.speak_praise()
+
+        # 添加句子完成经验 (Add EXP for sentence completion)
+        if self.level_system:
+            is_perfect = (accuracy == 100)
+            self.level_system.add_exp_for_sentence(perfect=is_perfect)
+            # 连击奖励经验
+            if self.combo > 0:
+                self.level_system.add_exp_for_combo(self.combo)
+
+    def on_sentence_rejected(self):
+        """句子未完成或不正确时回车：错误音效、抖动和鼓励语"""
+        self.play_error_sound()
+        # 屏幕抖动
+        self.trigger_screen_shake(0.08, 2)
+        # 朗读鼓励语
+        self.speak_encouragement()
+
+    def on_next_sentence(self):
+        """翻页下一句：重新排版并开始朗读"""
+        self.build_sentence_layout()
+        self.speak_sentence()
+        self.prewarm_sentence(self.current_sentence_index + 1)
+
+    def on_level_complete(self):
+        """本关完成：关卡成就、经验、保存进度并提交排行榜"""
+        # 检查关卡完成成就
+        self.achievement_system.check_level_complete(
+            self.current_level, self.errors, len(NEW_CONCEPT_LESSONS)
+        )
+
+        # 添加经验值 (Add experience points)
+        if self.level_system:
+            # 关卡完成经验
+            level_up = self.level_system.add_exp_for_level()
+            if level_up:
+                # 升级了！可以添加通知
+                pass
+            # 保存进度
+            self.level_system.save_progress()
+
+        # 提交排行榜 (Submit to leaderboard)
+        if self.leaderboard:
+            final_accuracy = self.calculate_accuracy()
+            # 排行榜记录整局的平均速度
+            final_speed = self.stats.session_cpm(self.now())
+            self.leaderboard.add_score(
+                player_name="Player",
+                score=self.score,
+                accuracy=final_accuracy,
+                speed=final_speed,
+                combo=self.max_combo,
+                level=self.current_level + 1
+            )
+
+    def get_input_cursor_position(self):
+        """输入框中光标的大致位置（按每字符 20 像素估算，用于粒子效果）"""
+        typed_width = len(self.typing_state) * 20
+        input_y = self.screen_height // 2
+        input_font_height = self.font_large.get_height()
+        input_box_padding = int(input_font_height * 0.3)
+        input_box_height = input_font_height + input_box_padding * 2
+        input_box_horizontal_padding = int(input_font_height * 0.5)
+        input_box_width = max(400, typed_width + input_box_horizontal_padding * 2)
+        input_box_x = (self.screen_width - input_box_width) // 2
+        input_box_y = input_y - input_box_padding
+        input_text_x = input_box_x + (input_box_width - typed_width) // 2
+        input_text_y = input_box_y + (input_box_height - input_font_height) // 2
+        cursor_x = input_text_x + typed_width
+        cursor_y = input_text_y + (input_font_height - int(input_font_height * 0.7)) // 2
+        return cursor_x, cursor_y
+
     def init_stars(self):
-        """初始化背景星星"""
-        self.stars = []
-        for _ in range(100):
-            star = {
-                'x': random.randint(0, self.screen_width),
-                'y': random.randint(0, self.screen_height),
-                'size': random.randint(1, 3),
-                'brightness': random.randint(100, 255),
-                'speed': random.uniform(0.1, 0.5)
-            }
-            self.stars.append(star)
-    
-    def update_and_draw_stars(self):
-        """更新并绘制背景星星"""
-        for star in self.stars:
-            # 更新亮度（闪烁效果）
-            star['brightness'] += random.randint(-5, 5)
-            star['brightness'] = max(100, min(255, star['brightness']))
-            
-            # 缓慢移动星星
-            star['y'] -= star['speed']
-            if star['y'] < 0:
-                star['y'] = self.screen_height
-                star['x'] = random.randint(0, self.screen_width)
-            
-            # 绘制星星
-            color = (star['brightness'], star['brightness'], star['brightness'])
-            pygame.draw.circle(self.screen, color, (int(star['x']), int(star['y'])), star['size'])
-    
-    def create_particles(self, x, y, color, count=10):
+        """初始化背景星空（按当前屏幕尺寸重新生成图层）"""
+        self.starfield = Starfield(self.screen_width, self.screen_height, STAR_DENSITY)
+
+    def draw_stars(self):
+        """绘制背景星星"""
+        self.starfield.draw(self.screen)
+
+    def create_particles(self, x, y, color, count=10, rng=None):
         """创建粒子效果"""
-        for _ in range(count):
-            particle = {
-                'x': x,
-                'y': y,
-                'vx': random.uniform(-3, 3),
-                'vy': random.uniform(-3, 3),
-                'life': random.randint(20, 40),
-                'color': color,
-                'size': random.randint(2, 5)
-            }
-            self.particles.append(particle)
-    
-    def update_and_draw_particles(self):
-        """更新并绘制粒子效果"""
-        for particle in self.particles[:]:
-            # 更新粒子位置
-            particle['x'] += particle['vx']
-            particle['y'] += particle['vy']
-            particle['life'] -= 1
-            particle['size'] = max(1, particle['size'] - 0.1)
-
-            # 应用重力（如果有）
-            if 'gravity' in particle:
-                particle['vy'] += particle['gravity']
-
-            # 绘制粒子
-            if particle['life'] > 0:
-                max_life = particle.get('max_life', 40)
-                alpha = int((particle['life'] / max_life) * 255)
-                color = particle['color']
-                pygame.draw.circle(self.screen, color,
-                               (int(particle['x']), int(particle['y'])),
-                               int(particle['size']))
-            else:
-                self.particles.remove(particle)
+        self.particles.emit(x, y, color, count, rng=rng)
+
+    def draw_particles(self):
+        """绘制粒子效果"""
+        self.particles.draw(self.screen)
+        self.mark_dirty(self.particles.get_bounds())
 
-    def trigger_screen_shake(self, duration=10, intensity=5):
-        """触发屏幕抖动"""
+    def trigger_screen_shake(self, duration=0.15, intensity=5):
+        """触发屏幕抖动（duration 单位为秒）"""
         self.screen_shake = duration
         self.screen_shake_intensity = intensity
 
     def get_screen_shake_offset(self):
         """获取屏幕抖动偏移"""
         if self.screen_shake > 0:
-            self.screen_shake -= 1
             return (random.randint(-self.screen_shake_intensity, self.screen_shake_intensity),
                     random.randint(-self.screen_shake_intensity, self.screen_shake_intensity))
         return (0, 0)
@@ -707,25 +1007,15 @@ class Game:
             (255, 100, 100), (100, 255, 100), (100, 100, 255),
             (255, 255, 100), (255, 100, 255), (100, 255, 255)
         ]
-        for _ in range(count):
-            particle = {
-                'x': x + random.randint(-50, 50),
-                'y': y,
-                'vx': random.uniform(-3, 3),
-                'vy': random.uniform(-8, -2),
-                'life': random.randint(60, 120),
-                'color': random.choice(colors),
-                'size': random.randint(4, 8),
-                'gravity': 0.2
-            }
-            self.particles.append(particle)
+        self.particles.emit(x, y, None, count, life=(1.0, 2.0), size=(4, 8),
+                            spread_x=50, vy_range=(-480, -120), gravity=720, colors=colors)
 
     def trigger_celebration(self):
         """触发庆祝动画"""
         # 在屏幕多个位置创建五彩纸屑
         for _ in range(3):
-            x = random.randint(100, self.screen_width - 100)
-            y = random.randint(50, 150)
+            x = self.rng.randint(100, self.screen_width - 100)
+            y = self.rng.randint(50, 150)
             self.create_confetti(x, y, count=15)
 
         # 如果连击高，效果更强
@@ -733,30 +1023,124 @@ class Game:
             center_x = self.screen_width // 2
             self.create_particles(center_x, self.screen_height // 2, (255, 215, 0), count=30)
 
+    def build_background(self):
+        """构建渐变背景缓存 (Build cached gradient background)
+
+        缓存按 (宽, 高, 顶部颜色, 底部颜色) 键控，键不变时直接复用。
+        """
+        key = (self.screen_width, self.screen_height,
+               COLORS['BACKGROUND_TOP'], COLORS['BACKGROUND_BOTTOM'])
+        if key == self.background_key and self.background_surface is not None:
+            return self.background_surface
+
+        # 一次性计算每一行的颜色（线性插值）
+        ratio = np.arange(self.screen_height, dtype=np.float64)[:, None] / self.screen_height
+        top = np.array(COLORS['BACKGROUND_TOP'], dtype=np.float64)
+        bottom = np.array(COLORS['BACKGROUND_BOTTOM'], dtype=np.float64)
+        rows = (top * (1 - ratio) + bottom * ratio).astype(np.uint8)
+
+        # surfarray 使用 (x, y, rgb) 布局，沿 x 方向广播整列
+        pixels = np.broadcast_to(rows[None, :, :], (self.screen_width, self.screen_height, 3))
+        background = pygame.Surface((self.screen_width, self.screen_height))
+        pygame.surfarray.blit_array(background, pixels)
+
+        # 转换为显示格式，blit 时无需逐像素转换
+        self.background_surface = background.convert()
+        self.background_key = key
+        return self.background_surface
+
     def draw_gradient_background(self):
         """绘制渐变背景"""
-        # 创建渐变背景
-        background = pygame.Surface((self.screen_width, self.screen_height))
-        
-        # 计算渐变步数
-        gradient_steps = 100
-        
-        # 计算颜色渐变
-        for y in range(self.screen_height):
-            # 计算当前行的颜色（线性插值）
-            ratio = y / self.screen_height
-            r = int(COLORS['BACKGROUND_TOP'][0] * (1 - ratio) + COLORS['BACKGROUND_BOTTOM'][0] * ratio)
-            g = int(COLORS['BACKGROUND_TOP'][1] * (1 - ratio) + COLORS['BACKGROUND_BOTTOM'][1] * ratio)
-            b = int(COLORS['BACKGROUND_TOP'][2] * (1 - ratio) + COLORS['BACKGROUND_BOTTOM'][2] * ratio)
-            
-            # 绘制当前行
-            pygame.draw.line(background, (r, g, b), (0, y), (self.screen_width, y))
-        
-        self.screen.blit(background, (0, 0))
-        
+        if self.background_surface is None:
+            self.build_background()
+        self.screen.blit(self.background_surface, (0, 0))
+
         # 绘制背景星星
-        self.update_and_draw_stars()
-    
+        self.draw_stars()
+
+    def update_simulation(self, dt):
+        """推进一个固定模拟步长（dt 秒）：粒子、星空、通知和抖动计时器"""
+        self.particles.update(dt)
+        # 脏矩形模式下星空保持静止，否则只在脏区域内移动会产生残影
+        if not self.dirty_rendering:
+            self.starfield.update(dt)
+
+        if self.screen_shake > 0:
+            self.screen_shake = max(0.0, self.screen_shake - dt)
+
+        if self.state != "playing":
+            return
+
+        # 高连击时添加闪光粒子效果
+        if self.combo >= 5:
+            self.sparkle_timer += dt
+            if self.sparkle_timer >= COMBO_SPARKLE_INTERVAL:
+                self.sparkle_timer -= COMBO_SPARKLE_INTERVAL
+                combo_x = self.screen_width - 180
+                combo_y = 120
+                sparkle_colors = [(255, 255, 100), (255, 215, 0), (255, 255, 255)]
+                self.particles.emit(combo_x + 50, combo_y + 7, None, 3, speed=60, life=(0.25, 0.5),
+                                    size=(2, 4), spread_x=50, spread_y=13, vy_range=(-120, 0),
+                                    colors=sparkle_colors, rng=self.particles.effect_rng)
+        else:
+            self.sparkle_timer = 0.0
+
+        # 检查新的成就通知
+        if self.current_achievement_notification is None:
+            notification = self.achievement_system.get_pending_notification()
+            if notification:
+                self.current_achievement_notification = notification
+                self.notification_timer = NOTIFICATION_DURATION
+        else:
+            self.notification_timer -= dt
+            # 通知结束时清空
+            if self.notification_timer <= 0:
+                self.current_achievement_notification = None
+
+    def is_animating(self):
+        """当前画面是否有需要满帧率播放的动画"""
+        if len(self.particles) or self.current_achievement_notification or self.screen_shake > 0:
+            return True
+        if self.state == "playing":
+            # 高连击时有闪光粒子
+            if self.combo >= 5:
+                return True
+            # 倒计时进入临界阶段时保持满帧率
+            remaining_time = self.time_limit - (self.now() - self.start_time)
+            if remaining_time <= TIMER_CRITICAL_SECONDS:
+                return True
+        return False
+
+    def mark_dirty(self, rect):
+        """记录本帧发生变化的屏幕区域（仅脏矩形模式下生效）"""
+        if self.dirty_rendering and rect is not None:
+            self.dirty_rects.append(pygame.Rect(rect))
+
+    def request_full_redraw(self):
+        """请求下一帧整屏刷新（布局变化时使用）"""
+        self.full_redraw = True
+
+    def present(self):
+        """把本帧画面推送到显示器
+
+        普通模式下整屏 flip；脏矩形模式下只更新本帧和上一帧的脏区域
+        （包含上一帧的区域才能擦掉移走或消失的元素），布局变化时回退为整屏 flip。
+        """
+        flip_start = time.perf_counter()
+        if not self.dirty_rendering or self.full_redraw or self.state != self.presented_state:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            screen_rect = self.screen.get_rect()
+            rects = [rect.clip(screen_rect) for rect in self.previous_dirty_rects + self.dirty_rects]
+            rects = [rect for rect in rects if rect.width and rect.height]
+            if rects:
+                pygame.display.update(rects)
+        self.latency.frame_presented(flip_start, time.perf_counter())
+        self.presented_state = self.state
+        self.previous_dirty_rects = self.dirty_rects
+        self.dirty_rects = []
+
     def draw_panel(self, x, y, width, height, title=None):
         """绘制面板背景 (Draw panel background)"""
         # 面板背景
@@ -766,7 +1150,7 @@ class Game:
 
         # 面板标题
         if title:
-            title_text = self.font_small.render(title, True, COLORS['HIGHLIGHT'])
+            title_text = self.render_text(self.font_small, title, COLORS['HIGHLIGHT'])
             self.screen.blit(title_text, (x + 10, y + 5))
 
         return panel_rect
@@ -778,14 +1162,14 @@ class Game:
         center_x = self.screen_width // 2
 
         # 1. 标题 Title with shadow
-        title = self.font_large.render(GAME_TITLE, True, COLORS['TEXT'])
+        title = self.render_text(self.font_large, GAME_TITLE, COLORS['TEXT'])
         title_rect = title.get_rect(center=(center_x, 60))
-        title_shadow = self.font_large.render(GAME_TITLE, True, COLORS['TEXT_SHADOW'])
+        title_shadow = self.render_text(self.font_large, GAME_TITLE, COLORS['TEXT_SHADOW'])
         self.screen.blit(title_shadow, (title_rect.x + 2, title_rect.y + 2))
         self.screen.blit(title, title_rect)
 
         # 副标题
-        subtitle = self.font_small.render("English Typing Game 英语打字学习游戏", True, COLORS['UI'])
+        subtitle = self.render_text(self.font_small, "English Typing Game 英语打字学习游戏", COLORS['UI'])
         subtitle_rect = subtitle.get_rect(center=(center_x, 100))
         self.screen.blit(subtitle, subtitle_rect)
 
@@ -800,7 +1184,7 @@ class Game:
                 next_exp = self.level_system.LEVEL_CONFIG[self.level_system.current_level + 1]['exp_required']
                 level_text += f"  EXP: {self.level_system.current_exp}/{next_exp}"
 
-            level_surface = self.font_small.render(level_text, True, level_info['color'])
+            level_surface = self.render_text(self.font_small, level_text, level_info['color'])
             level_rect = level_surface.get_rect(center=(center_x, 140))
             self.screen.blit(level_surface, level_rect)
 
@@ -839,7 +1223,7 @@ class Game:
                 color = COLORS['TEXT']
 
             item_text = f"{indicator} [{key}] {en} {cn}"
-            item_surface = self.font_medium.render(item_text, True, color)
+            item_surface = self.render_text(self.font_medium, item_text, color)
             item_rect = item_surface.get_rect(center=(center_x, menu_y + i * menu_spacing))
 
             # 选中项背景
@@ -852,7 +1236,7 @@ class Game:
         # 4. 底部快捷键
         bottom_y = self.screen_height - 50
         shortcuts = "[Up/Down] Select  [Enter] Confirm  [ESC] Exit  [F11] Fullscreen"
-        shortcut_surface = self.font_small.render(shortcuts, True, COLORS['UI'])
+        shortcut_surface = self.render_text(self.font_small, shortcuts, COLORS['UI'])
         shortcut_rect = shortcut_surface.get_rect(center=(center_x, bottom_y))
         self.screen.blit(shortcut_surface, shortcut_rect)
 
@@ -863,7 +1247,7 @@ class Game:
         center_x = self.screen_width // 2
 
         # 标题
-        title = self.font_large.render("Select Course 选择课程", True, COLORS['TEXT'])
+        title = self.render_text(self.font_large, "Select Course 选择课程", COLORS['TEXT'])
         title_rect = title.get_rect(center=(center_x, 50))
         self.screen.blit(title, title_rect)
 
@@ -896,7 +1280,7 @@ class Game:
                 lesson_title = lesson_title[:32] + "..."
 
             text = f"{indicator} [{i+1}] {lesson_title}"
-            text_surface = self.font_small.render(text, True, color)
+            text_surface = self.render_text(self.font_small, text, color)
             text_rect = text_surface.get_rect(midleft=(center_x - 250, y_offset))
 
             # 选中项背景
@@ -909,23 +1293,23 @@ class Game:
             # 最高分
             if i < len(self.level_scores) and self.level_scores[i] > 0:
                 score_text = f"Best: {self.level_scores[i]}"
-                score_surface = self.font_small.render(score_text, True, COLORS['CORRECT'])
+                score_surface = self.render_text(self.font_small, score_text, COLORS['CORRECT'])
                 self.screen.blit(score_surface, (center_x + 150, y_offset - 10))
 
             y_offset += 45
 
         # 滚动提示
         if start_idx > 0:
-            up_text = self.font_small.render("...", True, COLORS['UI'])
+            up_text = self.render_text(self.font_small, "...", COLORS['UI'])
             self.screen.blit(up_text, (center_x - 10, 100))
         if end_idx < len(NEW_CONCEPT_LESSONS):
-            down_text = self.font_small.render("...", True, COLORS['UI'])
+            down_text = self.render_text(self.font_small, "...", COLORS['UI'])
             self.screen.blit(down_text, (center_x - 10, y_offset))
 
         # 底部快捷键
         bottom_y = self.screen_height - 40
         shortcuts = "[Up/Down] Select  [1-9] Quick Select  [Enter] Start  [ESC] Back"
-        shortcut_surface = self.font_small.render(shortcuts, True, COLORS['UI'])
+        shortcut_surface = self.render_text(self.font_small, shortcuts, COLORS['UI'])
         shortcut_rect = shortcut_surface.get_rect(center=(center_x, bottom_y))
         self.screen.blit(shortcut_surface, shortcut_rect)
 
@@ -934,12 +1318,12 @@ class Game:
         self.draw_gradient_background()
 
         # 标题
-        title = self.font_large.render("Leaderboard 排行榜", True, COLORS['TEXT'])
+        title = self.render_text(self.font_large, "Leaderboard 排行榜", COLORS['TEXT'])
         title_rect = title.get_rect(center=(self.screen_width//2, 50))
         self.screen.blit(title, title_rect)
 
         if not self.leaderboard:
-            no_lb = self.font_medium.render("Leaderboard not available", True, COLORS['WARNING'])
+            no_lb = self.render_text(self.font_medium, "Leaderboard not available", COLORS['WARNING'])
             no_lb_rect = no_lb.get_rect(center=(self.screen_width//2, self.screen_height//2))
             self.screen.blit(no_lb, no_lb_rect)
         else:
@@ -965,7 +1349,7 @@ class Game:
                 top_scores = self.leaderboard.get_top(category, 10)
 
                 if not top_scores:
-                    no_data = self.font_small.render("No records yet", True, COLORS['UI'])
+                    no_data = self.render_text(self.font_small, "No records yet", COLORS['UI'])
                     self.screen.blit(no_data, (x + 20, y + 50))
                 else:
                     entry_y = y + 40
@@ -983,8 +1367,8 @@ class Game:
                         rank_text = f"#{rank} {entry['name'][:8]}"
                         score_text = f"{entry['score']}"
 
-                        rank_surface = self.font_small.render(rank_text, True, rank_color)
-                        score_surface = self.font_small.render(score_text, True, COLORS['CORRECT'])
+                        rank_surface = self.render_text(self.font_small, rank_text, rank_color)
+                        score_surface = self.render_text(self.font_small, score_text, COLORS['CORRECT'])
 
                         self.screen.blit(rank_surface, (x + 15, entry_y))
                         self.screen.blit(score_surface, (x + width - 70, entry_y))
@@ -992,7 +1376,7 @@ class Game:
                         entry_y += 35
 
         # 返回提示
-        back_text = self.font_small.render("Press [ESC] or [L] to go back 按 ESC 或 L 返回", True, COLORS['UI'])
+        back_text = self.render_text(self.font_small, "Press [ESC] or [L] to go back 按 ESC 或 L 返回", COLORS['UI'])
         back_rect = back_text.get_rect(center=(self.screen_width//2, self.screen_height - 40))
         self.screen.blit(back_text, back_rect)
 
@@ -1003,7 +1387,7 @@ class Game:
         # 标题
         unlocked = self.achievement_system.get_unlocked_count()
         total = self.achievement_system.get_total_count()
-        title = self.font_large.render(f"Achievements 成就 ({unlocked}/{total})", True, COLORS['TEXT'])
+        title = self.render_text(self.font_large, f"Achievements 成就 ({unlocked}/{total})", COLORS['TEXT'])
         title_rect = title.get_rect(center=(self.screen_width//2, 50))
         self.screen.blit(title, title_rect)
 
@@ -1038,15 +1422,15 @@ class Game:
 
             # 图标和名称
             icon_name = f"{ach['icon']} {ach['name']}"
-            name_surface = self.font_small.render(icon_name, True, text_color)
+            name_surface = self.render_text(self.font_small, icon_name, text_color)
             self.screen.blit(name_surface, (x + 10, y + 10))
 
             # 描述
-            desc_surface = self.font_small.render(ach['description'], True, COLORS['TEXT'])
+            desc_surface = self.render_text(self.font_small, ach['description'], COLORS['TEXT'])
             self.screen.blit(desc_surface, (x + 10, y + 40))
 
         # 返回提示
-        back_text = self.font_small.render("Press [ESC] or [A] to go back 按 ESC 或 A 返回", True, COLORS['UI'])
+        back_text = self.render_text(self.font_small, "Press [ESC] or [A] to go back 按 ESC 或 A 返回", COLORS['UI'])
         back_rect = back_text.get_rect(center=(self.screen_width//2, self.screen_height - 40))
         self.screen.blit(back_text, back_rect)
     
@@ -1056,81 +1440,35 @@ class Game:
         
         # Draw level title
         lesson_title = NEW_CONCEPT_LESSONS[self.current_level]["title"]
-        title_text = self.font_medium.render(f"Level {NEW_CONCEPT_LESSONS[self.current_level]['level']}: {lesson_title}", True, COLORS['TEXT'])
+        title_text = self.render_text(self.font_medium, f"Level {NEW_CONCEPT_LESSONS[self.current_level]['level']}: {lesson_title}", COLORS['TEXT'])
         self.screen.blit(title_text, (20, 20))
         
         # Draw score
-        score_text = self.font_medium.render(f"Score: {self.score}", True, COLORS['TEXT'])
-        self.screen.blit(score_text, (self.screen_width - 150, 20))
+        score_text = self.render_volatile_text(self.font_medium, f"Score: {self.score}", COLORS['TEXT'])
+        self.mark_dirty(self.screen.blit(score_text, (self.screen_width - 150, 20)))
         
         # Draw progress
-        progress_text = self.font_small.render(f"Sentence {self.current_sentence_index + 1}/{len(NEW_CONCEPT_LESSONS[self.current_level]['sentences'])}", True, COLORS['TEXT'])
-        self.screen.blit(progress_text, (self.screen_width - 250, 60))
+        progress_text = self.render_text(self.font_small, f"Sentence {self.current_sentence_index + 1}/{len(NEW_CONCEPT_LESSONS[self.current_level]['sentences'])}", COLORS['TEXT'])
+        self.mark_dirty(self.screen.blit(progress_text, (self.screen_width - 250, 60)))
         
         # Draw error count
-        errors_text = self.font_small.render(f"Errors: {self.errors}/{MAX_ERRORS_PER_LEVEL}", True, 
+        errors_text = self.render_volatile_text(self.font_small, f"Errors: {self.errors}/{MAX_ERRORS_PER_LEVEL}", 
                                            COLORS['CORRECT'] if self.errors < MAX_ERRORS_PER_LEVEL * 0.5 else COLORS['WARNING'])
-        self.screen.blit(errors_text, (self.screen_width - 250, 85))
+        self.mark_dirty(self.screen.blit(errors_text, (self.screen_width - 250, 85)))
         
         # Draw target sentence with text highlighting (no boxes)
-        # 根据屏幕高度动态调整位置
-        sentence_y = self.screen_height // 4
-        
-        # Split sentence into words
-        words = self.current_sentence.split()
-        input_words = self.user_input.split()
-        
-        # Calculate total width needed for all words
-        total_width = 0
-        word_surfaces = []
-        for word in words:
-            word_surface = self.font_large.render(word, True, COLORS['TEXT'])
-            word_surfaces.append(word_surface)
-            total_width += word_surface.get_width() + 30  # 30px spacing between words
-        
-        # Start position to center the words
-        x_offset = (self.screen_width - total_width) // 2
-
-        # 清空单词位置记录
-        self.word_rects = []
-
-        # Draw all words with highlighting
-        for i, (word, word_surface) in enumerate(zip(words, word_surfaces)):
-            # Check if this word has been typed correctly
-            is_correct = i < len(input_words) and input_words[i] == word
-            is_typed = i < len(input_words)
-
-            # Determine text color
-            if is_typed:
-                if is_correct:
-                    text_color = COLORS['CORRECT']
-                else:
-                    text_color = COLORS['INCORRECT']
-            else:
-                text_color = COLORS['TEXT']
-
-            # Render word with correct color
-            word_surface_colored = self.font_large.render(word, True, text_color)
+        # 句子排版在加载句子时已预计算，这里只更新输入变化的单词状态
+        layout = self.get_sentence_layout()
+        changed_words = self.typing_state.pop_changed_words()
+        for index in layout.apply_states(self.typing_state, changed_words):
+            self.mark_dirty(layout.get_word_rect(index))
+        layout.draw(self.screen)
 
-            # 记录单词位置（用于点击朗读）
-            word_rect = pygame.Rect(x_offset, sentence_y, word_surface.get_width(), word_surface.get_height())
-            self.word_rects.append((word, word_rect, i))
-
-            # Draw text shadow for 3D effect
-            shadow_offset = 3
-            word_surface_shadow = self.font_large.render(word, True, COLORS['TEXT_SHADOW'])
-            self.screen.blit(word_surface_shadow, (x_offset + shadow_offset, sentence_y + shadow_offset))
-
-            # Draw main text
-            self.screen.blit(word_surface_colored, (x_offset, sentence_y))
-
-            x_offset += word_surface.get_width() + 30
-        
         # Draw input area with 3D effect
         input_y = self.screen_height // 2
         
         # Calculate input box width and height based on font size
-        input_surface = self.font_large.render(self.user_input, True, COLORS['INPUT'])
+        input_surface = self.render_volatile_text(self.font_large, self.user_input, COLORS['INPUT'])
         input_font_height = self.font_large.get_height()
         input_box_padding = int(input_font_height * 0.3)  # 边距为字体高度的30%
         input_box_height = input_font_height + input_box_padding * 2  # 框高度
@@ -1154,6 +1492,8 @@ class Game:
         
         # Draw main input box background
         input_box_rect = pygame.Rect(input_box_x, input_box_y, input_box_width, input_box_height)
+        # 输入框连同阴影层和边框线整体标记为脏区域
+        self.mark_dirty(input_box_rect.inflate(10, 10).move(4, 4))
         pygame.draw.rect(self.screen, COLORS['INPUT_BG'], input_box_rect)
         
         # Draw inner glow effect
@@ -1191,7 +1531,7 @@ class Game:
         cursor_y = input_text_y + (input_font_height - cursor_height) // 2
         
         # 光标闪烁效果
-        cursor_visible = (self.frame_count // 30) % 2 == 0
+        cursor_visible = int(self.game_clock.time / CURSOR_BLINK_INTERVAL) % 2 == 0
         if cursor_visible:
             # Draw cursor glow
             pygame.draw.line(self.screen, COLORS['GLOW'], (cursor_x - 1, cursor_y - 1), 
@@ -1201,24 +1541,27 @@ class Game:
                            (cursor_x, cursor_y + cursor_height), 2)
         
         # Draw game info
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = self.now() - self.start_time
         remaining_time = max(0, self.time_limit - elapsed_time)
         
         # 根据屏幕高度动态调整底部信息位置
         info_y = self.screen_height - 180
         
-        time_text = self.font_small.render(f"Time left: {int(remaining_time)}s", True, 
-                                          COLORS['CORRECT'] if remaining_time > 10 else COLORS['INCORRECT'])
-        self.screen.blit(time_text, (50, info_y))
+        time_text = self.render_volatile_text(self.font_small, f"Time left: {int(remaining_time)}s", 
+                                          COLORS['CORRECT'] if remaining_time > TIMER_CRITICAL_SECONDS else COLORS['INCORRECT'])
+        self.mark_dirty(self.screen.blit(time_text, (50, info_y)))
         
         accuracy = self.calculate_accuracy()
-        accuracy_text = self.font_small.render(f"Accuracy: {accuracy}%", True, 
+        accuracy_text = self.render_volatile_text(self.font_small, f"Accuracy: {accuracy}%", 
                                               COLORS['CORRECT'] if accuracy >= MIN_ACCURACY_FOR_PASS else COLORS['INCORRECT'])
-        self.screen.blit(accuracy_text, (200, info_y))
+        self.mark_dirty(self.screen.blit(accuracy_text, (200, info_y)))
         
-        speed = self.calculate_speed()
-        speed_text = self.font_small.render(f"Speed: {speed} chars/min", True, COLORS['TEXT'])
-        self.screen.blit(speed_text, (380, info_y))
+        # 最近一段时间的滚动速度
+        now = self.now()
+        speed_text = self.render_volatile_text(self.font_small,
+                                               f"Speed: {self.stats.rolling_cpm(now)} chars/min "
+                                               f"({self.stats.rolling_wpm(now)} WPM)", COLORS['TEXT'])
+        self.mark_dirty(self.screen.blit(speed_text, (380, info_y)))
         
         # Draw progress bar with enhanced visual effects
         progress_bar_y = self.screen_height - 120
@@ -1263,7 +1606,7 @@ class Game:
                        (progress_bar_x, progress_bar_y, progress_bar_width, progress_bar_height), 2)
         
         # 添加快捷键提示
-        hint_text = self.font_small.render("Press ESC to return to menu", True, COLORS['WARNING'])
+        hint_text = self.render_text(self.font_small, "Press ESC to return to menu", COLORS['WARNING'])
         hint_rect = hint_text.get_rect(center=(self.screen_width//2, self.screen_height - 60))
         self.screen.blit(hint_text, hint_rect)
 
@@ -1273,11 +1616,8 @@ class Game:
         # 绘制成就通知
         self.draw_achievement_notification()
 
-        # 更新并绘制粒子效果
-        self.update_and_draw_particles()
-
-        # 更新帧计数器
-        self.frame_count += 1
+        # 绘制粒子效果
+        self.draw_particles()
 
     def draw_combo(self):
         """绘制连击效果"""
@@ -1300,50 +1640,27 @@ class Game:
         scale = 1.0 + min(self.combo * 0.03, 0.3)
 
         # 绘制连击阴影
-        combo_shadow = self.font_medium.render(f"Combo x{self.combo}", True, COLORS['TEXT_SHADOW'])
-        self.screen.blit(combo_shadow, (combo_x + 2, combo_y + 2))
+        combo_shadow = self.render_volatile_text(self.font_medium, f"Combo x{self.combo}", COLORS['TEXT_SHADOW'])
+        self.mark_dirty(self.screen.blit(combo_shadow, (combo_x + 2, combo_y + 2)))
 
         # 绘制连击文字
-        combo_text = self.font_medium.render(f"Combo x{self.combo}", True, color)
-        self.screen.blit(combo_text, (combo_x, combo_y))
-
-        # 高连击时添加闪光粒子效果
-        if self.combo >= 5 and self.frame_count % 15 == 0:
-            sparkle_colors = [(255, 255, 100), (255, 215, 0), (255, 255, 255)]
-            for _ in range(3):
-                particle = {
-                    'x': combo_x + random.randint(0, 100),
-                    'y': combo_y + random.randint(-5, 20),
-                    'vx': random.uniform(-1, 1),
-                    'vy': random.uniform(-2, 0),
-                    'life': random.randint(15, 30),
-                    'color': random.choice(sparkle_colors),
-                    'size': random.randint(2, 4)
-                }
-                self.particles.append(particle)
+        combo_text = self.render_volatile_text(self.font_medium, f"Combo x{self.combo}", color)
+        self.mark_dirty(self.screen.blit(combo_text, (combo_x, combo_y)))
 
     def draw_achievement_notification(self):
         """绘制成就通知"""
-        # 检查新通知
-        if self.current_achievement_notification is None:
-            notification = self.achievement_system.get_pending_notification()
-            if notification:
-                self.current_achievement_notification = notification
-                self.notification_timer = 180  # 3秒显示时间（60fps * 3）
-
-        # 绘制当前通知
         if self.current_achievement_notification and self.notification_timer > 0:
             achievement = self.current_achievement_notification
-            self.notification_timer -= 1
 
             # 计算动画位置（滑入/滑出效果）
-            if self.notification_timer > 150:
+            slide_time = NOTIFICATION_SLIDE_TIME
+            if self.notification_timer > NOTIFICATION_DURATION - slide_time:
                 # 滑入阶段
-                progress = (180 - self.notification_timer) / 30
+                progress = (NOTIFICATION_DURATION - self.notification_timer) / slide_time
                 y_offset = int(-80 * (1 - progress))
-            elif self.notification_timer < 30:
+            elif self.notification_timer < slide_time:
                 # 滑出阶段
-                progress = self.notification_timer / 30
+                progress = self.notification_timer / slide_time
                 y_offset = int(-80 * (1 - progress))
             else:
                 y_offset = 0
@@ -1361,57 +1678,54 @@ class Game:
             shadow_rect = pygame.Rect(notification_x + 3, notification_y + 3,
                                       notification_width, notification_height)
             pygame.draw.rect(self.screen, (20, 20, 40), shadow_rect, border_radius=12)
+            self.mark_dirty(notification_rect.union(shadow_rect))
             # 主背景
             pygame.draw.rect(self.screen, (50, 50, 80), notification_rect, border_radius=12)
             # 金色边框
             pygame.draw.rect(self.screen, (255, 215, 0), notification_rect, 3, border_radius=12)
 
             # 绘制"Achievement Unlocked!"标题
-            title_text = self.font_small.render("Achievement Unlocked!", True, (255, 215, 0))
+            title_text = self.render_text(self.font_small, "Achievement Unlocked!", (255, 215, 0))
             self.screen.blit(title_text, (notification_x + 15, notification_y + 8))
 
             # 绘制成就名称和描述
-            name_text = self.font_medium.render(f"{achievement['icon']} {achievement['name']}", True, (255, 255, 255))
+            name_text = self.render_text(self.font_medium, f"{achievement['icon']} {achievement['name']}", (255, 255, 255))
             self.screen.blit(name_text, (notification_x + 15, notification_y + 32))
 
-            desc_text = self.font_small.render(achievement['description'], True, (180, 180, 200))
+            desc_text = self.render_text(self.font_small, achievement['description'], (180, 180, 200))
             self.screen.blit(desc_text, (notification_x + 15, notification_y + 58))
 
-            # 通知结束时清空
-            if self.notification_timer <= 0:
-                self.current_achievement_notification = None
-
     def draw_level_complete(self):
         """Draw level complete interface"""
         self.draw_gradient_background()
         
-        title = self.font_large.render("Level Complete!", True, COLORS['CORRECT'])
+        title = self.render_text(self.font_large, "Level Complete!", COLORS['CORRECT'])
         title_rect = title.get_rect(center=(self.screen_width//2, self.screen_height//5))
         self.screen.blit(title, title_rect)
         
-        score_text = self.font_medium.render(f"Level Score: {self.score - sum(self.level_scores[:self.current_level])}", True, COLORS['TEXT'])
+        score_text = self.render_text(self.font_medium, f"Level Score: {self.score - sum(self.level_scores[:self.current_level])}", COLORS['TEXT'])
         score_rect = score_text.get_rect(center=(self.screen_width//2, self.screen_height//3))
         self.screen.blit(score_text, score_rect)
         
-        total_score_text = self.font_medium.render(f"Total Score: {self.score}", True, COLORS['TEXT'])
+        total_score_text = self.render_text(self.font_medium, f"Total Score: {self.score}", COLORS['TEXT'])
         total_score_rect = total_score_text.get_rect(center=(self.screen_width//2, self.screen_height//3 + 50))
         self.screen.blit(total_score_text, total_score_rect)
         
         if self.current_level < len(NEW_CONCEPT_LESSONS) - 1:
-            next_text = self.font_medium.render("Press N for next level, M for menu", True, COLORS['TEXT'])
+            next_text = self.render_text(self.font_medium, "Press N for next level, M for menu", COLORS['TEXT'])
             next_rect = next_text.get_rect(center=(self.screen_width//2, self.screen_height//2))
             self.screen.blit(next_text, next_rect)
         else:
-            complete_text = self.font_medium.render("Congratulations! All levels completed!", True, COLORS['CORRECT'])
+            complete_text = self.render_text(self.font_medium, "Congratulations! All levels completed!", COLORS['CORRECT'])
             complete_rect = complete_text.get_rect(center=(self.screen_width//2, self.screen_height//2))
             self.screen.blit(complete_text, complete_rect)
             
-            menu_text = self.font_medium.render("Press M for menu", True, COLORS['TEXT'])
+            menu_text = self.render_text(self.font_medium, "Press M for menu", COLORS['TEXT'])
             menu_rect = menu_text.get_rect(center=(self.screen_width//2, self.screen_height//2 + 60))
             self.screen.blit(menu_text, menu_rect)
         
         # 添加退出提示
-        exit_text = self.font_small.render("Press ESC to exit game", True, COLORS['WARNING'])
+        exit_text = self.render_text(self.font_small, "Press ESC to exit game", COLORS['WARNING'])
         exit_rect = exit_text.get_rect(center=(self.screen_width//2, self.screen_height - 100))
         self.screen.blit(exit_text, exit_rect)
     
@@ -1419,145 +1733,156 @@ class Game:
         """Draw game over interface"""
         self.draw_gradient_background()
         
-        title = self.font_large.render("Game Over", True, COLORS['INCORRECT'])
+        title = self.render_text(self.font_large, "Game Over", COLORS['INCORRECT'])
         title_rect = title.get_rect(center=(self.screen_width//2, self.screen_height//5))
         self.screen.blit(title, title_rect)
         
-        score_text = self.font_medium.render(f"Final Score: {self.score}", True, COLORS['TEXT'])
+        score_text = self.render_text(self.font_medium, f"Final Score: {self.score}", COLORS['TEXT'])
         score_rect = score_text.get_rect(center=(self.screen_width//2, self.screen_height//3))
         self.screen.blit(score_text, score_rect)
         
-        restart_text = self.font_medium.render("Press R to restart, M for menu", True, COLORS['TEXT'])
+        restart_text = self.render_text(self.font_medium, "Press R to restart, M for menu", COLORS['TEXT'])
         restart_rect = restart_text.get_rect(center=(self.screen_width//2, self.screen_height//2))
         self.screen.blit(restart_text, restart_rect)
         
         # 添加退出提示
-        exit_text = self.font_small.render("Press ESC to exit game", True, COLORS['WARNING'])
+        exit_text = self.render_text(self.font_small, "Press ESC to exit game", COLORS['WARNING'])
         exit_rect = exit_text.get_rect(center=(self.screen_width//2, self.screen_height - 100))
         self.screen.blit(exit_text, exit_rect)
     
+    def draw_frame(self):
+        """按当前状态绘制一帧并推送到显示器 (Draw interface based on state)"""
+        if self.state == "menu":
+            self.draw_menu()
+        elif self.state == "course_select":
+            self.draw_course_select()
+        elif self.state == "leaderboard":
+            self.draw_leaderboard_screen()
+        elif self.state == "achievements":
+            self.draw_achievements_screen()
+        elif self.state == "playing":
+            self.draw_game()
+        elif self.state == "level_complete":
+            self.draw_level_complete()
+        elif self.state == "game_over":
+            self.draw_game_over()
+
+        self.present()
+
+    def handle_screen_key(self, key):
+        """处理 playing 以外界面的按键，返回 False 表示退出游戏"""
+        if self.state == "menu":
+            # 主菜单输入 (Main menu input)
+            if key == K_ESCAPE:
+                return False
+            elif key == K_UP:
+                self.menu_index = (self.menu_index - 1) % 3
+            elif key == K_DOWN:
+                self.menu_index = (self.menu_index + 1) % 3
+            elif key == K_RETURN:
+                # Enter确认选择
+                if self.menu_index == 0:  # Start Game
+                    self.state = "course_select"
+                elif self.menu_index == 1:  # Leaderboard
+                    self.state = "leaderboard"
+                elif self.menu_index == 2:  # Achievements
+                    self.state = "achievements"
+            elif key == K_1:
+                self.menu_index = 0
+                self.state = "course_select"
+            elif key == K_2:
+                self.menu_index = 1
+                self.state = "leaderboard"
+            elif key == K_3:
+                self.menu_index = 2
+                self.state = "achievements"
+
+        elif self.state == "course_select":
+            # 课程选择界面 (Course selection)
+            if key == K_ESCAPE:
+                self.state = "menu"
+            elif key == K_UP:
+                self.current_level = (self.current_level - 1) % len(NEW_CONCEPT_LESSONS)
+            elif key == K_DOWN:
+                self.current_level = (self.current_level + 1) % len(NEW_CONCEPT_LESSONS)
+            elif key == K_RETURN:
+                self.start_playing()
+            elif key in [K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8, K_9]:
+                level_idx = key - K_1
+                if level_idx < len(NEW_CONCEPT_LESSONS):
+                    self.current_level = level_idx
+                    self.start_playing()
+
+        elif self.state == "leaderboard":
+            # 排行榜界面 (Leaderboard)
+            if key in [K_ESCAPE, K_BACKSPACE]:
+                self.state = "menu"
+
+        elif self.state == "achievements":
+            # 成就界面 (Achievements)
+            if key in [K_ESCAPE, K_BACKSPACE]:
+                self.state = "menu"
+
+        elif self.state == "level_complete":
+            # 处理关卡完成输入 (Handle level complete input)
+            if key == K_ESCAPE:
+                self.state = "menu"
+            elif key == K_n:
+                if self.current_level < len(NEW_CONCEPT_LESSONS) - 1:
+                    self.current_level += 1
+                    self.start_playing()
+                else:
+                    self.state = "menu"
+            elif key == K_m:
+                self.state = "menu"
+
+        elif self.state == "game_over":
+            # 处理游戏结束输入 (Handle game over input)
+            if key == K_ESCAPE:
+                self.state = "menu"
+            elif key == K_r:
+                # 重新开始当前关卡
+                self.start_playing()
+            elif key == K_m:
+                # 返回菜单
+                self.state = "menu"
+        return True
+
     def run(self):
         """运行游戏主循环"""
         running = True
         # 启动背景音乐
         self.start_background_music()
         while running:
-            for event in pygame.event.get():
+            self.scheduler.update_mode(self.is_animating())
+            events = self.scheduler.get_events()
+            # 按键以取出事件的时间为起点统计延迟 (Stamp keystrokes for latency tracking)
+            self.latency.poll(self.scheduler.poll_started, self.scheduler.poll_finished)
+            playing_keys = []
+            for event in events:
                 if event.type == QUIT:
                     running = False
                 elif event.type == VIDEORESIZE:
                     # 处理窗口大小变化 (Handle window resize)
                     if not self.fullscreen:
                         self.handle_resize(event.w, event.h)
+                elif event.type == VIDEOEXPOSE:
+                    # 窗口被遮挡后重新显示，需要整屏刷新
+                    self.request_full_redraw()
                 elif event.type == KEYDOWN:
+                    self.latency.key_down(self.scheduler.poll_finished)
+                    # 静态界面的按键可能改变选中项等布局，整屏刷新
+                    if self.state != "playing":
+                        self.request_full_redraw()
                     # F11 全局切换全屏 (F11 toggle fullscreen globally)
                     if event.key == K_F11:
                         self.toggle_fullscreen()
                         continue
-                    if self.state == "menu":
-                        # 主菜单输入 (Main menu input)
-                        if event.key == K_ESCAPE:
-                            running = False
-                        elif event.key == K_UP:
-                            self.menu_index = (self.menu_index - 1) % 3
-                        elif event.key == K_DOWN:
-                            self.menu_index = (self.menu_index + 1) % 3
-                        elif event.key == K_RETURN:
-                            # Enter确认选择
-                            if self.menu_index == 0:  # Start Game
-                                self.state = "course_select"
-                            elif self.menu_index == 1:  # Leaderboard
-                                self.state = "leaderboard"
-                            elif self.menu_index == 2:  # Achievements
-                                self.state = "achievements"
-                        elif event.key == K_1:
-                            self.menu_index = 0
-                            self.state = "course_select"
-                        elif event.key == K_2:
-                            self.menu_index = 1
-                            self.state = "leaderboard"
-                        elif event.key == K_3:
-                            self.menu_index = 2
-                            self.state = "achievements"
-
-                    elif self.state == "course_select":
-                        # 课程选择界面 (Course selection)
-                        if event.key == K_ESCAPE:
-                            self.state = "menu"
-                        elif event.key == K_UP:
-                            self.current_level = (self.current_level - 1) % len(NEW_CONCEPT_LESSONS)
-                        elif event.key == K_DOWN:
-                            self.current_level = (self.current_level + 1) % len(NEW_CONCEPT_LESSONS)
-                        elif event.key == K_RETURN:
-                            self.reset_level()
-                            self.state = "playing"
-                            self.speak_sentence()
-                        elif event.key in [K_1, K_2, K_3, K_4, K_5, K_6, K_7, K_8, K_9]:
-                            level_idx = event.key - K_1
-                            if level_idx < len(NEW_CONCEPT_LESSONS):
-                                self.current_level = level_idx
-                                self.reset_level()
-                                self.state = "playing"
-                                self.speak_sentence()
-
-                    elif self.state == "leaderboard":
-                        # 排行榜界面 (Leaderboard)
-                        if event.key in [K_ESCAPE, K_BACKSPACE]:
-                            self.state = "menu"
-
-                    elif self.state == "achievements":
-                        # 成就界面 (Achievements)
-                        if event.key in [K_ESCAPE, K_BACKSPACE]:
-                            self.state = "menu"
-
-                    elif self.state == "playing":
-                        # 处理游戏输入 (Handle game input)
-                        if event.key == K_BACKSPACE:
-                            self.handle_input('\b')
-                        elif event.key == K_RETURN:
-                            self.handle_input('\r')
-                        elif event.key == K_ESCAPE:
-                            self.state = "menu"
-                        elif event.key == K_F1:
-                            # F1键朗读当前句子 (F1 to read sentence)
-                            self.speak_sentence()
-                        elif event.key == K_F2:
-                            # F2键朗读当前单词 (F2 to read current word)
-                            self.speak_current_word()
-                        else:
-                            # 获取按键字符（包括空格）
-                            # Get key character (including space)
-                            key_char = event.unicode
-                            if key_char:
-                                self.handle_input(key_char)
-
-                    elif self.state == "level_complete":
-                        # 处理关卡完成输入 (Handle level complete input)
-                        if event.key == K_ESCAPE:
-                            self.state = "menu"
-                        elif event.key == K_n:
-                            if self.current_level < len(NEW_CONCEPT_LESSONS) - 1:
-                                self.current_level += 1
-                                self.reset_level()
-                                self.state = "playing"
-                                self.speak_sentence()
-                            else:
-                                self.state = "menu"
-                        elif event.key == K_m:
-                            self.state = "menu"
-
-                    elif self.state == "game_over":
-                        # 处理游戏结束输入 (Handle game over input)
-                        if event.key == K_ESCAPE:
-                            self.state = "menu"
-                        elif event.key == K_r:
-                            # 重新开始当前关卡
-                            self.reset_level()
-                            self.state = "playing"
-                            self.speak_sentence()
-                        elif event.key == K_m:
-                            # 返回菜单
-                            self.state = "menu"
+                    if self.state == "playing":
+                        # 收集本帧的游戏输入，事件处理完后一次性处理 (Batch game input per frame)
+                        playing_keys.append((event.key, event.unicode))
+                    elif not self.handle_screen_key(event.key):
+                        running = False
 
                 # 处理鼠标点击事件（点击单词朗读）
                 elif event.type == MOUSEBUTTONDOWN:
@@ -1566,36 +1891,49 @@ class Game:
                             if rect.collidepoint(event.pos):
                                 self.speak_word(word)
                                 # 创建点击反馈粒子效果
-                                self.create_particles(rect.centerx, rect.centery, (100, 200, 255), 5)
+                                self.create_particles(rect.centerx, rect.centery, (100, 200, 255), 5,
+                                                      rng=self.particles.effect_rng)
                                 break
+            # 处理本帧的游戏输入（同时录制本局按键）(Handle and record game input)
+            # 按 ESC 或本关结束后剩余的按键交给新界面处理，其中的按键可能再次进入 playing
+            while playing_keys:
+                playing_keys = self.dispatch_playing_keys(playing_keys)
+                while playing_keys and self.state != "playing":
+                    key, _ = playing_keys.pop(0)
+                    self.request_full_redraw()
+                    if not self.handle_screen_key(key):
+                        running = False
+            self.latency.input_handled()
 
             # 检查时间限制
             if self.state == "playing":
-                elapsed_time = time.time() - self.start_time
-                if elapsed_time > self.time_limit:
-                    # 时间到，挑战失败
-                    self.state = "game_over"
-
-            # 绘制界面 (Draw interface based on state)
-            if self.state == "menu":
-                self.draw_menu()
-            elif self.state == "course_select":
-                self.draw_course_select()
-            elif self.state == "leaderboard":
-                self.draw_leaderboard_screen()
-            elif self.state == "achievements":
-                self.draw_achievements_screen()
-            elif self.state == "playing":
-                self.draw_game()
-            elif self.state == "level_complete":
-                self.draw_level_complete()
-            elif self.state == "game_over":
-                self.draw_game_over()
-            
-            pygame.display.flip()
-            self.clock.tick(FPS)
+                now = self.now()
+                offset = None
+                if self.recorder.active:
+                    # 与回放相同，按录制的微秒偏移计算检查时刻
+                    offset = self.recorder.offset_us(now)
+                    now = self.recorder.clock_base + offset / 1_000_000
+                if self.check_time_limit(now) and offset is not None:
+                    self.recorder.record(offset, EVENT_TIMEOUT)
+
+            # 离开 playing 界面时保存本局录制
+            if self.recorder.active and self.state != "playing":
+                self.finish_recording()
+
+            # 固定步长推进模拟，与渲染帧率解耦 (Fixed-timestep simulation)
+            for _ in range(self.game_clock.advance()):
+                self.update_simulation(self.game_clock.step)
+
+            # 窗口隐藏或失焦时不绘制 (Skip drawing while hidden/unfocused)
+            if self.scheduler.should_draw():
+                if self.scheduler.consume_resumed():
+                    self.request_full_redraw()
+                self.draw_frame()
+            self.scheduler.tick()
 
         # 清理资源
+        self.finish_recording()
+        self.latency.close()
         self.stop_voice_thread()
         self.stop_background_music()
         pygame.quit()
@@ -1,16 +1,68 @@
 """
 AutoWords 游戏模块
 """
-from .sound import SoundGenerator
+import importlib
+
 from .achievement import AchievementSystem
 from .level_system import LevelSystem
 from .leaderboard import Leaderboard
 from .daily_challenge import DailyChallenge
+from .text_cache import TextCache
+from .game_clock import GameClock
+from .typing_state import TypingState
+from .recording import SessionRecorder, SessionRecording, SessionReplayer
+from .latency import LatencyHistogram, LatencyTracker
+from .typing_stats import IntervalSketch, TypingStats
+from .typing_session import SessionListener, TypingSession
+from .tts_cache import TTSCache
+from .voice_queue import VoiceQueue
+
+
+# 依赖 pygame/numpy 的模块按需导入：打字会话等纯逻辑模块可以在没有图形和音频库的环境中使用，
+# 静音模式下也不加载音效合成
+_LAZY_MODULES = {
+    'SoundGenerator': '.sound',
+    'SoundBank': '.sound_bank',
+    'ChannelManager': '.channel_manager',
+    'SentenceLayout': '.sentence_layout',
+    'ParticleSystem': '.particles',
+    'Starfield': '.starfield',
+    'FrameScheduler': '.frame_scheduler',
+}
+
+
+def __getattr__(name):
+    """按需导入依赖 pygame/numpy 的模块"""
+    module = _LAZY_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
 
 __all__ = [
     'SoundGenerator',
+    'SoundBank',
+    'ChannelManager',
     'AchievementSystem',
     'LevelSystem',
     'Leaderboard',
-    'DailyChallenge'
+    'DailyChallenge',
+    'TextCache',
+    'SentenceLayout',
+    'ParticleSystem',
+    'Starfield',
+    'FrameScheduler',
+    'GameClock',
+    'TypingState',
+    'SessionRecorder',
+    'SessionRecording',
+    'SessionReplayer',
+    'LatencyHistogram',
+    'LatencyTracker',
+    'IntervalSketch',
+    'TypingStats',
+    'SessionListener',
+    'TypingSession',
+    'TTSCache',
+    'VoiceQueue'
 ]
@@ -0,0 +1,80 @@
+"""
+混音声道管理模块
+为每类音效保留一组固定的声道，组内没有空闲声道时抢占最早开始播放的声道，
+同一个音效在极短时间内重复播放时只播一次；统计活跃声道、抢占和丢弃次数
+"""
+import time
+
+import pygame
+
+
+class ChannelManager:
+    """按音效类别分组分配混音声道"""
+
+    def __init__(self, groups, first_channel=0, min_interval=0.04, clock=time.perf_counter):
+        """
+        Args:
+            groups: {类别: 声道数}，例如 {'type': 4, 'feedback': 4, 'event': 2}
+            first_channel: 第一个分配给音效的声道编号（之前的声道留给朗读等用途）
+            min_interval: 同一类别中同一个音效两次播放的最小间隔（秒），更快的重复播放被丢弃
+            clock: 时间函数（秒）
+        """
+        self.min_interval = min_interval
+        self.clock = clock
+        total = first_channel + sum(groups.values())
+        if pygame.mixer.get_num_channels() < total:
+            pygame.mixer.set_num_channels(total)
+        # 保留全部管理的声道，Sound.play() 自动分配时不会占用它们
+        pygame.mixer.set_reserved(total)
+
+        self.groups = {}
+        index = first_channel
+        for category, count in groups.items():
+            self.groups[category] = [pygame.mixer.Channel(i) for i in range(index, index + count)]
+            index += count
+        self.started = {}  # 声道 -> 开始播放时间
+        self.last_played = {category: {} for category in groups}  # 类别 -> {音效: 最近播放时间}
+        self.played = dict.fromkeys(groups, 0)
+        self.stolen = dict.fromkeys(groups, 0)
+        self.rate_limited = dict.fromkeys(groups, 0)
+
+    def play(self, category, sound):
+        """在类别的声道组中播放音效，返回使用的声道；被限速丢弃时返回 None"""
+        now = self.clock()
+        last = self.last_played[category]
+        if now - last.get(sound, float('-inf')) < self.min_interval:
+            self.rate_limited[category] += 1
+            return None
+        last[sound] = now
+
+        channels = self.groups[category]
+        channel = next((c for c in channels if not c.get_busy()), None)
+        if channel is None:
+            # 没有空闲声道：抢占本组最早开始的声道
+            channel = min(channels, key=lambda c: self.started.get(c, float('-inf')))
+            self.stolen[category] += 1
+        channel.play(sound)
+        self.started[channel] = now
+        self.played[category] += 1
+        return channel
+
+    def active_voices(self):
+        """各类别正在播放的声道数"""
+        return {category: sum(1 for c in channels if c.get_busy())
+                for category, channels in self.groups.items()}
+
+    def stop(self):
+        """停止所有管理的声道"""
+        for channels in self.groups.values():
+            for channel in channels:
+                channel.stop()
+
+    def get_stats(self):
+        """声道统计"""
+        return {
+            'active': self.active_voices(),
+            'played': dict(self.played),
+            'stolen': dict(self.stolen),
+            'rate_limited': dict(self.rate_limited),
+            'dropped_total': sum(self.rate_limited.values())
+        }
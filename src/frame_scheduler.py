@@ -0,0 +1,108 @@
+"""
+帧调度模块
+静态界面无动画、无输入时降低帧率或阻塞等待事件，窗口隐藏/失焦时完全暂停绘制
+"""
+import time
+
+import pygame
+
+
+class FrameScheduler:
+    """空闲感知的帧调度器"""
+
+    ACTIVE = 'active'        # 满帧率
+    IDLE = 'idle'            # 低帧率，阻塞在 event.wait 上
+    SUSPENDED = 'suspended'  # 窗口不可见/失焦，不绘制
+
+    # 表示有用户活动、需要立即恢复满帧率的事件
+    ACTIVITY_EVENTS = (pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+                       pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+                       pygame.MOUSEMOTION, pygame.MOUSEWHEEL)
+    SUSPEND_EVENTS = (pygame.WINDOWFOCUSLOST, pygame.WINDOWHIDDEN, pygame.WINDOWMINIMIZED)
+    RESUME_EVENTS = (pygame.WINDOWFOCUSGAINED, pygame.WINDOWSHOWN, pygame.WINDOWRESTORED,
+                     pygame.WINDOWEXPOSED)
+
+    def __init__(self, clock, fps=60, idle_fps=10, idle_timeout=2.0, suspended_timeout=0.5):
+        """
+        Args:
+            clock: pygame.time.Clock
+            fps: 活动时的帧率
+            idle_fps: 空闲时的帧率（阻塞等待事件的超时由它决定）
+            idle_timeout: 无输入、无动画多少秒后进入空闲
+            suspended_timeout: 暂停时每次阻塞等待的最长时间（秒），保证计时检查仍会运行
+        """
+        self.clock = clock
+        self.fps = fps
+        self.idle_fps = max(1, idle_fps)
+        self.idle_timeout = idle_timeout
+        self.suspended_timeout = suspended_timeout
+        self.suspended = False
+        self.last_activity = time.perf_counter()
+        self.mode = self.ACTIVE
+        self.resumed = False  # 从暂停恢复后需要整屏重绘
+        # 最近一次取事件的开始/结束时间（perf_counter），用于按键延迟统计
+        self.poll_started = self.poll_finished = time.perf_counter()
+
+    def wake(self):
+        """记录一次活动（按键、粒子生成等），立即恢复满帧率"""
+        self.last_activity = time.perf_counter()
+        self.mode = self.ACTIVE
+
+    def handle_event(self, event):
+        """根据事件更新调度状态"""
+        if event.type in self.SUSPEND_EVENTS:
+            self.suspended = True
+        elif event.type in self.RESUME_EVENTS:
+            if self.suspended:
+                self.resumed = True
+            self.suspended = False
+            self.wake()
+        elif event.type in self.ACTIVITY_EVENTS:
+            self.wake()
+
+    def update_mode(self, animating):
+        """根据是否有动画确定本帧的调度模式"""
+        if self.suspended:
+            self.mode = self.SUSPENDED
+        elif animating:
+            self.wake()
+        elif time.perf_counter() - self.last_activity >= self.idle_timeout:
+            self.mode = self.IDLE
+        else:
+            self.mode = self.ACTIVE
+        return self.mode
+
+    def get_events(self):
+        """获取本帧事件；空闲或暂停时阻塞等待，直到有事件或超时"""
+        self.poll_started = time.perf_counter()
+        if self.mode == self.ACTIVE:
+            events = pygame.event.get()
+        else:
+            if self.mode == self.IDLE:
+                timeout = int(1000 / self.idle_fps)
+            else:
+                timeout = int(self.suspended_timeout * 1000)
+            event = pygame.event.wait(timeout)
+            events = [] if event.type == pygame.NOEVENT else [event]
+            events.extend(pygame.event.get())
+        self.poll_finished = time.perf_counter()
+
+        for e in events:
+            self.handle_event(e)
+        return events
+
+    def should_draw(self):
+        """暂停时不绘制"""
+        return not self.suspended
+
+    def consume_resumed(self):
+        """是否刚从暂停恢复（读取后清除）"""
+        resumed = self.resumed
+        self.resumed = False
+        return resumed
+
+    def tick(self):
+        """帧末调用：活动时按满帧率限速，空闲/暂停时节奏已由 event.wait 控制"""
+        if self.mode == self.ACTIVE:
+            return self.clock.tick(self.fps)
+        return self.clock.tick()
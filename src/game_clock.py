@@ -0,0 +1,41 @@
+"""
+游戏时钟模块
+固定时间步长的模拟时钟（基于 time.perf_counter 的累加器），与可变帧率的渲染解耦
+"""
+import time
+
+
+class GameClock:
+    """固定步长模拟时钟"""
+
+    def __init__(self, step=1 / 60, max_frame_time=0.25):
+        """
+        Args:
+            step: 每个模拟步长（秒）
+            max_frame_time: 单帧最多计入的真实时间（秒），防止卡顿后追赶过多步
+        """
+        self.step = step
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.time = 0.0  # 已模拟的总时间（秒）
+        self.last = time.perf_counter()
+
+    def reset(self):
+        """丢弃累积的时间（例如从暂停恢复后）"""
+        self.accumulator = 0.0
+        self.last = time.perf_counter()
+
+    def advance(self):
+        """计入自上次调用以来的真实时间，返回本帧需要执行的模拟步数"""
+        now = time.perf_counter()
+        self.accumulator += min(now - self.last, self.max_frame_time)
+        self.last = now
+        steps = int(self.accumulator / self.step)
+        self.accumulator -= steps * self.step
+        self.time += steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """剩余累积时间占一个步长的比例（可用于渲染插值）"""
+        return self.accumulator / self.step
@@ -0,0 +1,199 @@
+"""
+按键延迟统计模块
+记录每次按键从取出事件到画面 flip、到打字音效开始播放的耗时，按阶段维护滚动直方图（p50/p95/p99），可选写入 JSONL
+"""
+import json
+import math
+import os
+import time
+from collections import deque
+
+
+# 各阶段含义（单位毫秒）：
+#   pacing: 上一次取事件结束到本次开始取事件的间隔，即按键在队列中等待的上限（帧节奏造成的延迟）
+#   handle: 取出事件到本帧事件处理完毕（handle_input 等）
+#   render: 事件处理完毕到开始 flip（模拟推进 + 绘制）
+#   flip:   pygame.display.flip / update 本身
+#   total:  取出事件到 flip 完成（按键到画面）
+#   sound:  取出事件到打字音效开始播放（按键到声音）
+STAGES = ('pacing', 'handle', 'render', 'flip', 'total', 'sound')
+
+
+class LatencyHistogram:
+    """最近 window 个样本的滚动直方图（固定宽度的桶，超出上限的样本计入最后一个桶）"""
+
+    def __init__(self, window=1000, bucket_ms=0.5, max_ms=250.0):
+        self.window = window
+        self.bucket_ms = bucket_ms
+        self.bucket_count = int(max_ms / bucket_ms)
+        self.counts = [0] * (self.bucket_count + 1)
+        self.samples = deque()
+        self.total_ms = 0.0
+
+    def _bucket(self, value_ms):
+        return min(int(max(value_ms, 0.0) / self.bucket_ms), self.bucket_count)
+
+    def add(self, value_ms):
+        """加入一个样本（毫秒），窗口满时移除最旧的样本"""
+        if len(self.samples) >= self.window:
+            old = self.samples.popleft()
+            self.counts[self._bucket(old)] -= 1
+            self.total_ms -= old
+        self.samples.append(value_ms)
+        self.counts[self._bucket(value_ms)] += 1
+        self.total_ms += value_ms
+
+    def __len__(self):
+        return len(self.samples)
+
+    def percentile(self, p):
+        """按桶计算分位数（返回所在桶的上边界，不超过窗口内最大值）"""
+        if not self.samples:
+            return 0.0
+        largest = max(self.samples)
+        rank = max(1, math.ceil(len(self.samples) * p / 100))
+        cumulative = 0
+        for index, count in enumerate(self.counts[:-1]):
+            cumulative += count
+            if cumulative >= rank:
+                return min((index + 1) * self.bucket_ms, largest)
+        return largest
+
+    def buckets(self):
+        """返回非空桶 [(下边界毫秒, 数量)]"""
+        return [(index * self.bucket_ms, count) for index, count in enumerate(self.counts) if count]
+
+    def clear(self):
+        self.counts = [0] * (self.bucket_count + 1)
+        self.samples.clear()
+        self.total_ms = 0.0
+
+    def summary(self):
+        """统计摘要"""
+        count = len(self.samples)
+        return {
+            'count': count,
+            'mean_ms': self.total_ms / count if count else 0.0,
+            'p50_ms': self.percentile(50),
+            'p95_ms': self.percentile(95),
+            'p99_ms': self.percentile(99),
+            'max_ms': max(self.samples) if count else 0.0,
+        }
+
+
+class LatencyTracker:
+    """按键到画面/声音的延迟跟踪
+
+    主循环在取出事件后调用 poll()，每个 KEYDOWN 调用 key_down()，事件处理完后调用 input_handled()，
+    播放打字音效时调用 sound_started()，flip 前后调用 frame_presented()。
+    """
+
+    def __init__(self, enabled=True, window=1000, dump_path=None, max_pending=256):
+        """
+        Args:
+            enabled: 关闭时所有记录方法直接返回
+            window: 每个阶段滚动直方图保留的样本数
+            dump_path: JSONL 文件路径，每次按键追加一行各阶段耗时（None 表示不写入）
+            max_pending: 等待画面 flip 的按键上限（窗口暂停绘制时丢弃最旧的）
+        """
+        self.enabled = enabled
+        self.histograms = {stage: LatencyHistogram(window) for stage in STAGES}
+        self.dump_path = dump_path
+        self.dump_file = None
+        self.max_pending = max_pending
+        self.pending = []  # [取出时间, 处理完成时间, 音效时间, pacing秒]
+        self.last_poll_end = None
+        self.poll_gap = 0.0
+        self.dropped = 0
+
+    def poll(self, started, finished):
+        """记录一次取事件（started/finished 为 perf_counter 读数）"""
+        if not self.enabled:
+            return
+        self.poll_gap = started - self.last_poll_end if self.last_poll_end is not None else 0.0
+        self.last_poll_end = finished
+
+    def key_down(self, timestamp):
+        """记录一个按键事件（timestamp 为取出该事件的时间）"""
+        if not self.enabled:
+            return
+        if len(self.pending) >= self.max_pending:
+            self.pending.pop(0)
+            self.dropped += 1
+        self.pending.append([timestamp, None, None, self.poll_gap])
+
+    def sound_started(self, timestamp=None):
+        """打字音效开始播放（一批按键只播放一次，记到所有尚未出声的按键上）"""
+        if not self.enabled or not self.pending:
+            return
+        timestamp = timestamp if timestamp is not None else time.perf_counter()
+        for entry in reversed(self.pending):
+            if entry[2] is not None:
+                break
+            entry[2] = timestamp
+
+    def input_handled(self, timestamp=None):
+        """本帧事件处理完毕"""
+        if not self.enabled or not self.pending:
+            return
+        timestamp = timestamp if timestamp is not None else time.perf_counter()
+        for entry in reversed(self.pending):
+            if entry[1] is not None:
+                break
+            entry[1] = timestamp
+
+    def frame_presented(self, flip_start, flip_end):
+        """本帧已推送到显示器，结算所有等待中的按键"""
+        if not self.enabled or not self.pending:
+            return
+        for event_time, handled, sound, pacing in self.pending:
+            if handled is None:
+                handled = flip_start
+            sample = {
+                'pacing': pacing * 1000,
+                'handle': (handled - event_time) * 1000,
+                'render': (flip_start - handled) * 1000,
+                'flip': (flip_end - flip_start) * 1000,
+                'total': (flip_end - event_time) * 1000,
+            }
+            if sound is not None:
+                sample['sound'] = (sound - event_time) * 1000
+            for stage, value in sample.items():
+                self.histograms[stage].add(value)
+            if self.dump_path:
+                self._dump(sample)
+        self.pending = []
+
+    def _dump(self, sample):
+        """追加一行 JSONL"""
+        try:
+            if self.dump_file is None:
+                directory = os.path.dirname(self.dump_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.dump_file = open(self.dump_path, 'a', encoding='utf-8')
+            record = {'time': round(time.time(), 3)}
+            record.update((stage, round(value, 3)) for stage, value in sample.items())
+            self.dump_file.write(json.dumps(record) + '\n')
+        except Exception as e:
+            print(f"写入延迟记录失败: {e}")
+            self.dump_path = None
+
+    def get_stats(self):
+        """各阶段的统计摘要"""
+        stats = {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+        stats['dropped'] = self.dropped
+        return stats
+
+    def reset(self):
+        """清空统计（不影响 JSONL 文件）"""
+        for histogram in self.histograms.values():
+            histogram.clear()
+        self.pending = []
+        self.dropped = 0
+
+    def close(self):
+        """关闭 JSONL 文件"""
+        if self.dump_file:
+            self.dump_file.close()
+            self.dump_file = None
@@ -0,0 +1,153 @@
+"""
+粒子系统模块
+使用预分配的 numpy 数组（结构数组布局）存储粒子，整体向量化更新
+所有参数均以秒为单位（速度: 像素/秒，重力: 像素/秒²，寿命: 秒）
+"""
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    """基于 numpy 的粒子系统"""
+
+    SIZE_DECAY = 6.0  # 粒子尺寸每秒的衰减量
+
+    def __init__(self, capacity=2000):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.rng = np.random.default_rng()
+        # 不参与回放的装饰效果（连击闪光、鼠标点击反馈）使用独立且不设种子的随机数，
+        # 它们按墙钟时间或未录制的事件触发，不能消耗 self.rng 的序列
+        self.effect_rng = np.random.default_rng()
+        self._sprites = {}  # (颜色, 半径) -> 预渲染的圆点
+
+    def seed(self, seed):
+        """重新设置随机数种子（用于可复现的回放）"""
+        self.rng = np.random.default_rng(seed)
+
+    def _reserve(self, count):
+        """预留 count 个粒子槽位，超出容量的部分丢弃，返回可写入的切片"""
+        count = max(0, min(count, self.capacity - self.count))
+        start = self.count
+        self.count += count
+        return slice(start, start + count)
+
+    def emit(self, x, y, color, count=10, speed=180.0, life=(0.33, 0.67), size=(2, 5),
+             spread_x=0, spread_y=0, vy_range=None, gravity=0.0, colors=None, rng=None):
+        """发射一批粒子
+
+        Args:
+            x, y: 发射位置
+            color: 粒子颜色（colors 为空时使用）
+            count: 粒子数量
+            speed: 水平（以及默认的垂直）速度范围 [-speed, speed]（像素/秒）
+            life: 生命周期范围（秒）
+            size: 尺寸范围（含两端）
+            spread_x, spread_y: 发射位置的随机偏移范围（含两端）
+            vy_range: 垂直速度范围（像素/秒），默认为 (-speed, speed)
+            gravity: 重力加速度（像素/秒²）
+            colors: 可选颜色列表，每个粒子随机选一种
+            rng: 使用的随机数生成器，默认为可设种子的 self.rng
+        Returns:
+            实际发射的粒子数（受容量限制）
+        """
+        if count <= 0:
+            return 0
+        # 随机数总是按请求的数量生成，容量是否受限都不影响随机序列（保证回放确定性）
+        rng = self.rng if rng is None else rng
+        offset_x = rng.integers(-spread_x, spread_x + 1, count) if spread_x else 0
+        offset_y = rng.integers(-spread_y, spread_y + 1, count) if spread_y else 0
+        if vy_range is None:
+            vy_range = (-speed, speed)
+        vx = rng.uniform(-speed, speed, count)
+        vy = rng.uniform(vy_range[0], vy_range[1], count)
+        lifetimes = rng.uniform(life[0], life[1], count)
+        sizes = rng.integers(size[0], size[1] + 1, count)
+        color_index = rng.integers(0, len(colors), count) if colors else None
+
+        s = self._reserve(count)
+        n = s.stop - s.start
+        if n == 0:
+            return 0
+        self.x[s] = x + (offset_x[:n] if spread_x else 0)
+        self.y[s] = y + (offset_y[:n] if spread_y else 0)
+        self.vx[s] = vx[:n]
+        self.vy[s] = vy[:n]
+        self.life[s] = lifetimes[:n]
+        self.size[s] = sizes[:n]
+        self.gravity[s] = gravity
+        if colors:
+            palette = np.asarray(colors, dtype=np.uint8)
+            self.color[s] = palette[color_index[:n]]
+        else:
+            self.color[s] = color
+        return n
+
+    def update(self, dt):
+        """向量化推进所有粒子 dt 秒，并批量压缩掉死亡的粒子"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n] * dt
+        self.y[:n] += self.vy[:n] * dt
+        self.life[:n] -= dt
+        np.maximum(self.size[:n] - self.SIZE_DECAY * dt, 1, out=self.size[:n])
+        self.vy[:n] += self.gravity[:n] * dt
+
+        alive = self.life[:n] > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count != n:
+            for arr in (self.x, self.y, self.vx, self.vy, self.life, self.size, self.gravity, self.color):
+                arr[:alive_count] = arr[:n][alive]
+            self.count = alive_count
+
+    def _get_sprite(self, color, radius):
+        """获取（或创建）指定颜色和半径的圆点精灵"""
+        key = (color, radius)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, color, (radius, radius), radius)
+            self._sprites[key] = sprite
+        return sprite
+
+    def draw(self, screen):
+        """绘制所有存活粒子（预渲染圆点精灵，一次 blits 调用完成）"""
+        n = self.count
+        if n == 0:
+            return
+        radii = self.size[:n].astype(np.int32)
+        xs = (self.x[:n].astype(np.int32) - radii).tolist()
+        ys = (self.y[:n].astype(np.int32) - radii).tolist()
+        colors = self.color[:n].tolist()
+        get_sprite = self._get_sprite
+        screen.blits([(get_sprite(tuple(color), radius), (px, py))
+                      for px, py, radius, color in zip(xs, ys, radii.tolist(), colors)],
+                     doreturn=False)
+
+    def get_bounds(self):
+        """获取所有粒子的包围矩形（无粒子时返回 None）"""
+        n = self.count
+        if n == 0:
+            return None
+        pad = int(self.size[:n].max()) + 1
+        left = int(self.x[:n].min()) - pad
+        top = int(self.y[:n].min()) - pad
+        right = int(self.x[:n].max()) + pad
+        bottom = int(self.y[:n].max()) + pad
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def clear(self):
+        """清除所有粒子"""
+        self.count = 0
+
+    def __len__(self):
+        return self.count
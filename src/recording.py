@@ -0,0 +1,221 @@
+"""
+按键录制与回放模块
+把每局游戏的输入记录为紧凑的 (时间偏移, 类型, 按键, 字符) 流，并能确定性地回放
+"""
+import json
+import os
+import time
+from datetime import datetime
+
+
+RECORDING_VERSION = 2  # 2: 按键事件增加各自的按键时间偏移
+
+EVENT_KEYDOWN = 'k'  # 按键事件：[批次偏移微秒, 'k', key, unicode, 按键偏移微秒]（版本 1 没有按键偏移）
+EVENT_TIMEOUT = 't'  # 句子超时：[偏移微秒, 't']
+
+
+class SessionRecorder:
+    """录制一局游戏（从进入 playing 到离开 playing）的输入"""
+
+    def __init__(self, keep=0):
+        """
+        Args:
+            keep: 目录中最多保留的录制文件数，保存新录制后删除最早的文件（0 为不限）
+        """
+        self.keep = keep
+        self.active = False
+        self.header = None
+        self.events = []
+        self.clock_base = 0.0
+
+    def start(self, header, clock_base):
+        """开始录制
+
+        Args:
+            header: 回放所需的初始状态（关卡、随机种子、分数等）
+            clock_base: 本局的时钟基准（单调时钟读数），事件时间以相对它的微秒偏移记录
+        """
+        self.active = True
+        self.clock_base = clock_base
+        self.header = dict(header, version=RECORDING_VERSION, clock_base=clock_base,
+                           started=datetime.now().isoformat(timespec='seconds'))
+        self.events = []
+
+    def offset_us(self, timestamp):
+        """把单调时钟读数转换为相对本局开始的整数微秒偏移"""
+        return int((timestamp - self.clock_base) * 1_000_000)
+
+    def record(self, offset_us, kind, key=None, unicode=None, key_offset_us=None):
+        """记录一个事件（按键事件的 offset_us 为批次时间，key_offset_us 为按键自己的时间）"""
+        if not self.active:
+            return
+        if kind == EVENT_KEYDOWN:
+            if key_offset_us is None:
+                key_offset_us = offset_us
+            self.events.append([offset_us, kind, key, unicode, key_offset_us])
+        else:
+            self.events.append([offset_us, kind])
+
+    def finish(self, final, directory):
+        """结束录制并保存到目录，返回文件路径（没有事件时不保存）"""
+        if not self.active:
+            return None
+        self.active = False
+        if not self.events:
+            return None
+
+        os.makedirs(directory, exist_ok=True)
+        try:
+            filepath, f = self._create_file(directory)
+            with f:
+                f.write(json.dumps({'header': self.header}, ensure_ascii=False) + '\n')
+                for event in self.events:
+                    f.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+                f.write(json.dumps({'final': final}) + '\n')
+        except Exception as e:
+            print(f"保存录制失败: {e}")
+            return None
+        self.prune(directory)
+        return filepath
+
+    def _create_file(self, directory):
+        """新建录制文件（文件名含毫秒时间戳；同名文件已存在时加序号，不覆盖旧录制），返回 (路径, 文件)"""
+        now = datetime.now()
+        stem = f"session_{now:%Y%m%d_%H%M%S}_{now.microsecond // 1000:03d}_L{self.header.get('level', 0) + 1}"
+        # 序号从同名录制的最大序号之后开始：prune 删掉的旧名字不会被重用，按名称排序仍是时间顺序
+        first = 0
+        for name in os.listdir(directory):
+            if name.startswith(stem) and name.endswith('.jsonl'):
+                rest = name[len(stem):-len('.jsonl')]
+                if rest == '':
+                    first = max(first, 1)
+                elif rest[1:].isdigit():
+                    first = max(first, int(rest[1:]) + 1)
+        for attempt in range(first, 100):
+            suffix = f"_{attempt:02d}" if attempt else ""
+            filepath = os.path.join(directory, f"{stem}{suffix}.jsonl")
+            try:
+                return filepath, open(filepath, 'x', encoding='utf-8')
+            except FileExistsError:
+                continue
+        raise FileExistsError(f"录制文件名已被占用: {stem}")
+
+    def prune(self, directory):
+        """只保留最新的 keep 个录制文件（文件名含时间戳，按名称排序即按时间排序）"""
+        if not self.keep:
+            return
+        try:
+            recordings = sorted(name for name in os.listdir(directory)
+                                if name.startswith('session_') and name.endswith('.jsonl'))
+        except OSError:
+            return
+        for name in recordings[:-self.keep]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError as e:
+                print(f"删除旧录制失败: {e}")
+
+
+class SessionRecording:
+    """已加载的录制文件"""
+
+    def __init__(self, header, events, final=None):
+        self.header = header
+        self.events = events
+        self.final = final
+
+    @classmethod
+    def load(cls, filepath):
+        """从 JSONL 文件加载录制"""
+        header = None
+        final = None
+        events = []
+        with open(filepath, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+                if isinstance(item, list):
+                    events.append(item)
+                elif 'header' in item:
+                    header = item['header']
+                elif 'final' in item:
+                    final = item['final']
+        if header is None:
+            raise ValueError(f"录制文件缺少头信息: {filepath}")
+        return cls(header, events, final)
+
+    @property
+    def duration(self):
+        """录制时长（秒）"""
+        return self.events[-1][0] / 1_000_000 if self.events else 0.0
+
+    @property
+    def keystrokes(self):
+        """按键事件数量"""
+        return sum(1 for event in self.events if event[1] == EVENT_KEYDOWN)
+
+
+class SessionReplayer:
+    """把录制的输入重新送入 Game 的输入处理流程"""
+
+    def __init__(self, game):
+        self.game = game
+
+    def replay(self, recording, realtime=False, on_event=None):
+        """回放一局录制
+
+        Args:
+            recording: SessionRecording
+            realtime: True 时按原始时间间隔回放，否则尽快回放
+            on_event: 每批事件处理后的回调（例如绘制一帧），参数为该批事件列表
+        Returns:
+            回放结束时的结果，格式与录制文件的 final 相同
+        """
+        game = self.game
+        header = recording.header
+        clock_base = header['clock_base']
+
+        game.begin_replay(header)
+        wall_start = time.perf_counter()
+        for batch in self.batches(recording.events):
+            offset_us = batch[0][0]
+            if realtime:
+                delay = offset_us / 1_000_000 - (time.perf_counter() - wall_start)
+                if delay > 0:
+                    time.sleep(delay)
+
+            game.frozen_time = clock_base + offset_us / 1_000_000
+            try:
+                if batch[0][1] == EVENT_KEYDOWN:
+                    key_times = None
+                    if all(len(event) > 4 for event in batch):
+                        key_times = [clock_base + event[4] / 1_000_000 for event in batch]
+                    game.handle_playing_keys([(event[2], event[3]) for event in batch], key_times)
+                elif batch[0][1] == EVENT_TIMEOUT:
+                    # 与实时游戏相同，由会话判定超时
+                    game.check_time_limit(game.frozen_time)
+            finally:
+                game.frozen_time = None
+            if on_event:
+                on_event(batch)
+        return game.get_session_result()
+
+    @staticmethod
+    def batches(events):
+        """把同一帧处理的按键（时间偏移相同的连续按键事件）合并为一批"""
+        batch = []
+        for event in events:
+            if batch and (event[1] != EVENT_KEYDOWN or batch[0][1] != EVENT_KEYDOWN
+                          or event[0] != batch[0][0]):
+                yield batch
+                batch = []
+            batch.append(event)
+        if batch:
+            yield batch
+
+    @staticmethod
+    def matches(result, final):
+        """回放结果是否与录制时的结果完全一致"""
+        return final is not None and result == final
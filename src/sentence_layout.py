@@ -0,0 +1,94 @@
+"""
+句子排版模块
+加载句子时一次性完成分词、定位和各状态文字的预渲染，绘制时只需 blit
+"""
+import pygame
+
+
+class SentenceLayout:
+    """单个目标句子的预计算排版"""
+
+    WORD_SPACING = 30  # 单词间距（像素）
+    SHADOW_OFFSET = 3  # 文字阴影偏移（像素）
+
+    STATE_NORMAL = 'normal'
+    STATE_CORRECT = 'correct'
+    STATE_INCORRECT = 'incorrect'
+
+    def __init__(self, sentence, font, colors, screen_width, y):
+        """
+        Args:
+            sentence: 目标句子
+            font: 渲染字体
+            colors: 颜色表，需要 TEXT / CORRECT / INCORRECT / TEXT_SHADOW
+            screen_width: 屏幕宽度（用于水平居中）
+            y: 句子所在行的 y 坐标
+        """
+        self.sentence = sentence
+        self.words = sentence.split()
+
+        state_colors = {
+            self.STATE_NORMAL: colors['TEXT'],
+            self.STATE_CORRECT: colors['CORRECT'],
+            self.STATE_INCORRECT: colors['INCORRECT']
+        }
+
+        # 预渲染每个单词的所有状态和阴影
+        self.surfaces = []
+        self.shadows = []
+        for word in self.words:
+            self.surfaces.append({
+                state: font.render(word, True, color)
+                for state, color in state_colors.items()
+            })
+            self.shadows.append(font.render(word, True, colors['TEXT_SHADOW']))
+
+        # 计算居中后的单词位置
+        total_width = sum(s[self.STATE_NORMAL].get_width() + self.WORD_SPACING
+                          for s in self.surfaces)
+        x_offset = (screen_width - total_width) // 2
+
+        self.rects = []
+        for surfaces in self.surfaces:
+            normal = surfaces[self.STATE_NORMAL]
+            self.rects.append(pygame.Rect(x_offset, y, normal.get_width(), normal.get_height()))
+            x_offset += normal.get_width() + self.WORD_SPACING
+
+        # 单词位置记录（用于点击朗读）：(单词, 矩形, 索引)
+        self.word_rects = [(word, rect, i) for i, (word, rect) in enumerate(zip(self.words, self.rects))]
+
+        self.states = [self.STATE_NORMAL] * len(self.words)
+
+    def apply_states(self, typing_state, indices=None):
+        """从输入状态同步单词状态，返回状态发生变化的单词索引列表
+
+        Args:
+            typing_state: TypingState，提供 word_status(index)
+            indices: 需要同步的单词索引，为 None 时同步全部单词
+        """
+        if indices is None:
+            indices = range(len(self.words))
+        changed = []
+        for i in indices:
+            if 0 <= i < len(self.states) and self.set_state(i, typing_state.word_status(i)):
+                changed.append(i)
+        return changed
+
+    def set_state(self, index, state):
+        """直接设置单个单词的状态，返回是否有变化"""
+        if self.states[index] == state:
+            return False
+        self.states[index] = state
+        return True
+
+    def get_word_rect(self, index):
+        """获取单词连同阴影所占的屏幕区域"""
+        rect = self.rects[index]
+        return rect.union(rect.move(self.SHADOW_OFFSET, self.SHADOW_OFFSET))
+
+    def draw(self, screen):
+        """绘制整句（每个单词一次阴影 blit 和一次文字 blit）"""
+        offset = self.SHADOW_OFFSET
+        for i, rect in enumerate(self.rects):
+            screen.blit(self.shadows[i], (rect.x + offset, rect.y + offset))
+            screen.blit(self.surfaces[i][self.states[i]], rect)
@@ -0,0 +1,160 @@
+"""
+音效库模块
+一次向量化计算生成全部程序音效（含大量不同音高/力度的打字音效变体），存放在同一块连续的
+int16 缓冲区中，各音效是缓冲区的切片；缓冲区按生成参数缓存为 .npy，之后启动时内存映射加载
+"""
+import hashlib
+import json
+import os
+import random
+
+import numpy as np
+import pygame
+
+
+class SoundBank:
+    """程序生成的音效库"""
+
+    VERSION = 1  # 合成算法变化时加一，使旧缓存失效
+
+    # 音效参数：时长（秒）、分音 (起始频率, 结束频率, 振幅)、指数衰减速度、是否加正弦窗、
+    # 音调所占比例、噪声振幅、增益（与 SoundGenerator 中的各生成函数一致）
+    TYPE = {'duration': 0.05, 'partials': [(800, 800, 0.5), (1200, 1200, 0.3)], 'decay': 60,
+            'window': False, 'tone': 0.8, 'noise': 0.02, 'gain': 0.5}
+    EFFECTS = {
+        'correct': {'duration': 0.15, 'partials': [(440, 640, 1.0)], 'decay': 0,
+                    'window': True, 'tone': 1.0, 'noise': 0.0, 'gain': 0.4},
+        'error': {'duration': 0.2, 'partials': [(300, 200, 1.0)], 'decay': 5,
+                  'window': False, 'tone': 1.0, 'noise': 0.0, 'gain': 0.4},
+        'complete': {'duration': 0.5, 'partials': [(523.25, 523.25, 1 / 3), (659.25, 659.25, 1 / 3),
+                                                   (783.99, 783.99, 1 / 3)], 'decay': 0,
+                     'window': True, 'tone': 1.0, 'noise': 0.0, 'gain': 0.5},
+    }
+
+    def __init__(self, sample_rate=44100, channels=2, type_variants=16, seed=0):
+        """
+        Args:
+            sample_rate: 采样率（与混音器一致）
+            channels: 声道数（与混音器一致）
+            type_variants: 打字音效变体数量（音高 ±15%，力度 75%~100%）
+            seed: 变体参数和噪声的随机种子
+        """
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.seed = seed
+        self.specs = self._make_specs(max(1, type_variants))
+        # 名称 -> (起始采样, 结束采样)
+        self.layout = {}
+        position = 0
+        for name, spec in self.specs:
+            count = int(sample_rate * spec['duration'])
+            self.layout[name] = (position, position + count)
+            position += count
+        self.length = position
+        self.buffer = None
+
+    def _make_specs(self, type_variants):
+        """展开打字音效变体，返回 [(名称, 参数)]"""
+        rng = random.Random(self.seed)
+        specs = []
+        for i in range(type_variants):
+            pitch = rng.uniform(0.85, 1.15)
+            velocity = rng.uniform(0.75, 1.0)
+            spec = dict(self.TYPE)
+            spec['partials'] = [(f0 * pitch, f1 * pitch, amp) for f0, f1, amp in self.TYPE['partials']]
+            spec['gain'] = self.TYPE['gain'] * velocity
+            specs.append((f'type{i}', spec))
+        specs.extend(self.EFFECTS.items())
+        return specs
+
+    def cache_key(self):
+        """由全部生成参数计算的缓存键"""
+        payload = json.dumps([self.VERSION, self.sample_rate, self.channels, self.seed, self.specs])
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+    def synthesize(self):
+        """一次向量化计算生成全部音效，返回 (总采样数, 声道数) 的连续 int16 数组"""
+        counts = np.array([end - start for start, end in self.layout.values()])
+        specs = [spec for _, spec in self.specs]
+        partial_count = max(len(spec['partials']) for spec in specs)
+
+        # 每个音效的参数，缺少的分音振幅为 0
+        f0 = np.zeros((len(specs), partial_count))
+        f1 = np.zeros((len(specs), partial_count))
+        amp = np.zeros((len(specs), partial_count))
+        for i, spec in enumerate(specs):
+            for k, (start_freq, end_freq, amplitude) in enumerate(spec['partials']):
+                f0[i, k], f1[i, k], amp[i, k] = start_freq, end_freq, amplitude
+        duration = np.array([spec['duration'] for spec in specs])
+
+        # 展开到每个采样：所属音效内的时间 t 及对应参数
+        starts = np.repeat(np.cumsum(counts) - counts, counts)
+        step = np.repeat(duration / counts, counts)
+        t = (np.arange(self.length) - starts) * step
+        progress = t / np.repeat(duration, counts)
+
+        def per_sample(values):
+            return np.repeat(values, counts, axis=0)
+
+        # 频率随时间线性滑动（与 SoundGenerator 相同的 sin(2π·f(t)·t) 写法）
+        freq = per_sample(f0) + (per_sample(f1) - per_sample(f0)) * progress[:, None]
+        wave = (per_sample(amp) * np.sin(2 * np.pi * freq * t[:, None])).sum(axis=1)
+
+        envelope = np.exp(-t * per_sample(np.array([spec['decay'] for spec in specs], dtype=float)))
+        window = per_sample(np.array([spec['window'] for spec in specs]))
+        envelope = np.where(window, np.sin(np.pi * progress), 1.0) * envelope
+
+        noise = np.random.default_rng(self.seed).uniform(-1.0, 1.0, self.length)
+        wave = (wave * envelope * per_sample(np.array([spec['tone'] for spec in specs]))
+                + noise * per_sample(np.array([spec['noise'] for spec in specs])))
+        samples = (wave * 32767 * per_sample(np.array([spec['gain'] for spec in specs]))).astype(np.int16)
+        return np.ascontiguousarray(np.repeat(samples[:, None], self.channels, axis=1))
+
+    def load(self, cache_dir=None):
+        """加载音效库：缓存存在且完整时内存映射，否则重新生成并写入缓存"""
+        path = None
+        if cache_dir:
+            path = os.path.join(cache_dir, f'sound_bank_{self.cache_key()}.npy')
+            try:
+                buffer = np.load(path, mmap_mode='r')
+                if buffer.shape == (self.length, self.channels) and buffer.dtype == np.int16:
+                    self.buffer = buffer
+                    return self
+            except (OSError, ValueError):
+                pass
+
+        self.buffer = self.synthesize()
+        if path:
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                with open(temp_path, 'wb') as f:
+                    np.save(f, self.buffer)
+                os.replace(temp_path, path)
+            except OSError as e:
+                print(f"无法写入音效缓存: {e}")
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+        return self
+
+    def samples(self, name):
+        """音效对应的缓冲区切片（不复制）"""
+        start, end = self.layout[name]
+        return self.buffer[start:end]
+
+    def sound(self, name):
+        """创建音效的 pygame Sound（直接读取缓冲区切片）"""
+        return pygame.mixer.Sound(buffer=self.samples(name))
+
+    def type_sounds(self):
+        """全部打字音效变体"""
+        return [self.sound(name) for name, _ in self.specs if name.startswith('type')]
+
+    @classmethod
+    def for_mixer(cls, type_variants=16, seed=0):
+        """按当前混音器的采样率和声道数创建音效库；混音器未初始化或不是 16 位格式时返回 None"""
+        mixer = pygame.mixer.get_init()
+        if not mixer or mixer[1] != -16:
+            return None
+        frequency, _, channels = mixer
+        return cls(frequency, channels, type_variants, seed)
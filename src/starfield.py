@@ -0,0 +1,97 @@
+"""
+星空背景模块
+每颗星预渲染若干闪烁亮度的小精灵，每帧按各图层的滚动偏移把所有星星一次 blits 到屏幕，
+不再逐颗画圆，也不修改整屏图层的透明度
+"""
+import math
+import random
+
+import pygame
+
+
+TWINKLE_STEPS = 16  # 每颗星预渲染的闪烁亮度档数
+TWINKLE_PERIOD = 2.0  # 闪烁周期（秒）
+
+# 预计算的闪烁亮度系数表，所有实例共享
+TWINKLE_TABLE = tuple(
+    (215 + 40 * math.sin(2 * math.pi * i / TWINKLE_STEPS)) / 255
+    for i in range(TWINKLE_STEPS)
+)
+
+
+class Starfield:
+    """多层视差滚动星空"""
+
+    BASE_AREA = 1000 * 700  # 基准画面面积（对应 BASE_STAR_COUNT 颗星）
+    BASE_STAR_COUNT = 100
+    LAYER_SPEEDS = (9.0, 18.0, 27.0)  # 各图层每秒上移的像素数（由远到近）
+    LAYER_SIZES = ((1, 1), (1, 2), (2, 3))  # 各图层星星半径范围
+    BRIGHTNESS_LEVELS = (100, 140, 180, 220, 255)  # 星星基础亮度档
+
+    def __init__(self, width, height, density=1.0):
+        """
+        Args:
+            width, height: 画面尺寸
+            density: 星星密度倍数（1.0 为基准画面 100 颗星）
+        """
+        self.width = width
+        self.height = height
+        self.star_count = max(1, int(self.BASE_STAR_COUNT * density * width * height / self.BASE_AREA))
+        self.time = 0.0
+        self.offsets = [0.0] * len(self.LAYER_SPEEDS)
+        # (半径, 亮度) -> 各闪烁档的精灵，同样的星星共用
+        self.sprites = {}
+        self.layers = [self._build_layer(i) for i in range(len(self.LAYER_SPEEDS))]
+
+    def _sprite_frames(self, size, brightness):
+        """半径 size、基础亮度 brightness 的星星在各闪烁档的精灵"""
+        key = (size, brightness)
+        frames = self.sprites.get(key)
+        if frames is None:
+            converted = pygame.display.get_surface() is not None
+            frames = []
+            for factor in TWINKLE_TABLE:
+                level = int(brightness * factor)
+                sprite = pygame.Surface((size * 2 + 1, size * 2 + 1))
+                if converted:
+                    sprite = sprite.convert()
+                sprite.fill((0, 0, 0))
+                pygame.draw.circle(sprite, (level, level, level), (size, size), size)
+                sprite.set_colorkey((0, 0, 0))
+                frames.append(sprite)
+            self.sprites[key] = frames
+        return frames
+
+    def _build_layer(self, index):
+        """生成一个图层的星星 [(左上角 x, 左上角 y, 精灵, 闪烁相位)]"""
+        min_size, max_size = self.LAYER_SIZES[index]
+        count = self.star_count // len(self.LAYER_SPEEDS)
+        if index == 0:
+            count += self.star_count % len(self.LAYER_SPEEDS)
+
+        stars = []
+        for _ in range(count):
+            size = random.randint(min_size, max_size)
+            frames = self._sprite_frames(size, random.choice(self.BRIGHTNESS_LEVELS))
+            # 每颗星的闪烁相位错开，避免整片星空同时明暗
+            stars.append((random.randint(0, self.width) - size, random.randint(0, self.height) - size,
+                          frames, random.randrange(TWINKLE_STEPS)))
+        return stars
+
+    def update(self, dt):
+        """推进滚动偏移和闪烁相位 dt 秒"""
+        self.time += dt
+        for i, speed in enumerate(self.LAYER_SPEEDS):
+            self.offsets[i] = (self.offsets[i] + speed * dt) % self.height
+
+    def draw(self, screen):
+        """绘制所有星星（一次 blits 调用）"""
+        step = int(self.time * TWINKLE_STEPS / TWINKLE_PERIOD)
+        height = self.height
+        sequence = []
+        for i, stars in enumerate(self.layers):
+            offset = int(self.offsets[i])
+            # 移出顶部的星星从底部重新出现
+            sequence.extend((frames[(step + phase) % TWINKLE_STEPS], (x, (y - offset) % height))
+                            for x, y, frames, phase in stars)
+        screen.blits(sequence, doreturn=False)
@@ -0,0 +1,57 @@
+"""
+文字渲染缓存模块
+用有界 LRU 缓存复用 font.render 的结果，避免每帧重复光栅化不变的文字
+"""
+from collections import OrderedDict
+
+
+class TextCache:
+    """已渲染文字表面的 LRU 缓存"""
+
+    def __init__(self, capacity=512):
+        self.capacity = max(1, capacity)
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        """返回渲染好的文字表面，命中缓存时不再调用 font.render
+
+        返回的表面被多处共享，调用方只能 blit，不能修改。
+        """
+        key = (id(font), font.get_height(), text, tuple(color), antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """清空缓存（字体更换后必须调用，旧字体的 id 可能被复用）"""
+        self._surfaces.clear()
+
+    def reset_stats(self):
+        """重置命中统计"""
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self):
+        """获取缓存统计信息"""
+        total = self.hits + self.misses
+        return {
+            'size': len(self._surfaces),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def __len__(self):
+        return len(self._surfaces)
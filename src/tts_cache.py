@@ -0,0 +1,146 @@
+"""
+TTS 音频缓存模块
+按 (文本, 语速, 语音) 的内容哈希把合成好的 WAV 保存到磁盘，总大小超出上限时按最近最少使用淘汰
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# 朗读单词时去掉的标点
+WORD_PUNCTUATION = '.,!?;:"\'-'
+
+
+def speech_texts(sentences):
+    """句子及其中不重复的单词（去掉标点），即课程需要朗读的全部文本，按首次出现排序"""
+    texts = []
+    seen = set()
+    for sentence in sentences:
+        for text in [sentence] + [word.strip(WORD_PUNCTUATION) for word in sentence.split()]:
+            if text and text not in seen:
+                seen.add(text)
+                texts.append(text)
+    return texts
+
+
+class TTSCache:
+    """内容寻址的 TTS 音频磁盘缓存（线程安全）"""
+
+    EXTENSION = '.wav'
+
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        """
+        Args:
+            directory: 缓存目录
+            max_bytes: 缓存总大小上限（字节）
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> 文件大小，按最近使用排序（最旧在前）
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._scan()
+
+    @staticmethod
+    def make_key(text, rate, voice):
+        """缓存键：(文本, 语速, 语音) 的 SHA-1"""
+        payload = json.dumps([text, rate, voice], ensure_ascii=False)
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+    def path_for(self, key):
+        """缓存键对应的文件路径"""
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    def _scan(self):
+        """从磁盘重建索引（按修改时间排序，修改时间即最近使用时间）"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            files = []
+            for name in os.listdir(self.directory):
+                if not name.endswith(self.EXTENSION):
+                    continue
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, name[:-len(self.EXTENSION)], stat.st_size))
+        except OSError as e:
+            print(f"无法读取TTS缓存目录: {e}")
+            return
+        for _, key, size in sorted(files):
+            self.entries[key] = size
+            self.total_bytes += size
+
+    def contains(self, text, rate, voice):
+        """是否已缓存（不计入命中统计，也不更新使用顺序）"""
+        with self.lock:
+            return self.make_key(text, rate, voice) in self.entries
+
+    def get(self, text, rate, voice):
+        """查找缓存，命中时返回文件路径并标记为最近使用，否则返回 None"""
+        key = self.make_key(text, rate, voice)
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            # 文件被外部删除
+            with self.lock:
+                self.total_bytes -= self.entries.pop(key, 0)
+            return None
+        return path
+
+    def synthesize(self, engine, text, rate, voice):
+        """用 pyttsx3 引擎把文本合成到缓存文件（先写临时文件再原子替换），返回路径，失败返回 None"""
+        key = self.make_key(text, rate, voice)
+        path = self.path_for(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # 以满音量合成，播放时再按音量设置调整，缓存内容与音量设置无关
+        volume = engine.getProperty('volume')
+        try:
+            engine.setProperty('volume', 1.0)
+            engine.save_to_file(text, temp_path)
+            engine.runAndWait()
+            if not os.path.exists(temp_path) or os.path.getsize(temp_path) == 0:
+                raise OSError("引擎没有生成音频文件")
+            os.replace(temp_path, path)
+        except Exception as e:
+            print(f"TTS合成失败: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return None
+        finally:
+            engine.setProperty('volume', volume)
+        self.add(key, os.path.getsize(path))
+        return path
+
+    def add(self, key, size):
+        """登记一个已写入的缓存文件，并按大小上限淘汰最旧的文件"""
+        with self.lock:
+            self.total_bytes += size - self.entries.pop(key, 0)
+            self.entries[key] = size
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                old_key, old_size = self.entries.popitem(last=False)
+                self.total_bytes -= old_size
+                try:
+                    os.remove(self.path_for(old_key))
+                except OSError:
+                    pass
+
+    def get_stats(self):
+        """缓存统计"""
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0.0
+            }
@@ -0,0 +1,229 @@
+"""
+打字会话模块
+与渲染、音效、语音无关的游戏核心：关卡进度、输入比对、计分、连击和错误统计。
+不依赖 pygame，状态使用 __slots__，一个进程可以同时承载大量会话（服务端计分、机器人、压测）
+"""
+from .typing_state import TypingState
+from .typing_stats import TypingStats
+
+
+class SessionListener:
+    """会话事件回调（默认全部为空操作）；Game 实现同名方法来播放音效、特效和朗读"""
+
+    def on_input(self, typed, correct, incorrect, peak_combo):
+        """一批字符输入处理完毕
+
+        Args:
+            typed: 输入或删除的字符数
+            correct: 其中正确字符数
+            incorrect: 其中错误字符数
+            peak_combo: 本批达到的最高连击
+        """
+
+    def on_sentence_complete(self, accuracy, speed):
+        """句子正确完成（已计分，尚未切换到下一句）"""
+
+    def on_sentence_rejected(self):
+        """句子未完成或有错误时按了回车"""
+
+    def on_next_sentence(self):
+        """完成一句后切换到了下一句"""
+
+    def on_level_complete(self):
+        """本关全部句子完成（已加上关卡奖励）"""
+
+
+class TypingSession:
+    """单个玩家的打字会话"""
+
+    PLAYING = 'playing'
+    LEVEL_COMPLETE = 'level_complete'
+    GAME_OVER = 'game_over'
+
+    __slots__ = ('lessons', 'listener', 'time_limit', 'score_per_char', 'level_multiplier',
+                 'completion_bonus', 'state', 'level', 'sentence_index', 'sentence',
+                 'typing_state', 'stats', 'start_time', 'score', 'level_scores',
+                 'errors', 'combo', 'max_combo', 'combo_time')
+
+    def __init__(self, lessons, listener=None, time_limit=30, score_per_char=10,
+                 level_multiplier=50, completion_bonus=100, stats_window=10.0):
+        """
+        Args:
+            lessons: 课程列表，每课为包含 'sentences' 的字典
+            listener: 事件回调（SessionListener 接口），None 表示不需要反馈
+            time_limit: 每个句子的时间限制（秒）
+            score_per_char: 每个正确字符的基础分数
+            level_multiplier: 关卡数乘数（影响分数）
+            completion_bonus: 完成关卡的奖励分数
+            stats_window: 滚动速度统计窗口（秒）
+        """
+        self.lessons = lessons
+        self.listener = listener if listener is not None else SessionListener()
+        self.time_limit = time_limit
+        self.score_per_char = score_per_char
+        self.level_multiplier = level_multiplier
+        self.completion_bonus = completion_bonus
+
+        self.state = None
+        self.level = 0
+        self.sentence_index = 0
+        self.sentence = ""
+        self.typing_state = TypingState()
+        self.stats = TypingStats(stats_window)
+        self.start_time = 0.0
+        self.score = 0
+        self.level_scores = [0] * len(lessons)
+        # 错误数和连击跨关卡累计
+        self.errors = 0
+        self.combo = 0
+        self.max_combo = 0
+        self.combo_time = 0.0
+
+    def start_level(self, level, now):
+        """开始（或重新开始）指定关卡"""
+        if level >= len(self.lessons):
+            return
+        self.level = level
+        self.state = self.PLAYING
+        self.sentence_index = 0
+        self.stats.reset(now)
+        self.next_sentence(now)
+        self.score = self.level_scores[level]
+
+    def next_sentence(self, now):
+        """加载当前索引的句子；没有更多句子时本关完成"""
+        sentences = self.lessons[self.level]["sentences"]
+        if self.sentence_index < len(sentences):
+            self.sentence = sentences[self.sentence_index]
+            self.typing_state.reset(self.sentence)
+            self.start_time = now
+            self.stats.start_sentence(now)
+        else:
+            self.state = self.LEVEL_COMPLETE
+            self.level_scores[self.level] = self.score
+
+    def handle_input(self, chars, now, key_times=None):
+        """处理一批输入字符（'\\b' 为退格，'\\r' 为回车），反馈每批只通知一次
+
+        Args:
+            chars: 输入字符序列
+            now: 本批的处理时间
+            key_times: 每个字符各自的按键时间（与 chars 等长），默认都为 now；
+                       速度和按键间隔统计使用各自的时间，同一帧内的按键不会被记为零间隔
+        Returns:
+            处理的字符数；本关完成后剩余的字符不处理
+        """
+        if self.state != self.PLAYING:
+            return 0
+
+        typed = correct = incorrect = peak_combo = 0
+        handled = 0
+        for char in chars:
+            if self.state != self.PLAYING:
+                break
+            key_time = key_times[handled] if key_times else now
+            handled += 1
+            if char == '\b':  # 退格键
+                removed_correct = self.typing_state.backspace()
+                self.stats.record_backspace(key_time, removed_correct)
+                if removed_correct is not None:
+                    # 退格时，如果最后一个字符是错误的，减少错误计数
+                    if not removed_correct:
+                        self.errors = max(0, self.errors - 1)
+                    typed += 1
+            elif char == '\r':  # 回车键
+                # 先给出本批已输入字符的反馈，再提交句子（可能切换到下一句）
+                if typed:
+                    self.listener.on_input(typed, correct, incorrect, peak_combo)
+                typed = correct = incorrect = peak_combo = 0
+                self.submit_sentence(key_time)
+            else:
+                # 添加字符到输入
+                typed += 1
+                is_correct = self.typing_state.type_char(char)
+                self.stats.record_key(key_time, is_correct)
+                if is_correct:
+                    correct += 1
+                    # 连击系统
+                    self.combo += 1
+                    self.combo_time = key_time
+                    self.max_combo = max(self.max_combo, self.combo)
+                    peak_combo = max(peak_combo, self.combo)
+                    # 连击奖励分数
+                    self.score += min(self.combo, 20)  # 最高20倍
+                else:
+                    # 输入错误，增加错误计数并重置连击
+                    incorrect += 1
+                    self.errors += 1
+                    self.combo = 0
+
+        if typed:
+            self.listener.on_input(typed, correct, incorrect, peak_combo)
+        return handled
+
+    def submit_sentence(self, now):
+        """回车提交当前句子：完成则计分并进入下一句，否则计一次错误"""
+        if not self.typing_state.is_complete():
+            # 句子未完成或不正确，增加错误计数并重置连击
+            self.errors += 1
+            self.combo = 0
+            self.listener.on_sentence_rejected()
+            return
+
+        accuracy = self.accuracy()
+        speed = self.speed(now)
+
+        # 计算得分：基于准确率和速度
+        base_score = len(self.sentence) * self.score_per_char
+        accuracy_bonus = base_score * (accuracy / 100)
+        speed_bonus = min(speed / 10, 50)  # 速度奖励上限
+        level_bonus = (self.level + 1) * self.level_multiplier
+        # 连击奖励
+        combo_multiplier = 1 + min(self.max_combo, 20) * 0.05  # 最高2倍
+        self.score += int((base_score + accuracy_bonus + speed_bonus + level_bonus) * combo_multiplier)
+        self.listener.on_sentence_complete(accuracy, speed)
+
+        # 进入下一句
+        self.sentence_index += 1
+        if self.sentence_index >= len(self.lessons[self.level]["sentences"]):
+            # 本关完成，添加关卡完成奖励
+            self.score += self.completion_bonus
+            self.level_scores[self.level] = self.score
+            self.state = self.LEVEL_COMPLETE
+            self.listener.on_level_complete()
+        else:
+            self.next_sentence(now)
+            self.listener.on_next_sentence()
+
+    def check_time_limit(self, now):
+        """当前句子超时则结束本局，返回是否刚刚超时"""
+        if self.state == self.PLAYING and now - self.start_time > self.time_limit:
+            self.state = self.GAME_OVER
+            return True
+        return False
+
+    def remaining_time(self, now):
+        """当前句子剩余时间（秒）"""
+        return self.time_limit - (now - self.start_time)
+
+    def accuracy(self):
+        """本关准确率（百分比整数）"""
+        return self.stats.accuracy()
+
+    def speed(self, now):
+        """当前句子的打字速度（字符/分钟）"""
+        return self.stats.sentence_cpm(now)
+
+    def get_result(self):
+        """会话结果（与录制文件的 final 格式相同）"""
+        return {
+            'state': self.state,
+            'level': self.level,
+            'sentence_index': self.sentence_index,
+            'score': self.score,
+            'errors': self.errors,
+            'combo': self.combo,
+            'max_combo': self.max_combo,
+            'correct_chars': self.stats.correct_chars,
+            'total_chars': self.stats.total_chars
+        }
@@ -0,0 +1,135 @@
+"""
+输入状态模块
+增量维护用户输入与目标句子的比对结果，每次按键/退格 O(1) 更新，避免每帧重新扫描整段输入
+"""
+
+
+class TypingState:
+    """针对单个目标句子的增量输入状态"""
+
+    STATE_NORMAL = 'normal'
+    STATE_CORRECT = 'correct'
+    STATE_INCORRECT = 'incorrect'
+
+    __slots__ = ('target', '_chars', '_correct', '_text', '_text_dirty', 'first_error', 'error_count',
+                 'word_starts', 'word_ends', '_owner', 'word_errors', '_changed_words')
+
+    def __init__(self, target=""):
+        self.reset(target)
+
+    def reset(self, target):
+        """切换到新的目标句子并清空输入"""
+        self.target = target
+        self._chars = []
+        self._correct = []  # 每个已输入字符是否正确
+        self._text = ""
+        self._text_dirty = False
+        self.first_error = None  # 第一个错误字符的位置
+        self.error_count = 0     # 当前输入中错误字符的数量
+
+        # 预计算每个位置所属的单词（单词后的分隔符归属前一个单词）
+        self.word_starts = []
+        self.word_ends = []
+        in_word = False
+        for i, ch in enumerate(target):
+            if not ch.isspace() and not in_word:
+                self.word_starts.append(i)
+                in_word = True
+            elif ch.isspace() and in_word:
+                self.word_ends.append(i)
+                in_word = False
+        if in_word:
+            self.word_ends.append(len(target))
+
+        self._owner = []
+        word = 0
+        for i in range(len(target)):
+            if word + 1 < len(self.word_starts) and i >= self.word_starts[word + 1]:
+                word += 1
+            self._owner.append(word)
+
+        self.word_errors = [0] * len(self.word_starts)
+        self._changed_words = set(range(len(self.word_starts)))
+
+    @property
+    def text(self):
+        """当前输入文本（仅在内容变化后重新拼接）"""
+        if self._text_dirty:
+            self._text = "".join(self._chars)
+            self._text_dirty = False
+        return self._text
+
+    def __len__(self):
+        return len(self._chars)
+
+    def _owner_of(self, index):
+        """位置所属的单词索引（超出句子长度的输入归属最后一个单词）"""
+        if index < len(self._owner):
+            return self._owner[index]
+        return len(self.word_starts) - 1
+
+    def type_char(self, char):
+        """输入一个字符，返回该字符是否正确"""
+        index = len(self._chars)
+        correct = index < len(self.target) and self.target[index] == char
+        self._chars.append(char)
+        self._correct.append(correct)
+        self._text_dirty = True
+        if not correct:
+            self.error_count += 1
+            if self.first_error is None:
+                self.first_error = index
+        self._mark_word(index, 0 if correct else 1)
+        return correct
+
+    def backspace(self):
+        """删除最后一个字符，返回被删字符是否正确（无输入时返回 None）"""
+        if not self._chars:
+            return None
+        index = len(self._chars) - 1
+        self._chars.pop()
+        correct = self._correct.pop()
+        self._text_dirty = True
+        if not correct:
+            self.error_count -= 1
+            if self.first_error == index:
+                self.first_error = None
+        self._mark_word(index, 0 if correct else -1)
+        return correct
+
+    def _mark_word(self, index, error_delta):
+        """更新位置所属单词的错误计数并记录其状态可能发生了变化"""
+        word = self._owner_of(index)
+        if word < 0:
+            return
+        self.word_errors[word] += error_delta
+        self._changed_words.add(word)
+
+    def is_correct_so_far(self):
+        """已输入部分是否全部正确（且没有超出句子长度）"""
+        return self.first_error is None
+
+    def is_complete(self):
+        """输入是否与目标句子完全一致"""
+        return self.first_error is None and len(self._chars) == len(self.target)
+
+    def word_status(self, index):
+        """单词状态：未输入为 normal，输完且无错误为 correct，否则为 incorrect"""
+        typed = len(self._chars)
+        if typed <= self.word_starts[index]:
+            return self.STATE_NORMAL
+        if self.word_errors[index] or typed < self.word_ends[index]:
+            return self.STATE_INCORRECT
+        return self.STATE_CORRECT
+
+    def pop_changed_words(self):
+        """返回自上次调用以来状态可能变化的单词索引，并清空记录"""
+        changed = self._changed_words
+        self._changed_words = set()
+        return changed
+
+    def current_word_index(self):
+        """正在输入的单词索引（没有单词时返回 -1）"""
+        if not self.word_starts:
+            return -1
+        return self._owner_of(min(len(self._chars), len(self.target) - 1))
@@ -0,0 +1,239 @@
+"""
+打字统计模块
+由按键事件驱动的流式统计：滚动窗口 CPM/WPM、准确率、按键间隔分位数和爆发速度，
+每次按键 O(1) 更新，内存占用固定
+"""
+import math
+
+
+class IntervalSketch:
+    """固定大小的对数分桶分位数草图
+
+    每个桶覆盖 (gamma^(i-1), gamma^i] 区间，分位数的相对误差不超过 relative_accuracy，
+    超出 [min_value, max_value] 的样本计入两端的桶。
+    """
+
+    __slots__ = ('gamma', 'log_gamma', 'offset', 'bucket_count', 'counts', 'count')
+
+    def __init__(self, min_value=0.001, max_value=10.0, relative_accuracy=0.02):
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.offset = math.floor(math.log(min_value) / self.log_gamma)
+        self.bucket_count = math.ceil(math.log(max_value) / self.log_gamma) - self.offset + 1
+        self.counts = [0] * self.bucket_count
+        self.count = 0
+
+    def add(self, value):
+        """加入一个样本（秒）"""
+        if value > 0:
+            index = math.ceil(math.log(value) / self.log_gamma) - self.offset
+            index = min(max(index, 0), self.bucket_count - 1)
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+
+    def quantile(self, q):
+        """估计分位数（q 取 0~1），没有样本时返回 0"""
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative > rank:
+                break
+        # 取桶区间的中点估计（相对误差最小）
+        return 2 * self.gamma ** (index + self.offset) / (self.gamma + 1)
+
+    def clear(self):
+        self.counts = [0] * self.bucket_count
+        self.count = 0
+
+
+class TypingStats:
+    """一局游戏的流式打字统计
+
+    所有时间都由调用方传入（游戏逻辑时钟），回放时结果可复现。
+    """
+
+    CHARS_PER_WORD = 5  # WPM 按每 5 个字符计一个单词
+
+    __slots__ = ('window', 'bucket_width', 'window_counts', 'burst_gap', 'burst_min_keys', 'intervals',
+                 'session_start', 'sentence_start', 'sentence_chars', 'correct_chars', 'total_chars',
+                 'keystrokes', 'correct_keystrokes', 'backspaces', 'window_total', 'window_bucket',
+                 'first_key_time', 'last_key_time', 'burst_start', 'burst_keys', 'peak_burst_cpm')
+
+    def __init__(self, window=10.0, buckets=20, burst_gap=1.0, burst_min_keys=5):
+        """
+        Args:
+            window: 滚动速度的时间窗口（秒）
+            buckets: 滚动窗口划分的时间桶数量
+            burst_gap: 按键间隔超过该值（秒）时结束当前爆发
+            burst_min_keys: 爆发至少包含的按键数，才计入最高爆发速度
+        """
+        self.window = window
+        self.bucket_width = window / buckets
+        self.window_counts = [0] * buckets
+        self.burst_gap = burst_gap
+        self.burst_min_keys = burst_min_keys
+        self.intervals = IntervalSketch()
+        self.reset(0.0)
+
+    def reset(self, timestamp):
+        """开始新的一局"""
+        self.session_start = timestamp
+        self.sentence_start = timestamp
+        self.sentence_chars = 0  # 当前句子的输入长度
+        # 计分用准确率：退格删除的字符从总数中扣除（错误字符的错误也随之撤销）
+        self.correct_chars = 0
+        self.total_chars = 0
+        # 按键准确率：每次按键都计入，不受退格影响
+        self.keystrokes = 0
+        self.correct_keystrokes = 0
+        self.backspaces = 0
+
+        for i in range(len(self.window_counts)):
+            self.window_counts[i] = 0
+        self.window_total = 0
+        self.window_bucket = None  # 最新一个时间桶的编号
+        self.first_key_time = None
+        self.last_key_time = None
+
+        self.intervals.clear()
+        self.burst_start = None
+        self.burst_keys = 0
+        self.peak_burst_cpm = 0.0
+
+    def start_sentence(self, timestamp):
+        """切换到新句子"""
+        self.sentence_start = timestamp
+        self.sentence_chars = 0
+
+    def _advance_window(self, timestamp):
+        """把滚动窗口推进到 timestamp 所在的时间桶，清空过期的桶"""
+        bucket = int(timestamp / self.bucket_width)
+        if self.window_bucket is None:
+            self.window_bucket = bucket
+            return
+        steps = min(bucket - self.window_bucket, len(self.window_counts))
+        for i in range(1, steps + 1):
+            slot = (self.window_bucket + i) % len(self.window_counts)
+            self.window_total -= self.window_counts[slot]
+            self.window_counts[slot] = 0
+        if bucket > self.window_bucket:
+            self.window_bucket = bucket
+
+    def record_key(self, timestamp, correct):
+        """记录一次字符输入"""
+        self.keystrokes += 1
+        self.total_chars += 1
+        self.sentence_chars += 1
+        if correct:
+            self.correct_keystrokes += 1
+            self.correct_chars += 1
+
+        self._advance_window(timestamp)
+        self.window_counts[self.window_bucket % len(self.window_counts)] += 1
+        self.window_total += 1
+
+        previous = self.last_key_time
+        # burst_cpm() 以 last_key_time 为爆发结束时间，先更新再计算最高爆发速度
+        self.last_key_time = timestamp
+        if previous is None:
+            self.first_key_time = timestamp
+            self.burst_start = timestamp
+            self.burst_keys = 1
+        else:
+            interval = timestamp - previous
+            self.intervals.add(interval)
+            if interval > self.burst_gap:
+                self.burst_start = timestamp
+                self.burst_keys = 1
+            else:
+                self.burst_keys += 1
+                if self.burst_keys >= self.burst_min_keys:
+                    self.peak_burst_cpm = max(self.peak_burst_cpm, self.burst_cpm())
+
+    def record_backspace(self, timestamp, removed_correct):
+        """记录一次退格（removed_correct 为被删字符是否正确，无字符可删时为 None）"""
+        if removed_correct is None:
+            return
+        self.backspaces += 1
+        self.total_chars = max(0, self.total_chars - 1)
+        if removed_correct:
+            self.correct_chars = max(0, self.correct_chars - 1)
+        self.sentence_chars = max(0, self.sentence_chars - 1)
+
+    def accuracy(self):
+        """计分用准确率（百分比整数）"""
+        if self.total_chars == 0:
+            return 100
+        return min(100, max(0, int((self.correct_chars / self.total_chars) * 100)))
+
+    def keystroke_accuracy(self):
+        """按键准确率（百分比，所有按键中正确的比例）"""
+        if self.keystrokes == 0:
+            return 100.0
+        return self.correct_keystrokes / self.keystrokes * 100
+
+    def sentence_cpm(self, now):
+        """当前句子的速度（字符/分钟）：句子输入长度 / 句子开始以来的时间"""
+        elapsed = now - self.sentence_start
+        if elapsed <= 0:
+            return 0
+        return int(self.sentence_chars / elapsed * 60)
+
+    def session_cpm(self, now):
+        """本局平均速度（字符/分钟）"""
+        elapsed = now - self.session_start
+        if elapsed <= 0:
+            return 0
+        return int(self.keystrokes / elapsed * 60)
+
+    def rolling_cpm(self, now):
+        """最近 window 秒的速度（字符/分钟）；本局不足一个窗口时按实际时长计算"""
+        if self.first_key_time is None:
+            return 0
+        self._advance_window(now)
+        # 窗口实际覆盖的时长：之前的完整时间桶 + 当前桶已经过的部分
+        covered = self.window - self.bucket_width + (now - self.window_bucket * self.bucket_width)
+        span = max(min(covered, now - self.first_key_time), self.bucket_width)
+        return int(self.window_total / span * 60)
+
+    def rolling_wpm(self, now):
+        """最近 window 秒的速度（单词/分钟）"""
+        return self.rolling_cpm(now) // self.CHARS_PER_WORD
+
+    def burst_cpm(self):
+        """当前爆发（间隔不超过 burst_gap 的连续按键）的速度（字符/分钟）"""
+        if self.burst_keys < 2:
+            return 0.0
+        duration = self.last_key_time - self.burst_start
+        if duration <= 0:
+            return 0.0
+        return (self.burst_keys - 1) / duration * 60
+
+    def interval_percentiles(self):
+        """按键间隔的 p50/p95/p99（毫秒）"""
+        return {
+            'p50_ms': self.intervals.quantile(0.50) * 1000,
+            'p95_ms': self.intervals.quantile(0.95) * 1000,
+            'p99_ms': self.intervals.quantile(0.99) * 1000,
+        }
+
+    def get_stats(self, now):
+        """统计摘要"""
+        stats = {
+            'rolling_cpm': self.rolling_cpm(now),
+            'rolling_wpm': self.rolling_wpm(now),
+            'session_cpm': self.session_cpm(now),
+            'sentence_cpm': self.sentence_cpm(now),
+            'accuracy': self.accuracy(),
+            'keystroke_accuracy': self.keystroke_accuracy(),
+            'keystrokes': self.keystrokes,
+            'backspaces': self.backspaces,
+            'peak_burst_cpm': self.peak_burst_cpm,
+        }
+        stats.update(self.interval_percentiles())
+        return stats
@@ -0,0 +1,192 @@
+"""
+语音队列模块
+有界的朗读优先级队列：句子 > 单词 > 夸奖 > 鼓励。新的句子/反馈会替换尚未播放的旧请求，
+反馈语等待过久即丢弃，更高优先级的请求可以打断正在播放的朗读；
+新句子排在此前已加入的反馈语之后（先夸奖上一句，再朗读下一句）
+"""
+import threading
+import time
+
+
+class VoiceRequest:
+    """一个朗读请求"""
+
+    __slots__ = ('text', 'category', 'priority', 'created', 'seq')
+
+    def __init__(self, text, category, priority, created, seq):
+        self.text = text
+        self.category = category
+        self.priority = priority  # 数值越小优先级越高
+        self.created = created
+        self.seq = seq
+
+
+class VoiceQueue:
+    """朗读请求的有界优先级队列（线程安全，单个消费线程）"""
+
+    SENTENCE = 'sentence'
+    WORD = 'word'
+    PRAISE = 'praise'
+    ENCOURAGEMENT = 'encouragement'
+
+    PRIORITIES = {SENTENCE: 0, WORD: 1, PRAISE: 2, ENCOURAGEMENT: 3}
+    # 同组只保留最新的一个请求：新句子出现后旧句子已过时，新的反馈语取代旧的反馈语；
+    # 单词（点击/F2）不合并，按顺序朗读
+    GROUPS = {SENTENCE: 'sentence', PRAISE: 'feedback', ENCOURAGEMENT: 'feedback'}
+
+    def __init__(self, maxsize=4, feedback_max_age=2.0, clock=time.monotonic):
+        """
+        Args:
+            maxsize: 等待中的请求上限，满时丢弃优先级最低的请求
+            feedback_max_age: 夸奖/鼓励等待超过该时间（秒）后不再朗读，None 表示不过期
+            clock: 时间函数（秒）
+        """
+        self.maxsize = max(1, maxsize)
+        self.max_age = {self.PRAISE: feedback_max_age, self.ENCOURAGEMENT: feedback_max_age}
+        self.clock = clock
+        self.condition = threading.Condition()
+        self.pending = []
+        self.current = None  # 正在播放的请求
+        self.interrupted = False  # 正在播放的请求需要停止
+        self.closed = False
+        self.seq = 0
+
+        self.enqueued = 0
+        self.played = 0
+        self.interruptions = 0
+        self.max_depth = 0
+        self.dropped = {'coalesced': 0, 'expired': 0, 'overflow': 0}
+
+    def put(self, text, category=WORD):
+        """加入一个朗读请求，返回是否被接受（队列满且优先级最低时被拒绝）"""
+        priority = self.PRIORITIES[category]
+        with self.condition:
+            if self.closed:
+                return False
+            group = self.GROUPS.get(category)
+            if group is not None:
+                stale = [r for r in self.pending if self.GROUPS.get(r.category) == group]
+                for request in stale:
+                    self.pending.remove(request)
+                self.dropped['coalesced'] += len(stale)
+
+            if len(self.pending) >= self.maxsize:
+                # 淘汰优先级最低、最早的请求；新请求本身最低时直接拒绝
+                victim = max(self.pending, key=lambda r: (r.priority, -r.seq))
+                if victim.priority <= priority:
+                    self.dropped['overflow'] += 1
+                    return False
+                self.pending.remove(victim)
+                self.dropped['overflow'] += 1
+
+            self.seq += 1
+            self.pending.append(VoiceRequest(text, category, priority, self.clock(), self.seq))
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, len(self.pending))
+
+            if self.current is not None and self._interrupts(category, priority, self.current):
+                if not self.interrupted:
+                    self.interruptions += 1
+                self.interrupted = True
+            self.condition.notify()
+            return True
+
+    def _follows(self, category, request):
+        """category 的新请求是否排在已加入的 request 之后（新句子等待之前的反馈语）"""
+        return category == self.SENTENCE and self.GROUPS.get(request.category) == 'feedback'
+
+    def _interrupts(self, category, priority, current):
+        """新请求是否打断正在播放的 current：优先级更高，或同组的新请求取代旧请求；
+        同优先级的单词不互相打断，按顺序朗读"""
+        if self._follows(category, current):
+            return False
+        group = self.GROUPS.get(category)
+        if group is not None and group == self.GROUPS.get(current.category):
+            return True
+        return priority < current.priority
+
+    def _next(self):
+        """下一个要播放的请求：优先级最高、最早的请求，句子之前加入的反馈语先播放"""
+        request = min(self.pending, key=lambda r: (r.priority, r.seq))
+        earlier = [r for r in self.pending if r.seq < request.seq and self._follows(request.category, r)]
+        if earlier:
+            request = min(earlier, key=lambda r: r.seq)
+        return request
+
+    def _expire(self, now):
+        """移除等待过久的反馈语"""
+        fresh = []
+        for request in self.pending:
+            max_age = self.max_age.get(request.category)
+            if max_age is not None and now - request.created > max_age:
+                self.dropped['expired'] += 1
+            else:
+                fresh.append(request)
+        self.pending = fresh
+
+    def get(self, timeout=None):
+        """取出优先级最高的请求并标记为正在播放；超时或队列已关闭时返回 None"""
+        with self.condition:
+            deadline = None if timeout is None else self.clock() + timeout
+            while True:
+                if self.closed:
+                    return None
+                self._expire(self.clock())
+                if self.pending:
+                    break
+                if deadline is None:
+                    self.condition.wait()
+                else:
+                    remaining = deadline - self.clock()
+                    if remaining <= 0:
+                        return None
+                    self.condition.wait(remaining)
+            request = self._next()
+            self.pending.remove(request)
+            self.current = request
+            self.interrupted = False
+            return request
+
+    def done(self, request):
+        """请求播放结束（或被打断）"""
+        with self.condition:
+            if self.current is request:
+                self.current = None
+                self.interrupted = False
+            self.played += 1
+
+    def should_stop(self):
+        """正在播放的请求是否应被打断（消费线程在播放过程中轮询）"""
+        return self.interrupted or self.closed
+
+    def clear(self):
+        """丢弃所有等待中的请求并打断正在播放的请求"""
+        with self.condition:
+            self.dropped['coalesced'] += len(self.pending)
+            self.pending = []
+            if self.current is not None:
+                self.interrupted = True
+
+    def close(self):
+        """关闭队列，唤醒消费线程"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+    def qsize(self):
+        """等待中的请求数"""
+        with self.condition:
+            return len(self.pending)
+
+    def get_stats(self):
+        """队列统计"""
+        with self.condition:
+            return {
+                'depth': len(self.pending),
+                'max_depth': self.max_depth,
+                'enqueued': self.enqueued,
+                'played': self.played,
+                'interrupted': self.interruptions,
+                'dropped': dict(self.dropped),
+                'dropped_total': sum(self.dropped.values())
+            }
@@ -0,0 +1,72 @@
+"""ChannelManager 声道抢占与限速测试"""
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pygame = pytest.importorskip('pygame')
+
+from src.channel_manager import ChannelManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(scope='module')
+def mixer():
+    """dummy 音频驱动下的混音器"""
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    try:
+        pygame.mixer.init(44100, -16, 2)
+    except pygame.error as e:
+        pytest.skip(f"混音器不可用: {e}")
+    yield
+    pygame.mixer.quit()
+
+
+def long_sounds(count):
+    """count 个不同的 5 秒静音音效（测试期间一直处于播放状态）"""
+    return [pygame.mixer.Sound(buffer=np.full((44100 * 5, 2), i, dtype=np.int16)) for i in range(count)]
+
+
+def test_steals_the_oldest_channel_in_group(mixer):
+    """组内没有空闲声道时按开始时间从早到晚依次抢占，不影响其他组"""
+    clock = FakeClock()
+    manager = ChannelManager({'type': 2, 'event': 1}, first_channel=1, clock=clock)
+    sounds = long_sounds(5)
+    channels = []
+    for sound in sounds[:2]:
+        channels.append(manager.play('type', sound))
+        clock.now += 0.1
+    event_channel = manager.play('event', sounds[4])
+
+    assert manager.play('type', sounds[2]) is channels[0]
+    clock.now += 0.1
+    assert manager.play('type', sounds[3]) is channels[1]
+    assert manager.stolen == {'type': 2, 'event': 0}
+    assert event_channel.get_sound() is sounds[4]
+    assert manager.active_voices() == {'type': 2, 'event': 1}
+    manager.stop()
+
+
+def test_rate_limits_repeats_of_the_same_sound(mixer):
+    """同一音效在最小间隔内重复播放被丢弃，不同音效和间隔之后的播放不受影响"""
+    clock = FakeClock()
+    manager = ChannelManager({'type': 4}, first_channel=1, min_interval=0.04, clock=clock)
+    first, second = long_sounds(2)
+    assert manager.play('type', first) is not None
+    clock.now += 0.01
+    assert manager.play('type', first) is None
+    assert manager.play('type', second) is not None
+    clock.now += 0.05
+    assert manager.play('type', first) is not None
+    stats = manager.get_stats()
+    assert stats['played'] == {'type': 3}
+    assert stats['rate_limited'] == {'type': 1}
+    assert stats['dropped_total'] == 1
+    manager.stop()
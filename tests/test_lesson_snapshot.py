@@ -0,0 +1,95 @@
+"""课程编译快照测试"""
+import json
+import os
+
+from data.lessons.loader import SNAPSHOT_HEADER, LessonLoader, LessonSnapshot
+
+
+def write_lessons(base, name, titles):
+    """在 base/new_concept 下写入一个课程文件"""
+    directory = os.path.join(base, 'new_concept')
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    data = {'lessons': [{'title': title, 'sentences': [{'text': f'{title}.', 'translation': ''}]}
+                        for title in titles]}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    return path
+
+
+def make_loader(tmp_path):
+    return LessonLoader(str(tmp_path / 'lessons'), str(tmp_path / 'cache' / 'lessons.snapshot'))
+
+
+def titles(lessons):
+    return [lesson['title'] for lesson in lessons]
+
+
+def test_snapshot_is_written_and_reused(tmp_path, monkeypatch):
+    """首次加载写入快照，源文件未变时直接从快照读取"""
+    write_lessons(str(tmp_path / 'lessons'), 'book1.json', ['A', 'B'])
+    assert titles(make_loader(tmp_path).load_all()) == ['A', 'B']
+    assert os.path.exists(tmp_path / 'cache' / 'lessons.snapshot')
+
+    def fail(*args):
+        raise AssertionError("快照有效时不应解析 JSON")
+    monkeypatch.setattr(LessonLoader, '_load_json_file', fail)
+    assert titles(make_loader(tmp_path).load_all()) == ['A', 'B']
+
+
+def test_snapshot_rebuilds_when_size_changes(tmp_path):
+    """课程文件内容（大小）变化后重新生成快照"""
+    write_lessons(str(tmp_path / 'lessons'), 'book1.json', ['A'])
+    make_loader(tmp_path).load_all()
+    write_lessons(str(tmp_path / 'lessons'), 'book1.json', ['A', 'Longer title'])
+    assert titles(make_loader(tmp_path).load_all()) == ['A', 'Longer title']
+
+
+def test_snapshot_rebuilds_when_mtime_changes(tmp_path):
+    """大小不变但修改时间变化时也重新生成快照"""
+    path = write_lessons(str(tmp_path / 'lessons'), 'book1.json', ['A'])
+    make_loader(tmp_path).load_all()
+    write_lessons(str(tmp_path / 'lessons'), 'book1.json', ['B'])
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert titles(make_loader(tmp_path).load_all()) == ['B']
+
+
+def test_snapshot_rebuilds_when_files_are_added_or_removed(tmp_path):
+    """增加或删除课程文件后重新生成快照"""
+    base = str(tmp_path / 'lessons')
+    write_lessons(base, 'book1.json', ['A'])
+    make_loader(tmp_path).load_all()
+    path = write_lessons(base, 'book2.json', ['B'])
+    assert titles(make_loader(tmp_path).load_all()) == ['A', 'B']
+    os.remove(path)
+    assert titles(make_loader(tmp_path).load_all()) == ['A']
+
+
+def test_corrupt_or_truncated_snapshot_is_ignored(tmp_path):
+    """快照损坏或不完整时重新从 JSON 加载"""
+    write_lessons(str(tmp_path / 'lessons'), 'book1.json', ['A'])
+    make_loader(tmp_path).load_all()
+    snapshot = tmp_path / 'cache' / 'lessons.snapshot'
+    data = snapshot.read_bytes()
+    snapshot.write_bytes(data[:-5])
+    assert titles(make_loader(tmp_path).load_all()) == ['A']
+    snapshot.write_bytes(b'garbage')
+    assert titles(make_loader(tmp_path).load_all()) == ['A']
+    assert snapshot.read_bytes() == data
+
+
+def test_snapshot_is_plain_json(tmp_path):
+    """快照头部和课程数据都是 JSON，不包含可执行的序列化对象"""
+    write_lessons(str(tmp_path / 'lessons'), 'book1.json', ['A'])
+    loader = make_loader(tmp_path)
+    lessons = loader.load_all()
+    manifest = loader._manifest(loader._source_files())
+    assert LessonSnapshot.read(loader.snapshot_path, manifest) == lessons
+    assert LessonSnapshot.read(loader.snapshot_path, []) is None
+
+    with open(loader.snapshot_path, 'rb') as f:
+        _, header_size = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+        header = json.loads(f.read(header_size).decode('utf-8'))
+        assert json.loads(f.read().decode('utf-8')) == lessons
+    assert header['manifest'] == [list(entry) for entry in manifest]
@@ -0,0 +1,24 @@
+"""模拟打字员测试"""
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from tools.loadgen import SimulatedTypist
+
+
+def type_sentence(typist, sentence, max_keys=10000):
+    """让模拟打字员输入一句话，返回回车被接受前的按键数"""
+    typist.sync(sentence, "")
+    for count in range(1, max_keys + 1):
+        key, char = typist.next_key()
+        if key == pygame.K_RETURN and "".join(typist.typed) == sentence:
+            return count
+    return None
+
+
+@pytest.mark.parametrize('backspace', ['immediate', 'word', 'sentence'])
+def test_typist_finishes_sentence_with_errors(backspace):
+    """各种退格习惯在有错误时都能改完并输完句子"""
+    typist = SimulatedTypist(600, error_rate=0.2, backspace=backspace, seed=1)
+    sentence = "hello world this is a test"
+    assert type_sentence(typist, sentence) is not None
@@ -0,0 +1,61 @@
+"""ParticleSystem 容量、压缩与随机数测试"""
+import pytest
+
+pytest.importorskip('numpy')
+pytest.importorskip('pygame')
+
+from src.particles import ParticleSystem
+
+
+def test_emit_is_capped_at_capacity():
+    """超出容量的粒子被丢弃，返回实际发射数"""
+    particles = ParticleSystem(capacity=10)
+    assert particles.emit(0, 0, (255, 0, 0), 6) == 6
+    assert particles.emit(0, 0, (255, 0, 0), 6) == 4
+    assert particles.emit(0, 0, (255, 0, 0), 6) == 0
+    assert len(particles) == 10
+
+
+def test_update_compacts_dead_particles():
+    """死亡的粒子被压缩掉，存活粒子保持原有顺序和属性"""
+    particles = ParticleSystem(capacity=100)
+    particles.emit(0, 0, (255, 0, 0), 5, life=(0.1, 0.1))
+    particles.emit(100, 200, (0, 255, 0), 3, speed=0, life=(1.0, 1.0))
+    particles.update(0.5)
+    assert len(particles) == 3
+    assert particles.color[:3].tolist() == [[0, 255, 0]] * 3
+    assert particles.x[:3].tolist() == [100] * 3
+    assert particles.y[:3].tolist() == [200] * 3
+    # 压缩后空出的槽位可以再次发射
+    assert particles.emit(0, 0, (0, 0, 255), 97) == 97
+    particles.update(2.0)
+    assert len(particles) == 0
+    assert particles.get_bounds() is None
+
+
+def test_seeded_stream_is_reproducible():
+    """相同种子发射的粒子完全相同，容量不足时不影响之后的随机序列"""
+    def run(capacity):
+        particles = ParticleSystem(capacity=capacity)
+        particles.seed(42)
+        particles.emit(0, 0, (255, 0, 0), 8)
+        particles.clear()
+        particles.emit(0, 0, (255, 0, 0), 4)
+        return particles.vx[:4].tolist()
+
+    assert run(100) == run(100)
+    assert run(4) == run(100)
+
+
+def test_effect_rng_does_not_consume_seeded_stream():
+    """使用 effect_rng 的装饰粒子不改变可设种子的随机序列"""
+    plain = ParticleSystem()
+    plain.seed(7)
+    plain.emit(0, 0, (255, 0, 0), 4)
+
+    with_effects = ParticleSystem()
+    with_effects.seed(7)
+    with_effects.emit(0, 0, (255, 255, 255), 3, rng=with_effects.effect_rng)
+    with_effects.clear()
+    with_effects.emit(0, 0, (255, 0, 0), 4)
+    assert with_effects.vx[:4].tolist() == plain.vx[:4].tolist()
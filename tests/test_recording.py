@@ -0,0 +1,27 @@
+"""SessionRecorder 保存测试"""
+import os
+
+from src.recording import SessionRecorder, SessionRecording
+
+
+def record_session(recorder, directory, level=0):
+    """录制并保存一局只有一个按键的游戏"""
+    recorder.start({'level': level}, 0.0)
+    recorder.record(1000, 'k', 97, 'a')
+    return recorder.finish({'state': 'menu'}, directory)
+
+
+def test_sessions_in_same_second_do_not_overwrite(tmp_path):
+    """同一关卡连续保存的录制各自成为独立文件"""
+    recorder = SessionRecorder()
+    paths = [record_session(recorder, str(tmp_path)) for _ in range(5)]
+    assert len(set(paths)) == 5
+    assert len(os.listdir(tmp_path)) == 5
+    assert SessionRecording.load(paths[-1]).keystrokes == 1
+
+
+def test_prune_keeps_newest(tmp_path):
+    """超出保留数量时删除最早的录制"""
+    recorder = SessionRecorder(keep=2)
+    paths = [record_session(recorder, str(tmp_path)) for _ in range(4)]
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(p) for p in paths[-2:])
@@ -0,0 +1,57 @@
+"""SoundBank 布局与磁盘缓存测试"""
+import os
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('pygame')
+
+from src.sound_bank import SoundBank
+
+
+def test_layout_is_contiguous():
+    """各音效在缓冲区中首尾相接，覆盖整个缓冲区"""
+    bank = SoundBank(sample_rate=8000, channels=2, type_variants=4)
+    spans = sorted(bank.layout.values())
+    assert spans[0][0] == 0
+    assert all(end == next_start for (_, end), (next_start, _) in zip(spans, spans[1:]))
+    assert spans[-1][1] == bank.length
+    assert len([name for name in bank.layout if name.startswith('type')]) == 4
+
+
+def test_samples_are_views_of_one_buffer():
+    """音效切片不复制数据，与合成结果一致"""
+    bank = SoundBank(sample_rate=8000, channels=2, type_variants=2).load()
+    assert bank.buffer.shape == (bank.length, 2)
+    assert bank.buffer.dtype == np.int16
+    samples = bank.samples('error')
+    assert np.shares_memory(samples, bank.buffer)
+    start, end = bank.layout['error']
+    assert len(samples) == end - start
+    assert np.any(samples)
+
+
+def test_cache_is_reused_and_keyed_by_parameters(tmp_path):
+    """第二次加载内存映射已有缓存；参数变化时使用新的缓存文件"""
+    first = SoundBank(sample_rate=8000, channels=1, type_variants=2).load(str(tmp_path))
+    assert os.listdir(tmp_path) == [f'sound_bank_{first.cache_key()}.npy']
+
+    second = SoundBank(sample_rate=8000, channels=1, type_variants=2).load(str(tmp_path))
+    assert isinstance(second.buffer, np.memmap)
+    assert np.array_equal(second.buffer, first.buffer)
+
+    other = SoundBank(sample_rate=8000, channels=1, type_variants=3)
+    assert other.cache_key() != first.cache_key()
+    other.load(str(tmp_path))
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_corrupt_cache_is_regenerated(tmp_path):
+    """缓存文件损坏时重新生成并覆盖"""
+    bank = SoundBank(sample_rate=8000, channels=1, type_variants=2)
+    path = tmp_path / f'sound_bank_{bank.cache_key()}.npy'
+    path.write_bytes(b'not a numpy file')
+    bank.load(str(tmp_path))
+    assert bank.buffer.shape == (bank.length, 1)
+    reloaded = SoundBank(sample_rate=8000, channels=1, type_variants=2).load(str(tmp_path))
+    assert np.array_equal(reloaded.buffer, bank.buffer)
@@ -0,0 +1,17 @@
+"""打字会话核心测试"""
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_session_core_does_not_import_pygame():
+    """导入打字会话核心不加载 pygame 和 numpy（在新进程中检查）"""
+    code = ("import sys\n"
+            "import src\n"
+            "from src.typing_session import TypingSession\n"
+            "from src import TypingStats, SessionRecorder\n"
+            "assert 'pygame' not in sys.modules, 'pygame'\n"
+            "assert 'numpy' not in sys.modules, 'numpy'\n")
+    subprocess.run([sys.executable, '-c', code], cwd=ROOT, check=True)
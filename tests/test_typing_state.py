@@ -0,0 +1,76 @@
+"""TypingState 增量比对测试"""
+import random
+
+from src.typing_state import TypingState
+
+
+def rescan(target, text):
+    """整段重新扫描的参考实现：(第一个错误位置, 错误字符数)"""
+    errors = [i for i, ch in enumerate(text) if i >= len(target) or target[i] != ch]
+    return (errors[0] if errors else None), len(errors)
+
+
+def reference_word_status(state, target, text, index):
+    """按整段输入计算单词状态"""
+    start, end = state.word_starts[index], state.word_ends[index]
+    if len(text) <= start:
+        return TypingState.STATE_NORMAL
+    owned = range(start, len(text)) if index == len(state.word_starts) - 1 else \
+        range(start, min(len(text), state.word_starts[index + 1]))
+    if len(text) < end or any(i >= len(target) or text[i] != target[i] for i in owned):
+        return TypingState.STATE_INCORRECT
+    return TypingState.STATE_CORRECT
+
+
+def test_retype_after_backspacing_into_the_middle():
+    """退格回到中间的错误处并改正后，状态与重新扫描一致"""
+    state = TypingState("hello world")
+    for char in "hexlo wor":
+        state.type_char(char)
+    assert state.first_error == 2
+    assert state.error_count == 1
+    for _ in range(7):
+        state.backspace()
+    assert state.text == "he"
+    assert state.first_error is None and state.error_count == 0
+    for char in "llo world":
+        state.type_char(char)
+    assert state.is_complete()
+    assert [state.word_status(i) for i in range(2)] == [TypingState.STATE_CORRECT] * 2
+
+
+def test_random_edits_match_full_rescan():
+    """随机输入和退格序列中，每一步的增量结果都与整段重新扫描一致"""
+    target = "The cat sat on the mat."
+    rng = random.Random(3)
+    state = TypingState(target)
+    text = ""
+    for _ in range(2000):
+        if text and rng.random() < 0.35:
+            removed = state.backspace()
+            assert removed == (len(text) <= len(target) and text[-1] == target[len(text) - 1])
+            text = text[:-1]
+        else:
+            index = len(text)
+            char = target[index] if index < len(target) and rng.random() < 0.8 else rng.choice("xyz ")
+            state.type_char(char)
+            text += char
+        assert state.text == text
+        assert (state.first_error, state.error_count) == rescan(target, text)
+        assert state.is_complete() == (text == target)
+        for index in range(len(state.word_starts)):
+            assert state.word_status(index) == reference_word_status(state, target, text, index)
+
+
+def test_changed_words_cover_edited_positions():
+    """只有被编辑位置所属的单词被报告为变化"""
+    state = TypingState("ab cd ef")
+    state.pop_changed_words()
+    state.type_char('a')
+    assert state.pop_changed_words() == {0}
+    for char in 'b c':
+        state.type_char(char)
+    assert state.pop_changed_words() == {0, 1}
+    state.backspace()
+    assert state.pop_changed_words() == {1}
+    assert state.pop_changed_words() == set()
@@ -0,0 +1,79 @@
+"""TypingStats 准确率与退格测试"""
+from src.typing_session import TypingSession
+from src.typing_stats import TypingStats
+
+
+def test_backspace_removes_correct_char():
+    """输入正确字符后退格再重新输入，准确率保持 100"""
+    stats = TypingStats()
+    for t, correct in ((0.1, True), (0.2, True)):
+        stats.record_key(t, correct)
+    stats.record_backspace(0.3, True)
+    stats.record_backspace(0.4, True)
+    for t, correct in ((0.5, True), (0.6, True)):
+        stats.record_key(t, correct)
+    assert stats.correct_chars == 2
+    assert stats.total_chars == 2
+    assert stats.accuracy() == 100
+
+
+def test_backspace_removes_incorrect_char():
+    """删除错误字符后，该错误不再计入准确率"""
+    stats = TypingStats()
+    stats.record_key(0.1, True)
+    stats.record_key(0.2, False)
+    assert stats.accuracy() == 50
+    stats.record_backspace(0.3, False)
+    stats.record_key(0.4, True)
+    assert stats.accuracy() == 100
+    assert stats.keystroke_accuracy() < 100
+
+
+def test_session_accuracy_after_retyping():
+    """会话中退格重打的字符不会使准确率超过 100"""
+    session = TypingSession([{'sentences': ['abc']}])
+    session.start_level(0, 0.0)
+    session.handle_input('ab\b\bab', 0.5)
+    assert session.accuracy() == 100
+
+
+def test_steady_burst_speed():
+    """匀速每秒 10 键的爆发速度为 600 CPM"""
+    stats = TypingStats()
+    for i in range(20):
+        stats.record_key(i * 0.1, True)
+    assert abs(stats.peak_burst_cpm - 600) < 1e-6
+
+
+def test_burst_ends_after_gap():
+    """停顿超过 burst_gap 后开始新的爆发，较慢的新爆发不降低最高速度"""
+    stats = TypingStats(burst_gap=1.0, burst_min_keys=5)
+    for i in range(10):
+        stats.record_key(i * 0.1, True)
+    for i in range(10):
+        stats.record_key(5.0 + i * 0.2, True)
+    assert stats.burst_keys == 10
+    assert abs(stats.burst_cpm() - 300) < 1e-6
+    assert abs(stats.peak_burst_cpm - 600) < 1e-6
+
+
+def test_batched_keys_keep_interval_percentiles():
+    """一帧内成批送入的按键按各自的时间统计，按键间隔分位数与逐键输入一致"""
+    sentence = 'the quick brown fox jumps over the lazy dog'
+    times = [0.1 + i * 0.1 for i in range(len(sentence))]
+
+    single = TypingSession([{'sentences': [sentence]}])
+    single.start_level(0, 0.0)
+    for char, t in zip(sentence, times):
+        single.handle_input(char, t)
+
+    batched = TypingSession([{'sentences': [sentence]}])
+    batched.start_level(0, 0.0)
+    for start in range(0, len(sentence), 4):
+        chunk = times[start:start + 4]
+        batched.handle_input(sentence[start:start + 4], chunk[-1], chunk)
+
+    expected = single.stats.interval_percentiles()
+    assert batched.stats.interval_percentiles() == expected
+    assert abs(expected['p50_ms'] - 100) < 5
+    assert batched.stats.peak_burst_cpm == single.stats.peak_burst_cpm
@@ -0,0 +1,108 @@
+"""VoiceQueue 排序、合并、溢出和打断测试"""
+from src.voice_queue import VoiceQueue
+
+
+class FakeClock:
+    """手动推进的时钟"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def drain(queue):
+    """依次取出并播放完所有等待中的请求，返回文本列表"""
+    texts = []
+    while True:
+        request = queue.get(timeout=0)
+        if request is None:
+            return texts
+        texts.append(request.text)
+        queue.done(request)
+
+
+def test_priority_order():
+    """单词先于夸奖、夸奖先于鼓励，同类单词按加入顺序"""
+    queue = VoiceQueue(maxsize=8)
+    queue.put('keep going', VoiceQueue.ENCOURAGEMENT)
+    queue.put('one', VoiceQueue.WORD)
+    queue.put('two', VoiceQueue.WORD)
+    assert drain(queue) == ['one', 'two', 'keep going']
+
+
+def test_praise_plays_before_next_sentence():
+    """完成一句后的夸奖排在下一句之前，新句子也不打断正在播放的夸奖"""
+    queue = VoiceQueue()
+    queue.put('Great job!', VoiceQueue.PRAISE)
+    queue.put('Next sentence.', VoiceQueue.SENTENCE)
+    assert drain(queue) == ['Great job!', 'Next sentence.']
+
+    queue.put('Excellent!', VoiceQueue.PRAISE)
+    praise = queue.get(timeout=0)
+    queue.put('Another sentence.', VoiceQueue.SENTENCE)
+    assert not queue.should_stop()
+    queue.done(praise)
+    assert drain(queue) == ['Another sentence.']
+
+
+def test_sentence_before_later_feedback():
+    """句子之后加入的反馈语仍按优先级排在句子之后"""
+    queue = VoiceQueue()
+    queue.put('A sentence.', VoiceQueue.SENTENCE)
+    queue.put('Almost!', VoiceQueue.ENCOURAGEMENT)
+    assert drain(queue) == ['A sentence.', 'Almost!']
+
+
+def test_coalescing():
+    """同组只保留最新的请求"""
+    queue = VoiceQueue()
+    queue.put('Old sentence.', VoiceQueue.SENTENCE)
+    queue.put('New sentence.', VoiceQueue.SENTENCE)
+    queue.put('Good!', VoiceQueue.PRAISE)
+    queue.put('Try again!', VoiceQueue.ENCOURAGEMENT)
+    assert drain(queue) == ['New sentence.', 'Try again!']
+    assert queue.get_stats()['dropped']['coalesced'] == 2
+
+
+def test_overflow():
+    """队列满时拒绝优先级最低的新请求，或淘汰等待中优先级最低、最早的请求"""
+    queue = VoiceQueue(maxsize=2)
+    assert queue.put('a', VoiceQueue.WORD)
+    assert queue.put('b', VoiceQueue.WORD)
+    assert not queue.put('Almost!', VoiceQueue.ENCOURAGEMENT)
+    assert queue.put('A sentence.', VoiceQueue.SENTENCE)
+    assert queue.get_stats()['dropped']['overflow'] == 2
+    assert drain(queue) == ['A sentence.', 'b']
+
+
+def test_interruption():
+    """只有更高优先级或同组的新请求打断正在播放的朗读"""
+    queue = VoiceQueue(maxsize=8)
+    queue.put('one', VoiceQueue.WORD)
+    word = queue.get(timeout=0)
+    queue.put('two', VoiceQueue.WORD)
+    assert not queue.should_stop()
+    queue.put('A sentence.', VoiceQueue.SENTENCE)
+    assert queue.should_stop()
+    queue.done(word)
+
+    sentence = queue.get(timeout=0)
+    assert sentence.text == 'A sentence.'
+    assert not queue.should_stop()
+    queue.put('Newer sentence.', VoiceQueue.SENTENCE)
+    assert queue.should_stop()
+    queue.done(sentence)
+    assert queue.get_stats()['interrupted'] == 2
+    assert drain(queue) == ['Newer sentence.', 'two']
+
+
+def test_feedback_expires():
+    """等待过久的反馈语不再朗读"""
+    clock = FakeClock()
+    queue = VoiceQueue(feedback_max_age=2.0, clock=clock)
+    queue.put('Good!', VoiceQueue.PRAISE)
+    clock.now = 3.0
+    assert queue.get(timeout=0) is None
+    assert queue.get_stats()['dropped']['expired'] == 1
@@ -0,0 +1,4 @@
+"""
+工具模块
+性能测试、回放等命令行工具（在项目根目录下以 python -m tools.<名称> 运行）
+"""
@@ -0,0 +1,161 @@
+"""
+按键音效延迟校准
+在无头游戏中按不同的混音器缓冲区设置逐个送入按键，测量从 handle_input 调用到打字音效
+Channel.play() 的耗时，加上混音器缓冲区时长估计到声卡输出的延迟；
+--loopback 时用麦克风录下扬声器的声音，测量到实际听到敲击声的端到端延迟（含录音延迟，偏大）
+
+用法:
+    python -m tools.audio_latency
+    python -m tools.audio_latency --buffer 128 256 512 1024 --keys 200
+    python -m tools.audio_latency --loopback --keys 30
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pygame
+
+from config import AUDIO_BUFFER, AUDIO_CHANNELS, AUDIO_FREQUENCY
+from tools.benchmark import percentile
+from tools.headless import create_headless_game, enter_state
+
+
+class LoopbackRecorder:
+    """从默认录音设备持续录音，记录每块数据到达的时间"""
+
+    def __init__(self, frequency, chunk=256):
+        from pygame._sdl2.audio import AUDIO_S16, AudioDevice, get_audio_device_names
+        self.frequency = frequency
+        self.chunks = []  # [(到达时间, int16 数组)]
+        names = get_audio_device_names(True)
+        if not names:
+            raise RuntimeError("没有录音设备")
+        self.device = AudioDevice(names[0], True, frequency, AUDIO_S16, 1, chunk, 0, self._callback)
+        self.device.pause(0)
+
+    def _callback(self, device, data):
+        self.chunks.append((time.perf_counter(), np.frombuffer(bytes(data), dtype=np.int16)))
+
+    def onset_after(self, start, threshold):
+        """start 之后第一次超过阈值的采样的时间，没有则返回 None"""
+        for arrived, samples in list(self.chunks):
+            # 一块数据的最后一个采样约在回调时刻录下
+            first_sample_time = arrived - len(samples) / self.frequency
+            if arrived < start:
+                continue
+            loud = np.nonzero(np.abs(samples) > threshold)[0]
+            if len(loud):
+                onset = first_sample_time + loud[0] / self.frequency
+                if onset >= start:
+                    return onset
+        return None
+
+    def close(self):
+        self.device.pause(1)
+        self.device.close()
+
+
+def next_char(game):
+    """当前句子的下一个正确字符（句子输完后重新开始本关）"""
+    typed = len(game.typing_state.text)
+    if typed >= len(game.current_sentence):
+        game.reset_level()
+        typed = 0
+    return game.current_sentence[typed]
+
+
+def measure(buffer, frequency, channels, keys, interval, recorder_chunk, loopback, threshold):
+    """按指定的混音器设置测量一组按键，返回统计结果"""
+    pygame.mixer.quit()
+    pygame.mixer.init(frequency, -16, channels, buffer)
+    obtained = pygame.mixer.get_init()
+    # 无头游戏只需要 dummy 视频驱动，混音器仍使用真实的音频驱动
+    audio_driver = os.environ.get('SDL_AUDIODRIVER')
+    game = create_headless_game()
+    if audio_driver is None:
+        os.environ.pop('SDL_AUDIODRIVER', None)
+    else:
+        os.environ['SDL_AUDIODRIVER'] = audio_driver
+    enter_state(game, 'playing')
+
+    recorder = None
+    if loopback:
+        try:
+            recorder = LoopbackRecorder(obtained[0], recorder_chunk)
+            time.sleep(0.5)
+        except Exception as e:
+            print(f"无法打开录音设备: {e}")
+
+    to_play = []
+    to_output = []
+    for _ in range(keys):
+        char = next_char(game)
+        start = time.perf_counter()
+        game.latency.key_down(start)
+        game.handle_input(char)
+        played = game.latency.pending[-1][2] if game.latency.pending else None
+        game.latency.frame_presented(start, start)
+        if played is not None:
+            to_play.append((played - start) * 1000)
+        if recorder:
+            time.sleep(max(interval, 0.3))
+            onset = recorder.onset_after(start, threshold)
+            if onset is not None:
+                to_output.append((onset - start) * 1000)
+        else:
+            time.sleep(interval)
+
+    if recorder:
+        recorder.close()
+    game.stop_voice_thread()
+    to_play.sort()
+    to_output.sort()
+    period = buffer / obtained[0] * 1000
+    return {
+        'buffer': buffer,
+        'obtained': obtained,
+        'period_ms': period,
+        'played': len(to_play),
+        'play_p50_ms': percentile(to_play, 50),
+        'play_p95_ms': percentile(to_play, 95),
+        # 新声音最晚要等下一次混音回调才被混入，再经过一个缓冲区才从声卡输出
+        'estimate_p50_ms': percentile(to_play, 50) + period,
+        'estimate_max_ms': percentile(to_play, 95) + 2 * period,
+        'heard': len(to_output),
+        'output_p50_ms': percentile(to_output, 50) if to_output else None,
+        'output_p95_ms': percentile(to_output, 95) if to_output else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AutoWords 按键音效延迟校准')
+    parser.add_argument('--buffer', type=int, nargs='+', default=[AUDIO_BUFFER],
+                        help='混音器缓冲区大小（采样数），可指定多个依次测量')
+    parser.add_argument('--frequency', type=int, default=AUDIO_FREQUENCY, help='采样率（Hz）')
+    parser.add_argument('--channels', type=int, default=AUDIO_CHANNELS, help='声道数')
+    parser.add_argument('--keys', type=int, default=100, help='每种设置送入的按键数')
+    parser.add_argument('--interval', type=float, default=0.05, help='按键间隔（秒），不小于音效限速间隔')
+    parser.add_argument('--loopback', action='store_true', help='用麦克风录音测量实际输出延迟（需要真实声卡）')
+    parser.add_argument('--threshold', type=int, default=2000, help='录音中判定为敲击声的振幅阈值（int16）')
+    args = parser.parse_args(argv)
+
+    print(f"{'buffer':>7}{'obtained':>20}{'period':>10}{'play p50':>10}{'p95':>9}"
+          f"{'est. output':>18}{'heard p50':>11}{'p95':>9}")
+    for buffer in args.buffer:
+        r = measure(buffer, args.frequency, args.channels, args.keys, args.interval,
+                    256, args.loopback, args.threshold)
+        obtained = f"{r['obtained'][0]}Hz/{r['obtained'][2]}ch"
+        estimate = f"{r['estimate_p50_ms']:.1f}~{r['estimate_max_ms']:.1f}ms"
+        heard = '-' if r['output_p50_ms'] is None else f"{r['output_p50_ms']:.1f}ms"
+        heard_p95 = '-' if r['output_p95_ms'] is None else f"{r['output_p95_ms']:.1f}ms"
+        print(f"{buffer:>7}{obtained:>20}{r['period_ms']:>8.1f}ms{r['play_p50_ms']:>8.2f}ms"
+              f"{r['play_p95_ms']:>7.2f}ms{estimate:>18}{heard:>11}{heard_p95:>9}")
+        if args.loopback and r['heard'] < r['played']:
+            print(f"        录音中只检测到 {r['heard']}/{r['played']} 次敲击声（可调低 --threshold 或调大音量）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+渲染性能基准测试
+在无头模式下驱动完整的帧流程，按界面报告帧率、帧时间分位数和每帧内存分配
+
+用法:
+    python -m tools.benchmark --resolution 1000x700 --resolution 1920x1080 --frames 300
+    python -m tools.benchmark --states menu playing --json bench.json
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from tools.headless import SCREEN_STATES, create_headless_game, enter_state, step_frame
+
+
+def percentile(sorted_values, p):
+    """计算已排序数据的分位数（线性插值）"""
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+class TypingDriver:
+    """在 playing 界面按固定速度输入当前句子（完成后回车，关卡结束后重新开始）"""
+
+    def __init__(self, game, chars_per_second=10):
+        self.game = game
+        self.chars_per_frame = chars_per_second * game.game_clock.step
+        self.budget = 0.0
+
+    def feed(self):
+        game = self.game
+        if game.state != 'playing':
+            enter_state(game, 'playing')
+        self.budget += self.chars_per_frame
+        # 与主循环一样，把本帧的按键作为一批处理
+        chars = []
+        while self.budget >= 1:
+            self.budget -= 1
+            game.latency.key_down(time.perf_counter())
+            position = len(game.typing_state) + len(chars)
+            if position < len(game.current_sentence):
+                chars.append(game.current_sentence[position])
+            else:
+                game.handle_input_batch(chars + ['\r'])
+                chars = []
+                if game.state != 'playing':
+                    enter_state(game, 'playing')
+        if chars:
+            game.handle_input_batch(chars)
+        game.latency.input_handled()
+        # 基准测试不检查时间限制，避免计时器让画面进入 game_over
+        game.start_time = game.now()
+
+
+def run_state(game, state, frames, warmup, chars_per_second, measure_alloc):
+    """对单个界面运行若干帧，返回统计结果"""
+    enter_state(game, state)
+    driver = TypingDriver(game, chars_per_second) if state == 'playing' else None
+
+    def frame():
+        if driver:
+            driver.feed()
+        step_frame(game)
+
+    for _ in range(warmup):
+        frame()
+
+    game.latency.reset()
+    frame_times = []
+    start = time.perf_counter()
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        frame()
+        frame_times.append(time.perf_counter() - t0)
+    total = time.perf_counter() - start
+    latency = game.latency.get_stats()
+
+    # 内存分配单独测一轮（tracemalloc 会显著拖慢帧时间）
+    alloc_peak = alloc_net = None
+    if measure_alloc:
+        # 每帧峰值需要 tracemalloc.reset_peak()（Python 3.9+），更早的版本只统计净增长
+        per_frame_peak = hasattr(tracemalloc, 'reset_peak')
+        tracemalloc.start()
+        peaks = []
+        begin, _ = tracemalloc.get_traced_memory()
+        for _ in range(frames):
+            if per_frame_peak:
+                tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            frame()
+            if per_frame_peak:
+                _, peak = tracemalloc.get_traced_memory()
+                peaks.append(peak - before)
+        end, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if peaks:
+            alloc_peak = sum(peaks) / len(peaks) / 1024
+        alloc_net = (end - begin) / frames / 1024
+
+    frame_times.sort()
+    ms = [t * 1000 for t in frame_times]
+    return {
+        'state': state,
+        'frames': frames,
+        'fps': frames / total if total > 0 else 0.0,
+        'mean_ms': sum(ms) / len(ms),
+        'p50_ms': percentile(ms, 50),
+        'p95_ms': percentile(ms, 95),
+        'p99_ms': percentile(ms, 99),
+        'max_ms': ms[-1],
+        'alloc_peak_kib': alloc_peak,
+        'alloc_net_kib': alloc_net,
+        'latency': {stage: latency[stage] for stage in ('handle', 'render', 'flip', 'total', 'sound')
+                    if latency[stage]['count']},
+    }
+
+
+def format_results(resolution, results):
+    """格式化为文本表格"""
+    lines = [f"Resolution {resolution[0]}x{resolution[1]}",
+             f"{'state':<16}{'fps':>9}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+             f"{'alloc/frame':>14}{'net/frame':>12}"]
+    for r in results:
+        alloc = f"{r['alloc_peak_kib']:.1f} KiB" if r['alloc_peak_kib'] is not None else '-'
+        net = f"{r['alloc_net_kib']:.2f} KiB" if r['alloc_net_kib'] is not None else '-'
+        lines.append(f"{r['state']:<16}{r['fps']:>9.1f}{r['mean_ms']:>7.2f}ms{r['p50_ms']:>7.2f}ms"
+                     f"{r['p95_ms']:>7.2f}ms{r['p99_ms']:>7.2f}ms{r['max_ms']:>7.2f}ms"
+                     f"{alloc:>14}{net:>12}")
+    for r in results:
+        if r['latency']:
+            stages = ', '.join(f"{stage} {s['p50_ms']:.1f}/{s['p95_ms']:.1f}/{s['p99_ms']:.1f}"
+                               for stage, s in r['latency'].items())
+            lines.append(f"  {r['state']} key latency p50/p95/p99 ms: {stages}")
+    return '\n'.join(lines)
+
+
+def parse_resolution(text):
+    """解析 1920x1080 形式的分辨率"""
+    try:
+        width, height = text.lower().split('x')
+        return int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的分辨率: {text}（格式应为 宽x高）")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AutoWords 无头渲染基准测试')
+    parser.add_argument('--resolution', type=parse_resolution, action='append',
+                        help='测试分辨率，可重复指定（默认 1000x700）')
+    parser.add_argument('--frames', type=int, default=300, help='每个界面测量的帧数')
+    parser.add_argument('--warmup', type=int, default=30, help='每个界面的预热帧数')
+    parser.add_argument('--states', nargs='+', choices=SCREEN_STATES, default=list(SCREEN_STATES),
+                        help='要测试的界面')
+    parser.add_argument('--cps', type=float, default=10, help='playing 界面的模拟输入速度（字符/秒）')
+    parser.add_argument('--dirty', action='store_true', help='启用脏矩形渲染模式')
+    parser.add_argument('--no-alloc', action='store_true', help='跳过内存分配测量')
+    parser.add_argument('--json', help='把结果写入 JSON 文件，便于跨版本比较')
+    args = parser.parse_args(argv)
+
+    report = []
+    for width, height in args.resolution or [(1000, 700)]:
+        game = create_headless_game(width, height)
+        game.dirty_rendering = args.dirty
+        results = [run_state(game, state, args.frames, args.warmup, args.cps, not args.no_alloc)
+                   for state in args.states]
+        print(format_results((width, height), results))
+        print(f"text cache: {game.text_cache.get_stats()}")
+        print(f"volatile text cache: {game.volatile_text_cache.get_stats()}")
+        print()
+        report.append({'resolution': [width, height], 'dirty': args.dirty, 'results': results})
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'runs': report}, f, indent=2)
+        print(f"已保存: {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+无头运行支持
+使用 SDL dummy 视频/音频驱动创建 Game，不打开窗口、不启动 TTS，用于基准测试和回放
+"""
+import atexit
+import os
+import shutil
+import tempfile
+
+SCREEN_STATES = ('menu', 'course_select', 'leaderboard', 'achievements',
+                 'playing', 'level_complete', 'game_over')
+
+
+def setup_headless_env():
+    """设置 SDL dummy 驱动（必须在导入 main / pygame.init 之前调用）"""
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+
+
+def create_headless_game(width=None, height=None, user_data_dir=None, copy_user_data=True):
+    """创建无头 Game 实例
+
+    Args:
+        width, height: 画面尺寸，默认使用配置中的尺寸
+        user_data_dir: 用户数据目录；为空时使用临时目录（进程退出时删除），避免写入真实存档
+        copy_user_data: 使用临时目录时是否复制现有的 JSON 存档（让排行榜等界面有真实内容，
+                        不复制会不断增长的 recordings 等子目录）
+    """
+    setup_headless_env()
+    import main
+
+    if user_data_dir is None:
+        user_data_dir = tempfile.mkdtemp(prefix='autowords_')
+        atexit.register(shutil.rmtree, user_data_dir, ignore_errors=True)
+        if copy_user_data and os.path.isdir(main.USER_DATA_DIR):
+            for name in os.listdir(main.USER_DATA_DIR):
+                path = os.path.join(main.USER_DATA_DIR, name)
+                if name.endswith('.json') and os.path.isfile(path):
+                    shutil.copy2(path, user_data_dir)
+
+    size = None
+    if width and height:
+        size = (width, height)
+    return main.Game(headless=True, screen_size=size, user_data_dir=user_data_dir)
+
+
+def enter_state(game, state):
+    """切换到指定界面；进入 playing 时重置当前关卡"""
+    if state == 'playing':
+        if game.current_level >= len(game.level_scores):
+            game.current_level = 0
+        game.reset_level()
+    game.state = state
+
+
+def step_frame(game):
+    """执行一帧完整流程：一个固定模拟步长 + 绘制 + 推送显示"""
+    game.update_simulation(game.game_clock.step)
+    game.draw_frame()
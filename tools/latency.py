@@ -0,0 +1,73 @@
+"""
+按键延迟报告
+读取游戏写入的延迟 JSONL（config.LATENCY_LOG_FILE），按阶段输出 p50/p95/p99 和直方图，
+用来判断延迟来自事件处理、渲染还是帧节奏
+
+用法:
+    python -m tools.latency data/user/latency.jsonl
+    python -m tools.latency data/user/latency.jsonl --stage total --bucket 1
+"""
+import argparse
+import json
+import sys
+
+from src.latency import STAGES, LatencyHistogram
+
+
+def load_samples(filepath):
+    """读取 JSONL，返回 {阶段: [毫秒]}"""
+    samples = {stage: [] for stage in STAGES}
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            for stage in STAGES:
+                if stage in record:
+                    samples[stage].append(record[stage])
+    return samples
+
+
+def format_histogram(histogram, width=50):
+    """把直方图格式化为文本条形图"""
+    buckets = histogram.buckets()
+    if not buckets:
+        return []
+    peak = max(count for _, count in buckets)
+    lines = []
+    for lower, count in buckets:
+        bar = '#' * max(1, int(count / peak * width))
+        lines.append(f"{lower:>8.1f}ms {count:>6} {bar}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AutoWords 按键延迟报告')
+    parser.add_argument('path', help='延迟 JSONL 文件')
+    parser.add_argument('--stage', choices=STAGES, default='total', help='输出直方图的阶段')
+    parser.add_argument('--bucket', type=float, default=0.5, help='直方图桶宽（毫秒）')
+    args = parser.parse_args(argv)
+
+    samples = load_samples(args.path)
+    histograms = {}
+    for stage, values in samples.items():
+        histogram = LatencyHistogram(window=max(1, len(values)), bucket_ms=args.bucket)
+        for value in values:
+            histogram.add(value)
+        histograms[stage] = histogram
+
+    print(f"{'stage':<10}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for stage, histogram in histograms.items():
+        s = histogram.summary()
+        print(f"{stage:<10}{s['count']:>8}{s['mean_ms']:>8.2f}ms{s['p50_ms']:>8.2f}ms"
+              f"{s['p95_ms']:>8.2f}ms{s['p99_ms']:>8.2f}ms{s['max_ms']:>8.2f}ms")
+    print()
+    print(f"{args.stage} histogram:")
+    for line in format_histogram(histograms[args.stage]):
+        print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
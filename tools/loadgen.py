@@ -0,0 +1,324 @@
+"""
+模拟打字负载生成器
+按可配置的速度（WPM）、错误率、退格习惯和爆发性模拟玩家，在无头模式下通过游戏的输入路径
+（dispatch_playing_keys → handle_input_batch → draw_frame）驱动所有课程，报告持续按键吞吐、
+负载下的帧时间、TTS 队列深度、丢弃/打断次数、
+音效声道占用/抢占/限速丢弃次数和粒子数量，用来找出输入 → 渲染流程开始跟不上的速度
+
+用法:
+    python -m tools.loadgen --wpm 60 120 240 480 --duration 10
+    python -m tools.loadgen --wpm 200 1000 5000 --flat-out --frames 600
+    python -m tools.loadgen --wpm 90 --error-rate 0.1 --backspace word --burstiness 0.6
+"""
+import argparse
+import random
+import sys
+import time
+
+import pygame
+
+from config import TTS_RATE
+from tools.benchmark import percentile
+from tools.headless import create_headless_game, enter_state
+
+BACKSPACE_MODES = ('immediate', 'word', 'sentence')
+ERROR_CHARS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+class SimulatedTypist:
+    """模拟玩家：按自己的输入模型生成按键及其时间间隔"""
+
+    def __init__(self, wpm, error_rate=0.03, backspace='immediate', burstiness=0.0, seed=0):
+        """
+        Args:
+            wpm: 平均速度（单词/分钟，每 5 个字符计一个单词）
+            error_rate: 每次按键输错的概率
+            backspace: 改错习惯：immediate 立即退格；word 输完当前单词再退格；
+                       sentence 回车被拒绝后才退格
+            burstiness: 0 为匀速，越大按键间隔越不均匀（快速连打与停顿交替），平均速度不变
+        """
+        self.mean_interval = 60.0 / (wpm * 5)
+        self.error_rate = error_rate
+        self.backspace = backspace
+        self.sigma = burstiness * 1.5
+        self.rng = random.Random(seed)
+        self.sentence = None
+        self.typed = []
+        self.fixing = False
+
+    def next_interval(self):
+        """到下一次按键的间隔（秒）：对数正态分布，均值保持为 mean_interval"""
+        if self.sigma <= 0:
+            return self.mean_interval
+        return self.mean_interval * self.rng.lognormvariate(-self.sigma ** 2 / 2, self.sigma)
+
+    def sync(self, sentence, text):
+        """与游戏当前的句子和输入同步（换句或重新开始后）"""
+        if sentence != self.sentence or "".join(self.typed) != text:
+            self.sentence = sentence
+            self.typed = list(text)
+            self.fixing = False
+
+    def _first_error(self):
+        for i, char in enumerate(self.typed):
+            if i >= len(self.sentence) or char != self.sentence[i]:
+                return i
+        return None
+
+    def next_key(self):
+        """生成下一次按键 (key, unicode)，并更新自己的输入模型"""
+        error = self._first_error()
+        if error is not None:
+            word_end = self.sentence.find(' ', error)
+            word_end = len(self.sentence) if word_end < 0 else word_end
+            if (self.backspace == 'immediate' or self.fixing
+                    or (self.backspace == 'word' and len(self.typed) >= word_end)):
+                # 开始改错后一直退格到没有错误为止（否则 word 模式会在单词中间反复重打、退格）
+                self.fixing = True
+                self.typed.pop()
+                if self._first_error() is None:
+                    self.fixing = False
+                return pygame.K_BACKSPACE, '\b'
+        else:
+            self.fixing = False
+
+        if len(self.typed) >= len(self.sentence):
+            if error is not None:
+                # 回车会被拒绝，之后开始改错
+                self.fixing = True
+            return pygame.K_RETURN, '\r'
+
+        target = self.sentence[len(self.typed)]
+        char = target
+        if self.rng.random() < self.error_rate:
+            char = self.rng.choice(ERROR_CHARS.replace(target.lower(), ''))
+        self.typed.append(char)
+        return 0, char
+
+
+class SimulatedTTSEngine:
+    """不发声的 TTS 引擎：按 TTS 语速估算每句的朗读时长并阻塞相应时间，用于观察语音队列积压
+
+    与 pyttsx3 一样在每个单词前触发 started-word 回调，回调中调用 stop() 可打断朗读
+    """
+
+    def __init__(self, rate, time_scale=1.0):
+        self.seconds_per_word = 60.0 / rate * time_scale
+        self.pending = []
+        self.callbacks = []
+        self.stopped = False
+        self.spoken = 0
+
+    def setProperty(self, name, value):
+        pass
+
+    def connect(self, topic, callback):
+        if topic == 'started-word':
+            self.callbacks.append(callback)
+
+    def say(self, text):
+        self.pending.append(text)
+
+    def stop(self):
+        self.stopped = True
+
+    def runAndWait(self):
+        words = [word for text in self.pending for word in text.split()]
+        self.pending = []
+        self.stopped = False
+        self.spoken += 1
+        for word in words:
+            for callback in self.callbacks:
+                callback(None, 0, len(word))
+            if self.stopped:
+                break
+            time.sleep(self.seconds_per_word)
+
+
+def attach_simulated_tts(game, rate, time_scale=1.0):
+    """让无头游戏使用模拟 TTS 引擎和真实的语音队列/线程"""
+    game.tts_engine = SimulatedTTSEngine(rate, time_scale)
+    game.tts_engine.connect('started-word', game.on_tts_word)
+    game.tts_enabled = True
+    game.start_voice_thread()
+    return game.tts_engine
+
+
+def advance_level(game):
+    """本关结束后进入下一关（全部完成后从第一关重新开始）"""
+    game.current_level = (game.current_level + 1) % len(game.level_scores)
+    enter_state(game, 'playing')
+
+
+def run_load(game, typist, duration, frames, flat_out, fps):
+    """驱动游戏直到达到时长或帧数，返回统计结果
+
+    realtime 模式下按真实时间调度按键，帧按 fps 限速，处理跟不上时按键会积压到下一帧；
+    flat_out 模式下虚拟时间每帧前进 1/fps，不等待，测量该负载下的帧时间上限。
+    """
+    enter_state(game, 'playing')
+    clock = pygame.time.Clock()
+    frame_budget = 1.0 / fps
+
+    frame_times = []
+    key_lags = []
+    batch_sizes = []
+    queue_depths = []
+    particle_counts = []
+    active_voices = []
+    keys = 0
+    sentences = 0
+    levels = 0
+
+    start = time.perf_counter()
+    next_key_time = typist.next_interval()
+    virtual_now = 0.0
+    frame = 0
+    while True:
+        wall = time.perf_counter() - start
+        if flat_out:
+            if frame >= frames:
+                break
+            virtual_now = frame * frame_budget
+        else:
+            if wall >= duration:
+                break
+            virtual_now = wall
+
+        t0 = time.perf_counter()
+        # 本帧到期的按键作为一批送入输入路径（与主循环一致）
+        typist.sync(game.current_sentence, game.typing_state.text)
+        batch = []
+        while next_key_time <= virtual_now:
+            key = typist.next_key()
+            batch.append(key)
+            if not flat_out:
+                key_lags.append(wall - next_key_time)
+            next_key_time += typist.next_interval()
+            if key[0] == pygame.K_RETURN:
+                # 回车后的按键要基于新句子生成，留到下一帧
+                break
+        if batch:
+            for _ in batch:
+                game.latency.key_down(t0)
+            index = game.current_sentence_index
+            game.dispatch_playing_keys(batch)
+            game.latency.input_handled()
+            keys += len(batch)
+            batch_sizes.append(len(batch))
+            if game.current_sentence_index != index:
+                sentences += 1
+            if game.state == 'level_complete':
+                levels += 1
+                sentences += 1
+                advance_level(game)
+            elif game.state != 'playing':
+                enter_state(game, 'playing')
+        # 压测不检查句子时间限制
+        game.start_time = game.now()
+
+        if flat_out:
+            game.update_simulation(game.game_clock.step)
+        else:
+            for _ in range(game.game_clock.advance()):
+                game.update_simulation(game.game_clock.step)
+        game.draw_frame()
+        frame_times.append(time.perf_counter() - t0)
+        queue_depths.append(game.voice_queue.qsize())
+        particle_counts.append(len(game.particles))
+        if game.sound_channels:
+            active_voices.append(sum(game.sound_channels.active_voices().values()))
+        frame += 1
+        if not flat_out:
+            clock.tick(fps)
+
+    elapsed = time.perf_counter() - start
+    ms = sorted(t * 1000 for t in frame_times)
+    lags = sorted(t * 1000 for t in key_lags)
+    latency = game.latency.get_stats()['total']
+    voice = game.voice_queue.get_stats()
+    sfx = game.sound_channels.get_stats() if game.sound_channels else {'stolen': {}, 'dropped_total': 0}
+    return {
+        'frames': len(frame_times),
+        'keys': keys,
+        'keys_per_second': keys / elapsed if elapsed > 0 else 0.0,
+        'sentences': sentences,
+        'levels': levels,
+        'accuracy': game.stats.keystroke_accuracy(),
+        'frame_p50_ms': percentile(ms, 50),
+        'frame_p95_ms': percentile(ms, 95),
+        'frame_p99_ms': percentile(ms, 99),
+        'frame_max_ms': ms[-1] if ms else 0.0,
+        'over_budget': sum(1 for t in frame_times if t > frame_budget) / max(1, len(frame_times)),
+        'batch_max': max(batch_sizes, default=0),
+        'key_lag_p95_ms': percentile(lags, 95),
+        'key_latency_p95_ms': latency['p95_ms'],
+        'tts_queue_max': max(queue_depths, default=0),
+        'tts_queue_final': queue_depths[-1] if queue_depths else 0,
+        'tts_dropped': voice['dropped_total'],
+        'tts_interrupted': voice['interrupted'],
+        'sfx_voices_max': max(active_voices, default=0),
+        'sfx_stolen': sum(sfx['stolen'].values()),
+        'sfx_dropped': sfx['dropped_total'],
+        'particles_mean': sum(particle_counts) / max(1, len(particle_counts)),
+        'particles_max': max(particle_counts, default=0),
+    }
+
+
+def format_row(wpm, r, flat_out):
+    """格式化一行结果"""
+    lag = '-' if flat_out else f"{r['key_lag_p95_ms']:.1f}ms"
+    sfx = f"{r['sfx_voices_max']}/{r['sfx_stolen']}/{r['sfx_dropped']}"
+    return (f"{wpm:>6}{r['keys_per_second']:>10.1f}{r['frame_p50_ms']:>8.2f}ms{r['frame_p95_ms']:>8.2f}ms"
+            f"{r['frame_p99_ms']:>8.2f}ms{r['over_budget'] * 100:>8.1f}%{r['batch_max']:>7}{lag:>10}"
+            f"{r['key_latency_p95_ms']:>9.1f}ms{r['tts_queue_max']:>6}/{r['tts_queue_final']:<4}"
+            f"{r['tts_dropped']:>6}/{r['tts_interrupted']:<4}"
+            f"{sfx:>15}"
+            f"{r['particles_mean']:>8.0f}/{r['particles_max']:<6}{r['sentences']:>6}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AutoWords 模拟打字负载生成器')
+    parser.add_argument('--wpm', type=float, nargs='+', default=[60, 120, 240],
+                        help='模拟速度（单词/分钟），可指定多个依次测试')
+    parser.add_argument('--error-rate', type=float, default=0.03, help='每次按键输错的概率')
+    parser.add_argument('--backspace', choices=BACKSPACE_MODES, default='immediate', help='改错习惯')
+    parser.add_argument('--burstiness', type=float, default=0.3, help='按键间隔的不均匀程度（0 为匀速）')
+    parser.add_argument('--duration', type=float, default=10.0, help='realtime 模式下每个速度的测试时长（秒）')
+    parser.add_argument('--flat-out', action='store_true', help='不限速：虚拟时间每帧前进 1/fps，测量帧时间上限')
+    parser.add_argument('--frames', type=int, default=600, help='flat-out 模式下每个速度的帧数')
+    parser.add_argument('--fps', type=int, default=60, help='目标帧率')
+    parser.add_argument('--resolution', default='1000x700', help='画面尺寸')
+    parser.add_argument('--tts-scale', type=float, default=1.0,
+                        help='模拟朗读时长的缩放（flat-out 下虚拟时间更快，可调小）')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    args = parser.parse_args(argv)
+
+    width, height = (int(v) for v in args.resolution.lower().split('x'))
+    mode = 'flat-out' if args.flat_out else 'realtime'
+    print(f"mode {mode}, {width}x{height}, error rate {args.error_rate}, backspace {args.backspace}, "
+          f"burstiness {args.burstiness}, frame budget {1000 / args.fps:.1f}ms")
+    print(f"{'wpm':>6}{'keys/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'>budget':>9}{'batch':>7}"
+          f"{'lag p95':>10}{'key->flip':>11}{'tts q':>11}{'drop/int':>11}{'sfx v/st/dr':>15}{'particles':>15}{'sent':>6}")
+
+    highest_ok = None
+    for wpm in args.wpm:
+        game = create_headless_game(width, height)
+        engine = attach_simulated_tts(game, TTS_RATE, args.tts_scale)
+        typist = SimulatedTypist(wpm, args.error_rate, args.backspace, args.burstiness, args.seed)
+        result = run_load(game, typist, args.duration, args.frames, args.flat_out, args.fps)
+        result['tts_spoken'] = engine.spoken
+        print(format_row(int(wpm), result, args.flat_out))
+        if result['frame_p95_ms'] <= 1000 / args.fps:
+            highest_ok = wpm
+        game.stop_voice_thread()
+
+    if highest_ok is None:
+        print("所有速度下 p95 帧时间都超出了帧预算")
+    else:
+        print(f"p95 帧时间不超过帧预算的最高速度: {highest_ok:g} WPM")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+TTS 音频批量预合成
+把课程语料（新概念 JSON、SentenceCrawler 输出的 Tatoeba 例句等）中的所有句子和不重复的单词
+提前合成到游戏的 TTS 缓存。合成分配到多个进程，每个进程使用自己的 pyttsx3 引擎；
+已缓存的文本直接跳过，文件先写临时文件再原子替换，中途中断不会留下损坏的音频
+
+用法:
+    python -m tools.prerender
+    python -m tools.prerender data/lessons/custom/tatoeba_sentences.json --processes 8
+    python -m tools.prerender data/lessons/new_concept --sentences-only
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from config import TTS_CACHE_DIR, TTS_CACHE_MAX_MB, TTS_RATE, TTS_VOICE, TTS_VOLUME
+from data.lessons.loader import LessonLoader
+from src.tts_cache import TTSCache, speech_texts
+
+# 工作进程内的引擎和缓存（由 init_worker 创建）
+_worker = {}
+
+
+def load_sentences(paths):
+    """读取语料中的全部句子；paths 为空时使用游戏的全部课程"""
+    loader = LessonLoader()
+    if not paths:
+        lessons = loader.load_all()
+    else:
+        lessons = []
+        for path in paths:
+            if os.path.isdir(path):
+                files = [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.json')]
+            else:
+                files = [path]
+            for filepath in files:
+                lessons.extend(loader.load_custom(filepath))
+    return [sentence for lesson in lessons for sentence in lesson.get('sentences', [])]
+
+
+def create_engine():
+    """按游戏的设置创建 pyttsx3 引擎，返回 (引擎, 语音ID)"""
+    import pyttsx3
+    engine = pyttsx3.init()
+    engine.setProperty('rate', TTS_RATE)
+    engine.setProperty('volume', TTS_VOLUME)
+    if TTS_VOICE:
+        engine.setProperty('voice', TTS_VOICE)
+    return engine, engine.getProperty('voice')
+
+
+def init_worker(directory):
+    """工作进程初始化：创建本进程的引擎和缓存索引"""
+    try:
+        _worker['engine'], _worker['voice'] = create_engine()
+    except Exception as e:
+        _worker['error'] = str(e)
+    # 工作进程不淘汰文件，避免进程之间互相删除刚合成的音频
+    _worker['cache'] = TTSCache(directory, float('inf'))
+
+
+def synthesize(text):
+    """合成一个文本，返回 (文本, 文件大小, 错误信息)"""
+    if 'error' in _worker:
+        return text, 0, _worker['error']
+    cache = _worker['cache']
+    path = cache.synthesize(_worker['engine'], text, TTS_RATE, _worker['voice'])
+    if path is None:
+        return text, 0, "合成失败"
+    return text, os.path.getsize(path), None
+
+
+def default_voice():
+    """缓存键使用的语音ID（与工作进程的引擎一致）"""
+    if TTS_VOICE:
+        return TTS_VOICE
+    return create_engine()[1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AutoWords TTS 音频批量预合成')
+    parser.add_argument('paths', nargs='*', help='课程 JSON 文件或目录（默认使用游戏的全部课程）')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='并行进程数（每个进程一个 TTS 引擎）')
+    parser.add_argument('--cache-dir', default=TTS_CACHE_DIR, help='TTS 缓存目录')
+    parser.add_argument('--sentences-only', action='store_true', help='只合成句子，不合成单词')
+    parser.add_argument('--limit', type=int, default=0, help='最多合成的文本数（0 为不限）')
+    args = parser.parse_args(argv)
+
+    sentences = load_sentences(args.paths)
+    if args.sentences_only:
+        texts = list(dict.fromkeys(sentences))
+    else:
+        texts = speech_texts(sentences)
+    if not texts:
+        print("没有可合成的文本")
+        return 1
+
+    try:
+        voice = default_voice()
+    except Exception as e:
+        print(f"无法初始化TTS引擎: {e}")
+        return 1
+
+    cache = TTSCache(args.cache_dir, float('inf'))
+    pending = [text for text in texts if not cache.contains(text, TTS_RATE, voice)]
+    if args.limit:
+        pending = pending[:args.limit]
+    print(f"texts: {len(texts)} ({len(sentences)} sentences), cached: {len(texts) - len(pending)}, "
+          f"to render: {len(pending)}, processes: {args.processes}")
+    if not pending:
+        return 0
+
+    done = failed = 0
+    written = 0
+    start = time.perf_counter()
+    # spawn 启动的工作进程不继承父进程的引擎状态，各自初始化自己的引擎
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(args.processes, init_worker, (args.cache_dir,)) as pool:
+        for text, size, error in pool.imap_unordered(synthesize, pending, chunksize=4):
+            if error:
+                failed += 1
+                print(f"  失败: {text[:40]!r}: {error}")
+            else:
+                done += 1
+                written += size
+            finished = done + failed
+            if finished % 100 == 0 or finished == len(pending):
+                elapsed = time.perf_counter() - start
+                print(f"  {finished}/{len(pending)}  {finished / elapsed:.1f} items/sec")
+    elapsed = time.perf_counter() - start
+
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"rendered: {done}, failed: {failed}, {written / 1024 / 1024:.1f} MiB in {elapsed:.1f}s "
+          f"({rate:.1f} items/sec)")
+    total = TTSCache(args.cache_dir, float('inf')).total_bytes
+    if total > TTS_CACHE_MAX_MB * 1024 * 1024:
+        print(f"缓存共 {total / 1024 / 1024:.0f} MiB，超过 TTS_CACHE_MAX_MB ({TTS_CACHE_MAX_MB} MB)，"
+              f"游戏运行时会淘汰最久未用的音频，可在 config.py 中调大上限")
+    return 0 if failed == 0 else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+按键录制回放
+在无头模式下把录制的按键重新送入 Game.handle_input，校验结果是否与录制时一致并报告吞吐量
+
+用法:
+    python -m tools.replay data/user/recordings/session_20260101_120000_000_L1.jsonl
+    python -m tools.replay data/user/recordings --render --repeat 5
+    python -m tools.replay session.jsonl --realtime
+"""
+import argparse
+import os
+import sys
+import time
+
+from tools.headless import create_headless_game, step_frame
+
+
+def find_recordings(paths):
+    """展开文件和目录参数，返回录制文件列表"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            files.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                         if name.endswith('.jsonl'))
+        else:
+            files.append(path)
+    return files
+
+
+def replay_file(filepath, realtime=False, render=False, repeat=1):
+    """回放单个录制文件，返回 (是否一致, 统计信息)"""
+    from src import SessionRecording, SessionReplayer
+
+    recording = SessionRecording.load(filepath)
+    width, height = recording.header.get('screen_size', (None, None))
+    game = create_headless_game(width, height)
+
+    on_event = (lambda batch: step_frame(game)) if render else None
+    replayer = SessionReplayer(game)
+
+    matched = True
+    result = None
+    elapsed = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = replayer.replay(recording, realtime=realtime, on_event=on_event)
+        elapsed += time.perf_counter() - start
+        matched = matched and SessionReplayer.matches(result, recording.final)
+
+    keystrokes = recording.keystrokes * repeat
+    stats = {
+        'keystrokes': recording.keystrokes,
+        'duration': recording.duration,
+        'replay_seconds': elapsed,
+        'keys_per_second': keystrokes / elapsed if elapsed > 0 else 0.0,
+        'result': result,
+        'expected': recording.final,
+    }
+    return matched, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AutoWords 按键录制回放')
+    parser.add_argument('paths', nargs='+', help='录制文件或包含录制文件的目录')
+    parser.add_argument('--realtime', action='store_true', help='按原始时间间隔回放')
+    parser.add_argument('--render', action='store_true', help='每批事件后绘制一帧（测量输入+渲染热路径）')
+    parser.add_argument('--repeat', type=int, default=1, help='每个录制重复回放的次数')
+    args = parser.parse_args(argv)
+
+    files = find_recordings(args.paths)
+    if not files:
+        print("没有找到录制文件")
+        return 1
+
+    failures = 0
+    for filepath in files:
+        matched, stats = replay_file(filepath, args.realtime, args.render, args.repeat)
+        status = 'OK' if matched else 'MISMATCH'
+        print(f"[{status}] {os.path.basename(filepath)}: {stats['keystrokes']} keys, "
+              f"recorded {stats['duration']:.1f}s, replayed in {stats['replay_seconds']:.3f}s "
+              f"({stats['keys_per_second']:.0f} keys/s)")
+        if not matched:
+            failures += 1
+            print(f"    expected: {stats['expected']}")
+            print(f"    actual:   {stats['result']}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
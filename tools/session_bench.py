@@ -0,0 +1,114 @@
+"""
+打字会话基准测试
+不创建窗口、混音器和 TTS，直接驱动大量 TypingSession，报告每核每秒处理的按键数和每个会话的内存占用
+
+用法:
+    python -m tools.session_bench --sessions 5000 --keys 500000
+    python -m tools.session_bench --sessions 2000 --processes 4
+"""
+import argparse
+import multiprocessing
+import random
+import sys
+import time
+import tracemalloc
+
+from data.lessons.loader import LessonLoader
+from src.typing_session import TypingSession
+
+
+def load_lessons():
+    """加载全部课程（与游戏相同的数据来源）"""
+    return [lesson for lesson in LessonLoader().load_all() if lesson.get('sentences')]
+
+
+def create_sessions(lessons, count, seed=0):
+    """创建 count 个会话，分布在不同关卡上"""
+    rng = random.Random(seed)
+    sessions = []
+    for _ in range(count):
+        session = TypingSession(lessons, time_limit=float('inf'))
+        session.start_level(rng.randrange(len(lessons)), 0.0)
+        sessions.append(session)
+    return sessions
+
+
+def next_chars(session, rng, error_rate):
+    """模拟玩家的下一次按键：按错误率输错并随即退格，句子输完后回车"""
+    typed = len(session.typing_state)
+    if typed < len(session.sentence):
+        if rng.random() < error_rate:
+            return ['#', '\b', session.sentence[typed]]
+        return [session.sentence[typed]]
+    return ['\r']
+
+
+def measure_memory(lessons, count):
+    """每个会话的平均内存占用（字节）"""
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    sessions = create_sessions(lessons, count)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    return (after - before) / count
+
+
+def run_worker(args):
+    """在单个进程中轮流驱动所有会话，返回 (按键数, 耗时秒)"""
+    sessions_count, keys, error_rate, seed = args
+    lessons = load_lessons()
+    sessions = create_sessions(lessons, sessions_count, seed)
+    rng = random.Random(seed)
+    now = 0.0
+    processed = 0
+
+    start = time.perf_counter()
+    while processed < keys:
+        now += 0.01
+        for session in sessions:
+            chars = next_chars(session, rng, error_rate)
+            session.handle_input(chars, now)
+            processed += len(chars)
+            if session.state != TypingSession.PLAYING:
+                # 关卡完成后换一关继续
+                session.start_level(rng.randrange(len(lessons)), now)
+    elapsed = time.perf_counter() - start
+    return processed, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AutoWords 打字会话基准测试')
+    parser.add_argument('--sessions', type=int, default=1000, help='每个进程承载的会话数')
+    parser.add_argument('--keys', type=int, default=200000, help='每个进程处理的按键数')
+    parser.add_argument('--error-rate', type=float, default=0.05, help='模拟输错（随后退格）的概率')
+    parser.add_argument('--processes', type=int, default=1, help='并行进程数')
+    args = parser.parse_args(argv)
+
+    lessons = load_lessons()
+    if not lessons:
+        print("没有可用的课程数据")
+        return 1
+
+    per_session = measure_memory(lessons, min(args.sessions, 1000))
+    jobs = [(args.sessions, args.keys, args.error_rate, seed) for seed in range(args.processes)]
+    wall_start = time.perf_counter()
+    if args.processes > 1:
+        with multiprocessing.Pool(args.processes) as pool:
+            results = pool.map(run_worker, jobs)
+    else:
+        results = [run_worker(jobs[0])]
+    wall = time.perf_counter() - wall_start
+
+    total_keys = sum(keys for keys, _ in results)
+    per_core = [keys / elapsed for keys, elapsed in results]
+    print(f"lessons: {len(lessons)}, sessions: {args.sessions} x {args.processes} process(es)")
+    print(f"memory per session: {per_session / 1024:.1f} KiB")
+    print(f"keystrokes/sec per core: {sum(per_core) / len(per_core):,.0f} "
+          f"(min {min(per_core):,.0f}, max {max(per_core):,.0f})")
+    print(f"total: {total_keys:,} keystrokes in {wall:.2f}s ({total_keys / wall:,.0f} keystrokes/sec)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+"""
+启动时间基准测试
+每次在新的 Python 进程中启动游戏（SDL dummy 驱动，启用 TTS），测量各阶段耗时：
+进程启动 → 导入 main → 创建 Game → 第一帧推送到显示器 → TTS 引擎就绪，以及第一帧时的常驻内存；
+--compare 时分别测量普通模式和静音模式（AUTOWORDS_SILENT=1）
+
+用法:
+    python -m tools.startup --runs 5
+    python -m tools.startup --runs 10 --no-wait-tts
+    python -m tools.startup --runs 10 --compare
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+PHASES = ('interpreter', 'import', 'init', 'first_frame', 'total', 'tts_ready')
+
+
+def measure_child(wait_tts, tts_timeout):
+    """在当前进程中启动游戏并打印各阶段的时间点（time.time()，供父进程计算进程启动耗时）"""
+    marks = {'started': time.time()}
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    import main
+    marks['imported'] = time.time()
+
+    game = main.Game(user_data_dir=tempfile.mkdtemp(prefix='autowords_startup_'))
+    marks['initialized'] = time.time()
+    game.draw_frame()
+    marks['first_frame'] = time.time()
+    marks['rss_mb'] = resident_memory_mb()
+
+    marks['tts_ready'] = None
+    if wait_tts:
+        # 引擎初始化完成（或失败后关闭朗读）即视为就绪
+        deadline = time.time() + tts_timeout
+        while time.time() < deadline:
+            if getattr(game, 'tts_engine', None) is not None or not game.tts_enabled:
+                marks['tts_ready'] = time.time()
+                break
+            time.sleep(0.001)
+    marks['tts_available'] = getattr(game, 'tts_engine', None) is not None
+
+    print(json.dumps(marks), flush=True)
+    game.stop_voice_thread()
+    os._exit(0)
+
+
+def resident_memory_mb():
+    """当前进程的常驻内存（MB），无法读取时返回 None"""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux 单位为 KB，macOS 为字节
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return None
+
+
+def run_once(wait_tts, tts_timeout, silent=False):
+    """启动一个子进程测量一次，返回各阶段耗时（毫秒）和常驻内存（MB）"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    args = [sys.executable, '-m', 'tools.startup', '--child', '--tts-timeout', str(tts_timeout)]
+    if not wait_tts:
+        args.append('--no-wait-tts')
+    env = dict(os.environ)
+    if silent:
+        env['AUTOWORDS_SILENT'] = '1'
+    else:
+        env.pop('AUTOWORDS_SILENT', None)
+    spawned = time.time()
+    output = subprocess.run(args, cwd=root, env=env, capture_output=True, text=True, check=True).stdout
+    marks = json.loads(output.strip().splitlines()[-1])
+    result = {
+        'interpreter': (marks['started'] - spawned) * 1000,
+        'import': (marks['imported'] - marks['started']) * 1000,
+        'init': (marks['initialized'] - marks['imported']) * 1000,
+        'first_frame': (marks['first_frame'] - marks['initialized']) * 1000,
+        'total': (marks['first_frame'] - spawned) * 1000,
+        'tts_ready': None,
+        'tts_available': marks['tts_available'],
+        'rss_mb': marks['rss_mb'],
+    }
+    if marks['tts_ready'] is not None:
+        result['tts_ready'] = (marks['tts_ready'] - spawned) * 1000
+    return result
+
+
+def report(results, mode):
+    """输出一组测量结果的中位数/最小值/最大值"""
+    available = sum(1 for r in results if r['tts_available'])
+    print(f"mode: {mode}, runs: {len(results)}, TTS engine available in {available}/{len(results)}")
+    print(f"{'phase':<14}{'median':>10}{'min':>10}{'max':>10}")
+    for phase in PHASES:
+        values = sorted(r[phase] for r in results if r[phase] is not None)
+        if not values:
+            continue
+        median = values[len(values) // 2]
+        print(f"{phase:<14}{median:>8.1f}ms{values[0]:>8.1f}ms{values[-1]:>8.1f}ms")
+    rss = sorted(r['rss_mb'] for r in results if r['rss_mb'] is not None)
+    if rss:
+        print(f"{'rss':<14}{rss[len(rss) // 2]:>8.1f}MB{rss[0]:>8.1f}MB{rss[-1]:>8.1f}MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='AutoWords 启动时间基准测试')
+    parser.add_argument('--runs', type=int, default=5, help='启动次数（每次一个新进程）')
+    parser.add_argument('--no-wait-tts', action='store_true', help='不等待 TTS 引擎就绪')
+    parser.add_argument('--tts-timeout', type=float, default=10.0, help='等待 TTS 引擎就绪的最长时间（秒）')
+    parser.add_argument('--silent', action='store_true', help='以静音模式启动（不初始化混音器、音效和TTS）')
+    parser.add_argument('--compare', action='store_true', help='依次测量普通模式和静音模式')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        measure_child(not args.no_wait_tts, args.tts_timeout)
+        return 0
+
+    modes = [False, True] if args.compare else [args.silent]
+    for silent in modes:
+        results = [run_once(not args.no_wait_tts, args.tts_timeout, silent) for _ in range(args.runs)]
+        report(results, 'silent' if silent else 'normal')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())